@@ -0,0 +1,209 @@
+import timeit
+
+import numpy as np
+
+from gaming_framework.geometry import collision
+from gaming_framework.geometry.shape import Circle, Line2D, Point2D, Polygon, Rectangle
+
+NUMBER = 20000
+
+
+# the numpy based implementations the scalar kernels replaced, np.cross is
+# spelled out since numpy 2 deprecates it for 2D vectors and line_to_circle
+# gets the same closest point check so both versions return the same results
+
+
+def numpy_distance(point, other):
+    return np.linalg.norm(np.array(point - other))
+
+
+def numpy_point_to_line_collision(point, line):
+    d1 = np.linalg.norm(np.array(point) - np.array(line.a))
+    d2 = np.linalg.norm(np.array(point) - np.array(line.b))
+    line_size = np.linalg.norm(np.array(line.b) - np.array(line.a))
+    return (d1 + d2) == line_size
+
+
+def numpy_point_to_circle_collision(point, circle):
+    distance = np.linalg.norm(np.array(circle.center) - np.array(point))
+    return distance <= (circle.radius + collision.FLOAT_TOLERANCE)
+
+
+def numpy_line_to_line_collision(line, other):
+    ab = np.array(line.b) - np.array(line.a)
+    cd = np.array(other.b) - np.array(other.a)
+    ab_cross_cd = ab[0] * cd[1] - ab[1] * cd[0]
+    if ab_cross_cd == 0:
+        return False
+    ac = np.array(other.a) - np.array(line.a)
+    t1 = (ac[0] * cd[1] - ac[1] * cd[0]) / ab_cross_cd
+    t2 = (ac[0] * ab[1] - ac[1] * ab[0]) / ab_cross_cd
+    return (0 <= t1 <= 1) and (0 <= t2 <= 1)
+
+
+def numpy_line_to_circle_collision(line, circle):
+    if numpy_point_to_circle_collision(line.a, circle):
+        return True
+    if numpy_point_to_circle_collision(line.b, circle):
+        return True
+    distance = np.linalg.norm(np.array(line.a) - np.array(line.b))
+    product = (
+        np.dot(np.array(circle.center) - line.a, np.array(line.b) - line.a)
+        / distance**2
+    )
+    closest_point = np.array(line.a) + product * (np.array(line.b) - line.a)
+    if not 0 <= product <= 1:
+        return False
+    distance = np.linalg.norm(np.array(circle.center) - closest_point)
+    return distance <= circle.radius
+
+
+def numpy_circle_to_circle_collision(circle, other):
+    distance = np.linalg.norm(np.array(circle.center) - np.array(other.center))
+    return distance <= circle.radius + other.radius
+
+
+def numpy_circle_to_rectangle_collision(circle, rectangle):
+    testx, testy = circle.center
+    if circle.center.x < rectangle.top_left.x:
+        testx = rectangle.top_left.x
+    if circle.center.x > rectangle.bottom_right.x:
+        testx = rectangle.bottom_right.x
+    if circle.center.y > rectangle.top_left.y:
+        testy = rectangle.top_left.y
+    if circle.center.y < rectangle.bottom_right.y:
+        testy = rectangle.bottom_right.y
+    distance = np.linalg.norm(np.array(circle.center) - np.array((testx, testy)))
+    return distance <= circle.radius
+
+
+def numpy_circle_to_polygon_collision(circle, polygon):
+    if collision.point_to_polygon_collision(circle.center, polygon):
+        return True
+    for line in polygon.lines:
+        if numpy_line_to_circle_collision(line, circle):
+            return True
+    return False
+
+
+def numpy_line_to_rectangle_collision(line, rectangle):
+    if collision.point_to_rectangle_collision(line.a, rectangle):
+        return True
+    if collision.point_to_rectangle_collision(line.b, rectangle):
+        return True
+    for rect_line in rectangle.lines:
+        if numpy_line_to_line_collision(line, rect_line):
+            return True
+    return False
+
+
+def numpy_line_to_polygon_collision(line, polygon):
+    for polygon_line in polygon.lines:
+        if numpy_line_to_line_collision(line, polygon_line):
+            return True
+    if collision.point_to_polygon_collision(line.a, polygon):
+        return True
+    return collision.point_to_polygon_collision(line.b, polygon)
+
+
+def numpy_polygon_to_polygon_collision(polygon, other):
+    for line in polygon.lines:
+        if numpy_line_to_polygon_collision(line, other):
+            return True
+    return collision.point_to_polygon_collision(other.points[0], polygon)
+
+
+point = Point2D(0.5, 0.25)
+line = Line2D(Point2D(-3, -2), Point2D(4, 5))
+other_line = Line2D(Point2D(-3, 5), Point2D(4, -2))
+circle = Circle(Point2D(3, 1), 1.5)
+other_circle = Circle(Point2D(0, -3), 2)
+rectangle = Rectangle(Point2D(-8, -4), Point2D(-6, -6))
+polygon = Polygon(
+    [Point2D(5, 5), Point2D(7, 6), Point2D(9, 5), Point2D(8, 8), Point2D(6, 8)]
+)
+other_polygon = Polygon(
+    [Point2D(-5, 5), Point2D(-7, 6), Point2D(-9, 5), Point2D(-8, 8), Point2D(-6, 8)]
+)
+
+CASES = [
+    ("distance", numpy_distance, Point2D.distance, (point, circle.center)),
+    (
+        "point_to_line",
+        numpy_point_to_line_collision,
+        collision.point_to_line_collision,
+        (point, line),
+    ),
+    (
+        "point_to_circle",
+        numpy_point_to_circle_collision,
+        collision.point_to_circle_collision,
+        (point, circle),
+    ),
+    (
+        "line_to_line",
+        numpy_line_to_line_collision,
+        collision.line_to_line_collision,
+        (line, other_line),
+    ),
+    (
+        "line_to_circle",
+        numpy_line_to_circle_collision,
+        collision.line_to_circle_collision,
+        (other_line, other_circle),
+    ),
+    (
+        "line_to_rectangle",
+        numpy_line_to_rectangle_collision,
+        collision.line_to_rectangle_collision,
+        (line, rectangle),
+    ),
+    (
+        "line_to_polygon",
+        numpy_line_to_polygon_collision,
+        collision.line_to_polygon_collision,
+        (line, other_polygon),
+    ),
+    (
+        "circle_to_circle",
+        numpy_circle_to_circle_collision,
+        collision.circle_to_circle_collision,
+        (circle, other_circle),
+    ),
+    (
+        "circle_to_rectangle",
+        numpy_circle_to_rectangle_collision,
+        collision.circle_to_rectangle_collision,
+        (circle, rectangle),
+    ),
+    (
+        "circle_to_polygon",
+        numpy_circle_to_polygon_collision,
+        collision.circle_to_polygon_collision,
+        (circle, polygon),
+    ),
+    (
+        "polygon_to_polygon",
+        numpy_polygon_to_polygon_collision,
+        collision.polygon_to_polygon_collision,
+        (polygon, other_polygon),
+    ),
+]
+
+
+def main():
+    print(f"{'test':<22}{'numpy (us)':>12}{'scalar (us)':>13}{'speedup':>10}")
+    for name, numpy_function, scalar_function, args in CASES:
+        assert numpy_function(*args) == scalar_function(*args)
+        numpy_time = timeit.timeit(lambda: numpy_function(*args), number=NUMBER)
+        scalar_time = timeit.timeit(lambda: scalar_function(*args), number=NUMBER)
+        print(
+            f"{name:<22}"
+            f"{numpy_time / NUMBER * 1e6:>12.2f}"
+            f"{scalar_time / NUMBER * 1e6:>13.2f}"
+            f"{numpy_time / scalar_time:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
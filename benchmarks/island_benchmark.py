@@ -0,0 +1,80 @@
+import os
+import sys
+import timeit
+
+import numpy as np
+
+from gaming_framework.physics.islands import (
+    BODY_TABLE_COLUMNS,
+    WorkerPool,
+    times_of_collision,
+)
+
+NUMBER = 20
+PAIR_COUNTS = [1024, 4096, 16384, 65536, 262144, 1048576]
+
+
+# the time of collision of a frame's pairs computed on the calling thread and
+# split between it and a pool of workers, as World does once a frame has at
+# least two batches of parallel_batch_size pairs. the pool only pays once the
+# kernel time it saves is larger than the round trip of a submit
+
+
+def random_frame(pair_count):
+    rng = np.random.default_rng(0)
+    body_count = pair_count // 2
+    body_table = rng.uniform(0, 10, (body_count, BODY_TABLE_COLUMNS))
+    pairs = rng.integers(0, body_count, (pair_count, 2))
+    return body_table, pairs
+
+
+def local(body_table, pairs):
+    times_of_collision(body_table, pairs)
+
+
+def pooled(pool, workers, body_table, pairs):
+    shared_body_table, shared_pairs, shared_times = pool.shared_arrays(
+        len(body_table), len(pairs)
+    )
+    shared_body_table[:] = body_table
+    shared_pairs[:] = pairs
+    bounds = np.linspace(0, len(pairs), workers + 2).astype(int).tolist()
+    futures = [pool.submit(start, end) for start, end in zip(bounds[1:-1], bounds[2:])]
+    shared_times[: bounds[1]] = times_of_collision(
+        shared_body_table, shared_pairs[: bounds[1]]
+    )
+    for future in futures:
+        future.result()
+
+
+def main():
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count()
+    pool = WorkerPool(workers)
+    try:
+        # starts the worker processes before timing anything
+        pooled(pool, workers, *random_frame(PAIR_COUNTS[0]))
+        print(f"{workers} workers")
+        print(f"{'pairs':<10}{'local (ms)':>12}{'pool (ms)':>12}{'speedup':>10}")
+        for pair_count in PAIR_COUNTS:
+            body_table, pairs = random_frame(pair_count)
+            local_time = (
+                timeit.timeit(lambda: local(body_table, pairs), number=NUMBER) / NUMBER
+            )
+            pool_time = (
+                timeit.timeit(
+                    lambda: pooled(pool, workers, body_table, pairs), number=NUMBER
+                )
+                / NUMBER
+            )
+            print(
+                f"{pair_count:<10}"
+                f"{local_time * 1000:>12.3f}"
+                f"{pool_time * 1000:>12.3f}"
+                f"{local_time / pool_time:>10.2f}"
+            )
+    finally:
+        pool.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import gc
+import tracemalloc
+
+from gaming_framework.geometry.shape import Circle, Point2D, Polygon, Rectangle
+
+NUMBER = 100000
+
+
+def make_circle(i):
+    return Circle(Point2D(i, i), 1)
+
+
+def make_rectangle(i):
+    return Rectangle(Point2D(i, i + 2), Point2D(i + 2, i))
+
+
+def make_polygon(i):
+    return Polygon([Point2D(i, i), Point2D(i + 4, i), Point2D(i + 2, i + 2)])
+
+
+def touch_derived_data(shape):
+    # fills the lazily computed caches, as a narrowphase test would
+    shape.bounding_box
+    shape.center
+    if not isinstance(shape, Circle):
+        shape.lines
+
+
+def measure(factory, derived):
+    gc.collect()
+    tracemalloc.start()
+    shapes = [factory(i) for i in range(NUMBER)]
+    if derived:
+        for shape in shapes:
+            touch_derived_data(shape)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del shapes
+    return size / NUMBER
+
+
+def main():
+    print(f"{'shape':<12}{'bare (bytes)':>14}{'derived (bytes)':>17}")
+    for name, factory in (
+        ("circle", make_circle),
+        ("rectangle", make_rectangle),
+        ("polygon", make_polygon),
+    ):
+        print(
+            f"{name:<12}"
+            f"{measure(factory, False):>14.0f}"
+            f"{measure(factory, True):>17.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
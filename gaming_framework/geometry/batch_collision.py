@@ -0,0 +1,110 @@
+import numpy as np
+
+from gaming_framework.geometry.collision import FLOAT_TOLERANCE
+
+# every function takes contiguous float arrays, points are (n, 2) arrays and
+# scalars (n,) arrays, pairs are matched by index and a boolean mask is returned
+
+
+def points_to_circles_collision(points, centers, radii):
+    points = np.asarray(points, dtype=float)
+    centers = np.asarray(centers, dtype=float)
+    distances = np.hypot(*(centers - points).T)
+    return distances <= np.asarray(radii, dtype=float) + FLOAT_TOLERANCE
+
+
+def points_to_rectangles_collision(points, top_lefts, bottom_rights):
+    points = np.asarray(points, dtype=float)
+    top_lefts = np.asarray(top_lefts, dtype=float)
+    bottom_rights = np.asarray(bottom_rights, dtype=float)
+    within_x = (top_lefts[:, 0] <= points[:, 0]) & (points[:, 0] <= bottom_rights[:, 0])
+    within_y = (bottom_rights[:, 1] <= points[:, 1]) & (points[:, 1] <= top_lefts[:, 1])
+    return within_x & within_y
+
+
+def points_to_polygon_collision(points, polygon_points):
+    # tests many points against a single polygon with the even-odd rule
+    points = np.asarray(points, dtype=float)
+    polygon_points = np.asarray(polygon_points, dtype=float)
+    a = polygon_points[:, np.newaxis, :]
+    b = np.roll(polygon_points, -1, axis=0)[:, np.newaxis, :]
+    x, y = points[np.newaxis, :, 0], points[np.newaxis, :, 1]
+    straddles = (a[..., 1] > y) != (b[..., 1] > y)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        crossing_x = (b[..., 0] - a[..., 0]) * (y - a[..., 1]) / (
+            b[..., 1] - a[..., 1]
+        ) + a[..., 0]
+    crossings = straddles & (x < crossing_x)
+    return np.count_nonzero(crossings, axis=0) % 2 == 1
+
+
+def lines_to_lines_collision(starts, ends, other_starts, other_ends):
+    starts = np.asarray(starts, dtype=float)
+    other_starts = np.asarray(other_starts, dtype=float)
+    ab = np.asarray(ends, dtype=float) - starts
+    cd = np.asarray(other_ends, dtype=float) - other_starts
+    ac = other_starts - starts
+    ab_cross_cd = ab[:, 0] * cd[:, 1] - ab[:, 1] * cd[:, 0]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t1 = (ac[:, 0] * cd[:, 1] - ac[:, 1] * cd[:, 0]) / ab_cross_cd
+        t2 = (ac[:, 0] * ab[:, 1] - ac[:, 1] * ab[:, 0]) / ab_cross_cd
+    return (ab_cross_cd != 0) & (0 <= t1) & (t1 <= 1) & (0 <= t2) & (t2 <= 1)
+
+
+def circles_to_circles_collision(centers, radii, other_centers, other_radii):
+    centers = np.asarray(centers, dtype=float)
+    other_centers = np.asarray(other_centers, dtype=float)
+    distances = np.hypot(*(centers - other_centers).T)
+    return distances <= np.asarray(radii, dtype=float) + np.asarray(
+        other_radii, dtype=float
+    )
+
+
+def circles_to_rectangles_collision(centers, radii, top_lefts, bottom_rights):
+    centers = np.asarray(centers, dtype=float)
+    top_lefts = np.asarray(top_lefts, dtype=float)
+    bottom_rights = np.asarray(bottom_rights, dtype=float)
+    test_x = np.clip(centers[:, 0], top_lefts[:, 0], bottom_rights[:, 0])
+    test_y = np.clip(centers[:, 1], bottom_rights[:, 1], top_lefts[:, 1])
+    distances = np.hypot(centers[:, 0] - test_x, centers[:, 1] - test_y)
+    return distances <= np.asarray(radii, dtype=float)
+
+
+def rectangles_to_rectangles_collision(
+    top_lefts, bottom_rights, other_top_lefts, other_bottom_rights
+):
+    top_lefts = np.asarray(top_lefts, dtype=float)
+    bottom_rights = np.asarray(bottom_rights, dtype=float)
+    other_top_lefts = np.asarray(other_top_lefts, dtype=float)
+    other_bottom_rights = np.asarray(other_bottom_rights, dtype=float)
+    return (
+        (bottom_rights[:, 0] >= other_top_lefts[:, 0])
+        & (top_lefts[:, 0] <= other_bottom_rights[:, 0])
+        & (bottom_rights[:, 1] <= other_top_lefts[:, 1])
+        & (top_lefts[:, 1] >= other_bottom_rights[:, 1])
+    )
+
+
+def moving_circles_time_of_collision(
+    centers, speeds, radii, other_centers, other_speeds, other_radii
+):
+    # earliest time at which each pair of circles touches, 0 when they are
+    # already overlapping and approaching, negative when they never touch or
+    # have no relative movement
+    relative_centers = np.asarray(centers, dtype=float) - np.asarray(
+        other_centers, dtype=float
+    )
+    relative_speeds = np.asarray(speeds, dtype=float) - np.asarray(
+        other_speeds, dtype=float
+    )
+    distances = np.asarray(radii, dtype=float) + np.asarray(other_radii, dtype=float)
+    a = np.einsum("ij,ij->i", relative_speeds, relative_speeds)
+    b = 2 * np.einsum("ij,ij->i", relative_centers, relative_speeds)
+    c = np.einsum("ij,ij->i", relative_centers, relative_centers) - distances**2
+    delta = b**2 - 4 * a * c
+    with np.errstate(divide="ignore", invalid="ignore"):
+        d = np.sqrt(np.maximum(delta, 0))
+        t1 = (-b - d) / (2 * a)
+        t2 = (-b + d) / (2 * a)
+    times = np.where((t1 < 0) & (t2 > 0) & (b <= 0), 0.0, t1)
+    return np.where((delta < 0) | (a == 0), -1.0, times)
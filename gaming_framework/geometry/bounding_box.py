@@ -1,106 +1,200 @@
+import weakref
+from collections import OrderedDict
+
 from gaming_framework.geometry.shape import (
     Circle,
     Line2D,
     Point2D,
     Polygon,
     Rectangle,
+    Shape,
     ShapeVisitor,
 )
 
 
+class ShapeCache:
+    # least recently used cache of values computed from shapes, shapes that
+    # support weak references are keyed by identity and dropped as soon as
+    # they are garbage collected, points and lines are tuples so they are
+    # keyed by value and only dropped by the size bound
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __key(self, shape: Shape):
+        if isinstance(shape, tuple):
+            return shape
+        return id(shape)
+
+    def __forget(self, key, reference: weakref.ref):
+        # the id may already belong to a newer shape with its own entry
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] is reference:
+            del self._entries[key]
+
+    def get(self, shape: Shape):
+        key = self.__key(shape)
+        entry = self._entries.get(key)
+        if entry is None or (entry[0] is not None and entry[0]() is not shape):
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, shape: Shape, value):
+        key = self.__key(shape)
+        reference = None
+        if not isinstance(shape, tuple):
+            reference = weakref.ref(shape, lambda ref: self.__forget(key, ref))
+        self._entries[key] = (reference, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, shape: Shape):
+        # for shapes that were changed in place
+        self._entries.pop(self.__key(shape), None)
+
+    def clear(self):
+        self._entries.clear()
+
+
 class CircleBoundingBox(ShapeVisitor):
-    def __init__(self):
-        self.memory = {}
+    def __init__(self, max_size: int = 1024):
+        self.memory = ShapeCache(max_size)
 
     def accept_point(self, point: Point2D):
-        if point in self.memory:
-            return self.memory[point]
-        self.memory[point] = Circle(self, 1)
-        return self.memory[point]
+        circle = self.memory.get(point)
+        if circle is None:
+            circle = self.memory.put(point, Circle(point, 1))
+        return circle
 
     def accept_line(self, line: Line2D):
-        if line in self.memory:
-            return self.memory[line]
-        radius = line.size / 2
-        self.memory[line] = Circle(line.center, radius)
-        return self.memory[line]
+        circle = self.memory.get(line)
+        if circle is None:
+            radius = line.size / 2
+            circle = self.memory.put(line, Circle(line.center, radius))
+        return circle
 
     def accept_circle(self, circle: Circle):
         return circle
 
     def accept_rectangle(self, rectangle: Rectangle):
-        if rectangle in self.memory:
-            return self.memory[rectangle]
-        radius = rectangle.top_left.distance(rectangle.bottom_right) / 2
-        self.memory[rectangle] = Circle(rectangle.center, radius)
-        return self.memory[rectangle]
+        circle = self.memory.get(rectangle)
+        if circle is None:
+            radius = rectangle.top_left.distance(rectangle.bottom_right) / 2
+            circle = self.memory.put(rectangle, Circle(rectangle.center, radius))
+        return circle
 
     def accept_polygon(self, polygon: Polygon):
-        if polygon in self.memory:
-            return self.memory[polygon]
-        top = max(point.y for point in polygon.points)
-        left = min(point.x for point in polygon.points)
-        bottom = min(point.y for point in polygon.points)
-        right = max(point.x for point in polygon.points)
-        top_left = Point2D(left, top)
-        bottom_right = Point2D(right, bottom)
-        center = (top_left + bottom_right).scalar_div(2)
-        radius = top_left.distance(bottom_right) / 2
-        self.memory[polygon] = Circle(center, radius)
-        return self.memory[polygon]
+        circle = self.memory.get(polygon)
+        if circle is None:
+            top = max(point.y for point in polygon.points)
+            left = min(point.x for point in polygon.points)
+            bottom = min(point.y for point in polygon.points)
+            right = max(point.x for point in polygon.points)
+            top_left = Point2D(left, top)
+            bottom_right = Point2D(right, bottom)
+            center = (top_left + bottom_right).scalar_div(2)
+            radius = top_left.distance(bottom_right) / 2
+            circle = self.memory.put(polygon, Circle(center, radius))
+        return circle
 
 
 class RectangleBoundingBox(ShapeVisitor):
-    def __init__(self):
-        self.memory = {}
+    def __init__(self, max_size: int = 1024):
+        self.memory = ShapeCache(max_size)
 
     def accept_point(self, point: Point2D):
-        if point in self.memory:
-            return self.memory[point]
-        top = point.y + 1
-        left = point.x - 1
-        bottom = point.y - 1
-        right = point.x + 1
-        top_left = Point2D(left, top)
-        bottom_right = Point2D(right, bottom)
-        self.memory[point] = Rectangle(top_left, bottom_right)
-        return self.memory[point]
+        rectangle = self.memory.get(point)
+        if rectangle is None:
+            top_left = Point2D(point.x - 1, point.y + 1)
+            bottom_right = Point2D(point.x + 1, point.y - 1)
+            rectangle = self.memory.put(point, Rectangle(top_left, bottom_right))
+        return rectangle
 
     def accept_line(self, line: Line2D):
-        if line in self.memory:
-            return self.memory[line]
-        top = max(line.a.y, line.b.y)
-        left = min(line.a.x, line.b.x)
-        bottom = min(line.a.y, line.b.y)
-        right = max(line.a.x, line.b.x)
-        top_left = Point2D(left, top)
-        bottom_right = Point2D(right, bottom)
-        self.memory[line] = Rectangle(top_left, bottom_right)
-        return self.memory[line]
+        rectangle = self.memory.get(line)
+        if rectangle is None:
+            top = max(line.a.y, line.b.y)
+            left = min(line.a.x, line.b.x)
+            bottom = min(line.a.y, line.b.y)
+            right = max(line.a.x, line.b.x)
+            top_left = Point2D(left, top)
+            bottom_right = Point2D(right, bottom)
+            rectangle = self.memory.put(line, Rectangle(top_left, bottom_right))
+        return rectangle
 
     def accept_circle(self, circle: Circle):
-        if circle in self.memory:
-            return self.memory[circle]
-        top = circle.center.y + circle.radius
-        left = circle.center.x - circle.radius
-        bottom = circle.center.y - circle.radius
-        right = circle.center.y + circle.radius
-        top_left = Point2D(left, top)
-        bottom_right = Point2D(right, bottom)
-        self.memory[circle] = Rectangle(top_left, bottom_right)
-        return self.memory[circle]
+        rectangle = self.memory.get(circle)
+        if rectangle is None:
+            top = circle.center.y + circle.radius
+            left = circle.center.x - circle.radius
+            bottom = circle.center.y - circle.radius
+            right = circle.center.x + circle.radius
+            top_left = Point2D(left, top)
+            bottom_right = Point2D(right, bottom)
+            rectangle = self.memory.put(circle, Rectangle(top_left, bottom_right))
+        return rectangle
 
     def accept_rectangle(self, rectangle: Rectangle):
         return rectangle
 
     def accept_polygon(self, polygon: Polygon):
-        if polygon in self.memory:
-            return self.memory[polygon]
-        top = max(point.y for point in polygon.points)
-        left = min(point.x for point in polygon.points)
-        bottom = min(point.y for point in polygon.points)
-        right = max(point.x for point in polygon.points)
-        top_left = Point2D(left, top)
-        bottom_right = Point2D(right, bottom)
-        self.memory[polygon] = Rectangle(top_left, bottom_right)
-        return self.memory[polygon]
+        rectangle = self.memory.get(polygon)
+        if rectangle is None:
+            top = max(point.y for point in polygon.points)
+            left = min(point.x for point in polygon.points)
+            bottom = min(point.y for point in polygon.points)
+            right = max(point.x for point in polygon.points)
+            top_left = Point2D(left, top)
+            bottom_right = Point2D(right, bottom)
+            rectangle = self.memory.put(polygon, Rectangle(top_left, bottom_right))
+        return rectangle
+
+
+# extents are (left, bottom, right, top) tuples
+class AxisAlignedExtents(ShapeVisitor):
+    def accept_point(self, point: Point2D) -> tuple[float, float, float, float]:
+        return (point.x, point.y, point.x, point.y)
+
+    def accept_line(self, line: Line2D) -> tuple[float, float, float, float]:
+        return (
+            min(line.a.x, line.b.x),
+            min(line.a.y, line.b.y),
+            max(line.a.x, line.b.x),
+            max(line.a.y, line.b.y),
+        )
+
+    def accept_circle(self, circle: Circle) -> tuple[float, float, float, float]:
+        return (
+            circle.center.x - circle.radius,
+            circle.center.y - circle.radius,
+            circle.center.x + circle.radius,
+            circle.center.y + circle.radius,
+        )
+
+    def accept_rectangle(
+        self, rectangle: Rectangle
+    ) -> tuple[float, float, float, float]:
+        return (
+            rectangle.top_left.x,
+            rectangle.bottom_right.y,
+            rectangle.bottom_right.x,
+            rectangle.top_left.y,
+        )
+
+    def accept_polygon(self, polygon: Polygon) -> tuple[float, float, float, float]:
+        return (
+            min(point.x for point in polygon.points),
+            min(point.y for point in polygon.points),
+            max(point.x for point in polygon.points),
+            max(point.y for point in polygon.points),
+        )
@@ -1,4 +1,4 @@
-import numpy as np
+import math
 
 # USED TO HANDLE FLOAT IMPRECISION
 FLOAT_TOLERANCE = 0.000000000000001
@@ -9,14 +9,14 @@ def point_to_point_collision(point, other):
 
 
 def point_to_line_collision(point, line):
-    d1 = np.linalg.norm(np.array(point) - np.array(line.a))
-    d2 = np.linalg.norm(np.array(point) - np.array(line.b))
-    line_size = np.linalg.norm(np.array(line.b) - np.array(line.a))
+    d1 = math.hypot(point.x - line.a.x, point.y - line.a.y)
+    d2 = math.hypot(point.x - line.b.x, point.y - line.b.y)
+    line_size = math.hypot(line.b.x - line.a.x, line.b.y - line.a.y)
     return (d1 + d2) == line_size
 
 
 def point_to_circle_collision(point, circle):
-    distance = np.linalg.norm(np.array(circle.center) - np.array(point))
+    distance = math.hypot(circle.center.x - point.x, circle.center.y - point.y)
     return distance <= (circle.radius + FLOAT_TOLERANCE)
 
 
@@ -29,26 +29,25 @@ def point_to_rectangle_collision(point, rectangle):
 def point_to_polygon_collision(point, polygon):
     collision = False
     for line in polygon.lines:
-        a = (line.a.y > point.y) != (line.b.y > point.y)
-        b = (
-            point.x
-            < (line.b.x - line.a.x) * (point.y - line.a.y) / (line.b.y - line.a.y)
-            + line.a.x
-        )
-        if a and b:
+        if (line.a.y > point.y) == (line.b.y > point.y):
+            continue
+        crossing_x = (line.b.x - line.a.x) * (point.y - line.a.y) / (
+            line.b.y - line.a.y
+        ) + line.a.x
+        if point.x < crossing_x:
             collision = not collision
     return collision
 
 
 def line_to_line_collision(line, other):
-    ab = np.array(line.b) - np.array(line.a)
-    cd = np.array(other.b) - np.array(other.a)
-    ab_cross_cd = np.cross(ab, cd)
+    ab_x, ab_y = line.b.x - line.a.x, line.b.y - line.a.y
+    cd_x, cd_y = other.b.x - other.a.x, other.b.y - other.a.y
+    ab_cross_cd = ab_x * cd_y - ab_y * cd_x
     if ab_cross_cd == 0:
         return False
-    ac = np.array(other.a) - np.array(line.a)
-    t1 = np.cross(ac, cd) / ab_cross_cd
-    t2 = np.cross(-ab, ac) / ab_cross_cd
+    ac_x, ac_y = other.a.x - line.a.x, other.a.y - line.a.y
+    t1 = (ac_x * cd_y - ac_y * cd_x) / ab_cross_cd
+    t2 = (ac_x * ab_y - ac_y * ab_x) / ab_cross_cd
     return (0 <= t1 <= 1) and (0 <= t2 <= 1)
 
 
@@ -57,14 +56,19 @@ def line_to_circle_collision(line, circle):
         return True
     if point_to_circle_collision(line.b, circle):
         return True
-    distance = np.linalg.norm(line.a - line.b)
-    product = np.dot(circle.center - line.a, line.b - line.a) / distance**2
-    closest_px = line.a.x + (product * (line.b.x - line.a.x))
-    closets_py = line.a.y + (product * (line.b.y - line.a.y))
-    closest_point = (closest_px, closets_py)
-    if point_to_line_collision(closest_point, line) == False:
+    ab_x, ab_y = line.b.x - line.a.x, line.b.y - line.a.y
+    squared_size = ab_x * ab_x + ab_y * ab_y
+    if squared_size == 0:
         return False
-    distance = np.linalg.norm(circle.center - closest_point)
+    product = (
+        (circle.center.x - line.a.x) * ab_x + (circle.center.y - line.a.y) * ab_y
+    ) / squared_size
+    # the closest point of the infinite line must lie on the segment
+    if not 0 <= product <= 1:
+        return False
+    closest_x = line.a.x + product * ab_x
+    closest_y = line.a.y + product * ab_y
+    distance = math.hypot(circle.center.x - closest_x, circle.center.y - closest_y)
     return distance <= circle.radius
 
 
@@ -91,21 +95,16 @@ def line_to_polygon_collision(line, polygon):
 
 
 def circle_to_circle_collision(circle, other):
-    distance = np.linalg.norm(circle.center - other.center)
+    distance = math.hypot(
+        circle.center.x - other.center.x, circle.center.y - other.center.y
+    )
     return distance <= circle.radius + other.radius
 
 
 def circle_to_rectangle_collision(circle, rectangle):
-    testx, testy = circle.center
-    if circle.center.x < rectangle.top_left.x:
-        testx = rectangle.top_left.x
-    if circle.center.x > rectangle.bottom_right.x:
-        testx = rectangle.bottom_right.x
-    if circle.center.y > rectangle.top_left.y:
-        testy = rectangle.top_left.y
-    if circle.center.y < rectangle.bottom_right.y:
-        testy = rectangle.bottom_right.y
-    distance = np.linalg.norm(np.array(circle.center) - np.array((testx, testy)))
+    testx = min(max(circle.center.x, rectangle.top_left.x), rectangle.bottom_right.x)
+    testy = min(max(circle.center.y, rectangle.bottom_right.y), rectangle.top_left.y)
+    distance = math.hypot(circle.center.x - testx, circle.center.y - testy)
     return distance <= circle.radius
 
 
@@ -127,7 +126,28 @@ def rectangle_to_rectangle_collision(rectangle, other):
     )
 
 
+def _project(points, axis):
+    products = [point.x * axis[0] + point.y * axis[1] for point in points]
+    return min(products), max(products)
+
+
+def _separated(shape, other):
+    # shape.projections holds the projection of shape onto each of its normals
+    for axis, (low, high) in zip(shape.normals, shape.projections):
+        other_low, other_high = _project(other.points, axis)
+        if other_high < low or other_low > high:
+            return True
+    return False
+
+
+def convex_to_convex_collision(shape, other):
+    # separating axis theorem, both shapes must be convex
+    return not _separated(shape, other) and not _separated(other, shape)
+
+
 def rectangle_to_polygon_collision(rectangle, polygon):
+    if polygon.is_convex:
+        return convex_to_convex_collision(rectangle, polygon)
     for line in polygon.lines:
         if line_to_rectangle_collision(line, rectangle):
             return True
@@ -135,6 +155,8 @@ def rectangle_to_polygon_collision(rectangle, polygon):
 
 
 def polygon_to_polygon_collision(polygon, other):
+    if polygon.is_convex and other.is_convex:
+        return convex_to_convex_collision(polygon, other)
     for line in polygon.lines:
         if line_to_polygon_collision(line, other):
             return True
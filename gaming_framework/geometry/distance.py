@@ -0,0 +1,61 @@
+import math
+
+from gaming_framework.geometry.collision import (
+    point_to_polygon_collision,
+    point_to_rectangle_collision,
+)
+from gaming_framework.geometry.shape import (
+    Circle,
+    Line2D,
+    Point2D,
+    Polygon,
+    Rectangle,
+    ShapeVisitor,
+)
+
+
+def point_to_extents_distance(
+    point: Point2D, extents: tuple[float, float, float, float]
+) -> float:
+    # distance to (left, bottom, right, top), 0 when the point is inside
+    dx = max(extents[0] - point.x, 0, point.x - extents[2])
+    dy = max(extents[1] - point.y, 0, point.y - extents[3])
+    return math.hypot(dx, dy)
+
+
+def point_to_line_distance(point: Point2D, line: Line2D) -> float:
+    edge = line.b - line.a
+    squared_size = edge * edge
+    if squared_size == 0:
+        return point.distance(line.a)
+    product = min(max((point - line.a) * edge / squared_size, 0), 1)
+    return point.distance(line.a + edge.scalar_mult(product))
+
+
+# distance from a point to the closest point of a shape, 0 when the point is
+# inside the shape
+class PointDistance(ShapeVisitor):
+    def accept_point(self, other: Point2D, point: Point2D) -> float:
+        return point.distance(other)
+
+    def accept_line(self, line: Line2D, point: Point2D) -> float:
+        return point_to_line_distance(point, line)
+
+    def accept_circle(self, circle: Circle, point: Point2D) -> float:
+        return max(point.distance(circle.center) - circle.radius, 0)
+
+    def accept_rectangle(self, rectangle: Rectangle, point: Point2D) -> float:
+        if point_to_rectangle_collision(point, rectangle):
+            return 0
+        extents = (
+            rectangle.top_left.x,
+            rectangle.bottom_right.y,
+            rectangle.bottom_right.x,
+            rectangle.top_left.y,
+        )
+        return point_to_extents_distance(point, extents)
+
+    def accept_polygon(self, polygon: Polygon, point: Point2D) -> float:
+        if point_to_polygon_collision(point, polygon):
+            return 0
+        return min(point_to_line_distance(point, line) for line in polygon.lines)
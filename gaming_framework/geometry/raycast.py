@@ -0,0 +1,105 @@
+import math
+
+from gaming_framework.geometry.collision import (
+    FLOAT_TOLERANCE,
+    point_to_polygon_collision,
+)
+from gaming_framework.geometry.shape import (
+    Circle,
+    Line2D,
+    Point2D,
+    Polygon,
+    Rectangle,
+    ShapeVisitor,
+)
+
+# rays are an origin and a unit direction, distances are measured along the
+# direction and a ray starting inside a shape hits it at distance 0
+
+
+def ray_to_extents_distance(
+    origin: Point2D, direction: Point2D, extents: tuple[float, float, float, float]
+) -> float:
+    # slab test against (left, bottom, right, top), returns the distance at
+    # which the ray enters the extents or None when it misses them
+    enter, leave = 0, math.inf
+    for start, step, low, high in (
+        (origin.x, direction.x, extents[0], extents[2]),
+        (origin.y, direction.y, extents[1], extents[3]),
+    ):
+        if step == 0:
+            if start < low or start > high:
+                return None
+            continue
+        near, far = (low - start) / step, (high - start) / step
+        if near > far:
+            near, far = far, near
+        enter, leave = max(enter, near), min(leave, far)
+        if enter > leave:
+            return None
+    return enter
+
+
+def ray_to_line_distance(origin: Point2D, direction: Point2D, line: Line2D) -> float:
+    edge = line.b - line.a
+    to_start = line.a - origin
+    denominator = direction.cross(edge)
+    if denominator == 0:
+        if abs(to_start.cross(direction)) > FLOAT_TOLERANCE:
+            return None
+        # the segment lies on the ray, the nearest end ahead is hit first
+        start, end = to_start * direction, (line.b - origin) * direction
+        if max(start, end) < 0:
+            return None
+        return max(min(start, end), 0)
+    distance = to_start.cross(edge) / denominator
+    position = to_start.cross(direction) / denominator
+    if distance < 0 or not 0 <= position <= 1:
+        return None
+    return distance
+
+
+class RayIntersection(ShapeVisitor):
+    def accept_point(self, point: Point2D, origin: Point2D, direction: Point2D):
+        to_point = point - origin
+        if abs(to_point.cross(direction)) > FLOAT_TOLERANCE:
+            return None
+        distance = to_point * direction
+        return distance if distance >= 0 else None
+
+    def accept_line(self, line: Line2D, origin: Point2D, direction: Point2D):
+        return ray_to_line_distance(origin, direction, line)
+
+    def accept_circle(self, circle: Circle, origin: Point2D, direction: Point2D):
+        to_origin = origin - circle.center
+        b = to_origin * direction
+        c = to_origin * to_origin - circle.radius * circle.radius
+        if c > 0 and b > 0:
+            return None
+        delta = b * b - c
+        if delta < 0:
+            return None
+        return max(-b - math.sqrt(delta), 0)
+
+    def accept_rectangle(
+        self, rectangle: Rectangle, origin: Point2D, direction: Point2D
+    ):
+        extents = (
+            rectangle.top_left.x,
+            rectangle.bottom_right.y,
+            rectangle.bottom_right.x,
+            rectangle.top_left.y,
+        )
+        return ray_to_extents_distance(origin, direction, extents)
+
+    def accept_polygon(self, polygon: Polygon, origin: Point2D, direction: Point2D):
+        if point_to_polygon_collision(origin, polygon):
+            return 0
+        distances = [
+            distance
+            for distance in (
+                ray_to_line_distance(origin, direction, line) for line in polygon.lines
+            )
+            if distance is not None
+        ]
+        return min(distances, default=None)
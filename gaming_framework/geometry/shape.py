@@ -1,8 +1,7 @@
+import math
 from collections import namedtuple
 from dataclasses import dataclass, field
 
-import numpy as np
-
 from gaming_framework.geometry.collision import (
     circle_to_circle_collision,
     circle_to_polygon_collision,
@@ -43,6 +42,9 @@ class ShapeVisitor:
 
 
 class Shape:
+    # tuple based shapes ignore the weak reference slot
+    __slots__ = ("__weakref__",)
+
     def __hash__(self):
         return id(self)
 
@@ -79,6 +81,8 @@ class Shape:
 
 
 class Point2D(namedtuple("Point2D", ["x", "y"]), Shape):
+    __slots__ = ()
+
     def __add__(self, other):
         return Point2D(self.x + other.x, self.y + other.y)
 
@@ -86,7 +90,21 @@ class Point2D(namedtuple("Point2D", ["x", "y"]), Shape):
         return Point2D(self.x - other.x, self.y - other.y)
 
     def __mul__(self, other: "Point2D") -> float:
-        return self.x * other.x + self.y + other.y
+        return self.x * other.x + self.y * other.y
+
+    def __neg__(self):
+        return Point2D(-self.x, -self.y)
+
+    def cross(self, other: "Point2D") -> float:
+        return self.x * other.y - self.y * other.x
+
+    @property
+    def length(self) -> float:
+        return math.hypot(self.x, self.y)
+
+    def normalized(self) -> "Point2D":
+        length = self.length
+        return Point2D(self.x / length, self.y / length)
 
     @property
     def bounding_box(self):
@@ -121,7 +139,7 @@ class Point2D(namedtuple("Point2D", ["x", "y"]), Shape):
         return visitor.accept_point(self, *args, **kwargs)
 
     def distance(self, other):
-        return np.linalg.norm(np.array(self - other))
+        return math.hypot(self.x - other.x, self.y - other.y)
 
     def scalar_mult(self, scalar):
         return Point2D(self.x * scalar, self.y * scalar)
@@ -131,31 +149,20 @@ class Point2D(namedtuple("Point2D", ["x", "y"]), Shape):
 
 
 class Line2D(namedtuple("Line2D", ["a", "b"]), Shape):
-    _center: Point2D = field(init=False, default=None)
-    _size: float = field(init=False, default=0)
-    _bouding_box: "Circle" = field(init=False, default=None)
+    # tuples can not hold cache slots, the derived data is cheap to recompute
+    __slots__ = ()
 
     @property
     def bounding_box(self):
-        if self._bouding_box is not None:
-            return self._bouding_box
-        radius = self.size / 2
-        self._bouding_box = Circle(self.center, radius)
-        return self._bouding_box
+        return Circle(self.center, self.size / 2)
 
     @property
     def center(self):
-        if self._center is not None:
-            return self._center
-        c = self.a + self.b
-        self._center = Point2D(c.x / 2, c.y / 2)
-        return self._center
+        return Point2D((self.a.x + self.b.x) / 2, (self.a.y + self.b.y) / 2)
 
     @property
     def size(self):
-        if self._size is not None:
-            return self._size
-        self._size = self.a.distance(self.b)
+        return self.a.distance(self.b)
 
     def center_to(self, point):
         dx = point.x - self.center.x
@@ -165,7 +172,7 @@ class Line2D(namedtuple("Line2D", ["a", "b"]), Shape):
         return Line2D(a, b)
 
     def point_collision(self, point):
-        return point_to_line_collision(self, point)
+        return point_to_line_collision(point, self)
 
     def line_collision(self, line):
         return line_to_line_collision(self, line)
@@ -186,7 +193,7 @@ class Line2D(namedtuple("Line2D", ["a", "b"]), Shape):
         return visitor.accept_line(self, *args, **kwargs)
 
 
-@dataclass
+@dataclass(slots=True)
 class Circle(Shape):
     center: Point2D
     radius: float
@@ -220,7 +227,7 @@ class Circle(Shape):
         return visitor.accept_circle(self, *args, **kwargs)
 
 
-@dataclass
+@dataclass(slots=True)
 class Rectangle(Shape):
     top_left: Point2D
     bottom_right: Point2D
@@ -273,6 +280,17 @@ class Rectangle(Shape):
         self._center = Point2D(c.x / 2, c.y / 2)
         return self._center
 
+    @property
+    def normals(self):
+        return ((1, 0), (0, 1))
+
+    @property
+    def projections(self):
+        return (
+            (self.top_left.x, self.bottom_right.x),
+            (self.bottom_right.y, self.top_left.y),
+        )
+
     @property
     def width(self):
         return self.bottom_right.x - self.top_left.x
@@ -314,12 +332,15 @@ class Rectangle(Shape):
         return visitor.accept_rectangle(self, *args, **kwargs)
 
 
-@dataclass
+@dataclass(slots=True)
 class Polygon(Shape):
     points: list[Point2D]
     _center: Point2D = field(init=False, default=None)
     _bounding_box: Circle = field(init=False, default=None)
     _lines: list[Line2D] = field(init=False, default=None)
+    _is_convex: bool = field(init=False, default=None)
+    _normals: list[tuple[float, float]] = field(init=False, default=None)
+    _projections: list[tuple[float, float]] = field(init=False, default=None)
 
     @property
     def bounding_box(self):
@@ -360,10 +381,53 @@ class Polygon(Shape):
             self._lines.append(Line2D(point_a, point_b))
         return self._lines
 
+    @property
+    def is_convex(self):
+        if self._is_convex is not None:
+            return self._is_convex
+        # every turn must go the same way and the turns must add up to a
+        # single revolution, otherwise the polygon is concave or self crossing
+        sign = 0
+        total_angle = 0
+        for i, point in enumerate(self.points):
+            previous = point - self.points[i - 1]
+            following = self.points[(i + 1) % len(self.points)] - point
+            cross = previous.x * following.y - previous.y * following.x
+            if cross != 0:
+                if sign * cross < 0:
+                    self._is_convex = False
+                    return self._is_convex
+                sign = cross
+            total_angle += math.atan2(cross, previous * following)
+        self._is_convex = len(self.points) >= 3 and (
+            abs(abs(total_angle) - 2 * math.pi) < 1e-6
+        )
+        return self._is_convex
+
+    @property
+    def normals(self):
+        if self._normals is not None:
+            return self._normals
+        self._normals = []
+        for line in self.lines:
+            if line.a != line.b:
+                self._normals.append((line.a.y - line.b.y, line.b.x - line.a.x))
+        return self._normals
+
+    @property
+    def projections(self):
+        if self._projections is not None:
+            return self._projections
+        self._projections = []
+        for x, y in self.normals:
+            products = [point.x * x + point.y * y for point in self.points]
+            self._projections.append((min(products), max(products)))
+        return self._projections
+
     def center_to(self, point):
         dx = point.x - self.center.x
         dy = point.y - self.center.y
-        return Polygon([Point2D(p.x + dx, p.y + dy) for p in self.polygon.points])
+        return Polygon([Point2D(p.x + dx, p.y + dy) for p in self.points])
 
     def point_collision(self, point):
         return point_to_polygon_collision(point, self)
@@ -0,0 +1,234 @@
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from gaming_framework.geometry.shape import (
+    Circle,
+    Line2D,
+    Point2D,
+    Polygon,
+    Rectangle,
+    ShapeVisitor,
+)
+
+FREE = -1
+CIRCLE = 0
+RECTANGLE = 1
+POLYGON = 2
+
+
+def _grown(array: np.ndarray, capacity: int) -> np.ndarray:
+    grown = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+    grown[: len(array)] = array
+    return grown
+
+
+class StoredShape:
+    # shapes whose data lives in a row of a ShapeStore, they are views that
+    # read the store on every access and only cache derived data that does
+    # not depend on where the shape is
+    def __init__(self, store: "ShapeStore", index: int):
+        self.store = store
+        self.index = index
+
+    def __hash__(self) -> int:
+        return id(self)
+
+    def __eq__(self, other) -> bool:
+        return id(self) == id(other)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(index={self.index})"
+
+    @property
+    def center(self) -> Point2D:
+        return Point2D(*self.store.centers[self.index].tolist())
+
+    @property
+    def radius(self) -> float:
+        return float(self.store.radii[self.index])
+
+    @property
+    def bounding_box(self) -> Circle:
+        return Circle(self.center, self.radius)
+
+    @property
+    def lines(self) -> list[Line2D]:
+        points = self.points
+        return [
+            Line2D(point, points[(i + 1) % len(points)])
+            for i, point in enumerate(points)
+        ]
+
+    def set_center(self, point: Point2D):
+        self.store.centers[self.index] = point
+
+
+class StoredCircle(StoredShape, Circle):
+    @property
+    def bounding_box(self) -> Circle:
+        return self
+
+
+class StoredRectangle(StoredShape, Rectangle):
+    @property
+    def top_left(self) -> Point2D:
+        x, y = self.store.centers[self.index].tolist()
+        half_width, half_height = self.store.half_extents[self.index].tolist()
+        return Point2D(x - half_width, y + half_height)
+
+    @property
+    def bottom_right(self) -> Point2D:
+        x, y = self.store.centers[self.index].tolist()
+        half_width, half_height = self.store.half_extents[self.index].tolist()
+        return Point2D(x + half_width, y - half_height)
+
+    @property
+    def points(self) -> list[Point2D]:
+        top_left, bottom_right = self.top_left, self.bottom_right
+        return [
+            top_left,
+            Point2D(bottom_right.x, top_left.y),
+            bottom_right,
+            Point2D(top_left.x, bottom_right.y),
+        ]
+
+
+class StoredPolygon(StoredShape, Polygon):
+    def __init__(self, store: "ShapeStore", index: int):
+        super().__init__(store, index)
+        # the dataclass __init__ is never called, so the cache slots are unset,
+        # the convexity and normals do not depend on where the polygon is
+        self._is_convex = None
+        self._normals = None
+        self._projections = None
+
+    @property
+    def points(self) -> list[Point2D]:
+        start = self.store.vertex_starts[self.index]
+        end = start + self.store.vertex_counts[self.index]
+        vertices = self.store.vertices[start:end] + self.store.centers[self.index]
+        return [Point2D(x, y) for x, y in vertices.tolist()]
+
+    @property
+    def projections(self) -> list[tuple[float, float]]:
+        # unlike the normals these depend on where the polygon is
+        points = self.points
+        projections = []
+        for x, y in self.normals:
+            products = [point.x * x + point.y * y for point in points]
+            projections.append((min(products), max(products)))
+        return projections
+
+
+@dataclass
+class ShapeStore(ShapeVisitor):
+    # circles, rectangles and polygons kept as contiguous arrays, every shape
+    # has a center, a bounding radius and the half extents of its axis aligned
+    # box, polygons also own a range of vertices relative to their center
+    capacity: int = 64
+
+    kinds: np.ndarray = field(init=False)
+    centers: np.ndarray = field(init=False)
+    radii: np.ndarray = field(init=False)
+    half_extents: np.ndarray = field(init=False)
+    vertex_starts: np.ndarray = field(init=False)
+    vertex_counts: np.ndarray = field(init=False)
+    vertices: np.ndarray = field(init=False)
+
+    _size: int = field(init=False, default=0)
+    _vertex_size: int = field(init=False, default=0)
+    _free: list[int] = field(init=False, default_factory=list)
+
+    def __post_init__(self):
+        self.kinds = np.full(self.capacity, FREE, dtype=np.int8)
+        self.centers = np.zeros((self.capacity, 2))
+        self.radii = np.zeros(self.capacity)
+        self.half_extents = np.zeros((self.capacity, 2))
+        self.vertex_starts = np.zeros(self.capacity, dtype=np.int64)
+        self.vertex_counts = np.zeros(self.capacity, dtype=np.int64)
+        self.vertices = np.zeros((self.capacity, 2))
+
+    def __hash__(self) -> int:
+        return id(self)
+
+    def __eq__(self, other) -> bool:
+        return id(self) == id(other)
+
+    def __len__(self) -> int:
+        return self._size - len(self._free)
+
+    def __allocate(self, kind: int) -> int:
+        if self._free:
+            index = self._free.pop()
+        else:
+            if self._size == len(self.kinds):
+                capacity = 2 * len(self.kinds)
+                self.kinds = _grown(self.kinds, capacity)
+                self.kinds[self._size :] = FREE
+                self.centers = _grown(self.centers, capacity)
+                self.radii = _grown(self.radii, capacity)
+                self.half_extents = _grown(self.half_extents, capacity)
+                self.vertex_starts = _grown(self.vertex_starts, capacity)
+                self.vertex_counts = _grown(self.vertex_counts, capacity)
+            index = self._size
+            self._size += 1
+        self.kinds[index] = kind
+        return index
+
+    def __allocate_vertices(self, count: int) -> int:
+        start = self._vertex_size
+        if start + count > len(self.vertices):
+            capacity = max(2 * len(self.vertices), start + count)
+            self.vertices = _grown(self.vertices, capacity)
+        self._vertex_size += count
+        return start
+
+    def add(self, shape) -> StoredShape:
+        return self.visit(shape)
+
+    def accept_circle(self, circle: Circle) -> StoredCircle:
+        index = self.__allocate(CIRCLE)
+        self.centers[index] = circle.center
+        self.radii[index] = circle.radius
+        self.half_extents[index] = (circle.radius, circle.radius)
+        return StoredCircle(self, index)
+
+    def accept_rectangle(self, rectangle: Rectangle) -> StoredRectangle:
+        index = self.__allocate(RECTANGLE)
+        half_width = rectangle.width / 2
+        half_height = rectangle.height / 2
+        self.centers[index] = rectangle.center
+        self.radii[index] = np.hypot(half_width, half_height)
+        self.half_extents[index] = (half_width, half_height)
+        return StoredRectangle(self, index)
+
+    def accept_polygon(self, polygon: Polygon) -> StoredPolygon:
+        index = self.__allocate(POLYGON)
+        points = np.array(polygon.points, dtype=float)
+        low, high = points.min(axis=0), points.max(axis=0)
+        center = (low + high) / 2
+        start = self.__allocate_vertices(len(points))
+        self.vertices[start : start + len(points)] = points - center
+        self.vertex_starts[index] = start
+        self.vertex_counts[index] = len(points)
+        self.centers[index] = center
+        self.radii[index] = np.hypot(*(high - low)) / 2
+        self.half_extents[index] = (high - low) / 2
+        return StoredPolygon(self, index)
+
+    def remove(self, shape: StoredShape):
+        # polygon vertices are not reclaimed, the slot itself is reused
+        if self.kinds[shape.index] == FREE:
+            return
+        self.kinds[shape.index] = FREE
+        self._free.append(shape.index)
+
+    def indices(self, kind: int) -> np.ndarray:
+        return np.flatnonzero(self.kinds[: self._size] == kind)
+
+    def bounding_extents(self) -> np.ndarray:
+        # (left, bottom, right, top) rows for every slot, free slots included
+        centers = self.centers[: self._size]
+        half_extents = self.half_extents[: self._size]
+        return np.hstack((centers - half_extents, centers + half_extents))
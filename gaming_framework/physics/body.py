@@ -1,6 +1,8 @@
 from dataclasses import dataclass, field
+from typing import Callable, Hashable
 
 from gaming_framework.geometry.shape import Point2D
+from gaming_framework.physics.body_state import BodyState, BodyStateField
 from gaming_framework.physics.collision_shape import CollisionShape
 from gaming_framework.spatial_structures.spatial_object import SpatialObject
 
@@ -20,14 +22,19 @@ class CollisionHandler:
 class Body(SpatialObject):
     collision_shape: CollisionShape
 
-    speed: Point2D = Point2D(0, 0)
-    acceleration: Point2D = Point2D(0, 0)
-    mass: float = 1
+    # once the body is added to a BodyState these are views onto its row
+    speed: Point2D = BodyStateField("speeds", Point2D(0, 0), wakes=True)
+    acceleration: Point2D = BodyStateField("accelerations", Point2D(0, 0), wakes=True)
+    mass: float = BodyStateField("masses", 1)
 
-    is_static: bool = False
-    is_tangible: bool = True
+    is_static: bool = BodyStateField("is_static", False)
+    is_tangible: bool = BodyStateField("is_tangible", True)
+    is_sleeping: bool = BodyStateField("is_sleeping", False)
     collision_handler: CollisionHandler = field(init=False, default=None)
 
+    _state: BodyState = field(init=False, default=None, repr=False)
+    _index: int = field(init=False, default=None, repr=False)
+
     def __hash__(self) -> int:
         return id(self)
 
@@ -43,23 +50,53 @@ class Body(SpatialObject):
             f"  mass={self.mass},\n"
             f"  is_static={self.is_static},\n"
             f"  is_tangible={self.is_tangible},\n"
+            f"  is_sleeping={self.is_sleeping},\n"
             ")"
         )
 
     @property
     def position(self):
-        return self.collision_shape.position
+        if self._state is None:
+            return self.collision_shape.position
+        return self._state.get("positions", self._index)
 
     @property
     def bounding_box(self):
+        self.__sync_collision_shape()
         return self.collision_shape.bounding_box
 
     @property
     def shape(self):
+        self.__sync_collision_shape()
         return self.collision_shape.shape
 
+    @property
+    def is_observed(self) -> bool:
+        return bool(self._subscriptions.get("moved_to"))
+
+    def __sync_collision_shape(self):
+        # the state moves its bodies without touching their collision shapes,
+        # they catch up the first time they are needed after an integration
+        if self._state is None or not self._state.is_stale[self._index]:
+            return
+        self._state.is_stale[self._index] = False
+        self.collision_shape.set_position(self.position)
+
+    def subscribe(self, event: str, listener: Hashable, callback: Callable):
+        super().subscribe(event, listener, callback)
+        if self._state is not None:
+            self._state.is_observed[self._index] = self.is_observed
+
+    def unsubscribe(self, listener: Hashable, events: list[str] = None):
+        super().unsubscribe(listener, events)
+        if self._state is not None:
+            self._state.is_observed[self._index] = self.is_observed
+
     def set_position(self, position: Point2D):
         self.collision_shape.set_position(position)
+        if self._state is not None:
+            self._state.positions[self._index] = position
+        self.wake()
 
     def predict_position(self, delta_time: float) -> Point2D:
         if self.is_static:
@@ -67,6 +104,16 @@ class Body(SpatialObject):
         speed = self.speed + self.acceleration.scalar_mult(delta_time)
         return self.position + speed.scalar_mult(delta_time)
 
+    def wake(self):
+        self.is_sleeping = False
+        if self._state is not None:
+            self._state.rest_frames[self._index] = 0
+
+    def apply_impulse(self, impulse: Point2D):
+        if self.is_static:
+            return
+        self.speed += impulse.scalar_div(self.mass)
+
     def move_to(self, position: Point2D):
         old_position = self.position
         self.set_position(position)
@@ -0,0 +1,203 @@
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from gaming_framework.geometry.shape import Point2D
+
+COLUMNS = (
+    "positions",
+    "previous_positions",
+    "speeds",
+    "accelerations",
+    "masses",
+    "is_static",
+    "is_tangible",
+    "is_observed",
+    "is_sleeping",
+    "rest_frames",
+    "is_stale",
+)
+
+
+class BodyStateField:
+    # a body attribute kept in a column of the BodyState holding the body,
+    # the value is kept in the body itself while it is not in any state,
+    # setting a field that wakes the body wakes it even if the value is the same
+    def __init__(self, column: str, default, wakes: bool = False):
+        self.column = column
+        self.default = default
+        self.wakes = wakes
+
+    def __set_name__(self, owner, name: str):
+        self.name = "_" + name
+
+    def __get__(self, body, owner=None):
+        if body is None:
+            return self.default
+        if body._state is None:
+            return body.__dict__.get(self.name, self.default)
+        return body._state.get(self.column, body._index)
+
+    def __set__(self, body, value):
+        if body._state is None:
+            body.__dict__[self.name] = value
+        else:
+            body._state.set(self.column, body._index, value)
+        if self.wakes:
+            body.wake()
+
+
+@dataclass
+class BodyState:
+    # positions, speeds, accelerations, masses and flags of a set of bodies as
+    # contiguous arrays, the first len(self) rows are the bodies in the order
+    # of self.bodies and removing a body moves the last one into its row
+    capacity: int = 64
+
+    bodies: list = field(init=False, default_factory=list)
+    positions: np.ndarray = field(init=False)
+    # the positions at the last save_positions, to interpolate from
+    previous_positions: np.ndarray = field(init=False)
+    speeds: np.ndarray = field(init=False)
+    accelerations: np.ndarray = field(init=False)
+    masses: np.ndarray = field(init=False)
+    is_static: np.ndarray = field(init=False)
+    is_tangible: np.ndarray = field(init=False)
+    # whether anyone listens to the moved_to events of the body
+    is_observed: np.ndarray = field(init=False)
+    # sleeping bodies are neither predicted nor integrated, rest_frames counts
+    # the frames a body has spent below the sleep speed
+    is_sleeping: np.ndarray = field(init=False)
+    rest_frames: np.ndarray = field(init=False)
+    # set for the bodies an integration moved, their collision shape is behind
+    # their position until the first time it is needed
+    is_stale: np.ndarray = field(init=False)
+
+    def __post_init__(self):
+        self.positions = np.zeros((self.capacity, 2))
+        self.previous_positions = np.zeros((self.capacity, 2))
+        self.speeds = np.zeros((self.capacity, 2))
+        self.accelerations = np.zeros((self.capacity, 2))
+        self.masses = np.zeros(self.capacity)
+        self.is_static = np.zeros(self.capacity, dtype=bool)
+        self.is_tangible = np.zeros(self.capacity, dtype=bool)
+        self.is_observed = np.zeros(self.capacity, dtype=bool)
+        self.is_sleeping = np.zeros(self.capacity, dtype=bool)
+        self.rest_frames = np.zeros(self.capacity, dtype=np.int64)
+        self.is_stale = np.zeros(self.capacity, dtype=bool)
+
+    def __hash__(self) -> int:
+        return id(self)
+
+    def __eq__(self, other) -> bool:
+        return id(self) == id(other)
+
+    def __len__(self) -> int:
+        return len(self.bodies)
+
+    def __grow(self):
+        capacity = 2 * len(self.masses)
+        for column in COLUMNS:
+            array = getattr(self, column)
+            grown = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+            grown[: len(array)] = array
+            setattr(self, column, grown)
+
+    def get(self, column: str, index: int):
+        value = getattr(self, column)[index]
+        if value.ndim:
+            return Point2D(*value.tolist())
+        return value.item()
+
+    def set(self, column: str, index: int, value):
+        getattr(self, column)[index] = value
+
+    def add(self, body):
+        if body._state is self:
+            return
+        if len(self.bodies) == len(self.masses):
+            self.__grow()
+        index = len(self.bodies)
+        self.positions[index] = body.position
+        self.previous_positions[index] = body.position
+        self.speeds[index] = body.speed
+        self.accelerations[index] = body.acceleration
+        self.masses[index] = body.mass
+        self.is_static[index] = body.is_static
+        self.is_tangible[index] = body.is_tangible
+        self.is_observed[index] = body.is_observed
+        self.is_sleeping[index] = body.is_sleeping
+        self.rest_frames[index] = 0
+        self.is_stale[index] = False
+        self.bodies.append(body)
+        body._state = self
+        body._index = index
+
+    def remove(self, body):
+        if body._state is not self:
+            return
+        values = {column: self.get(column, body._index) for column in COLUMNS}
+        index, last = body._index, len(self.bodies) - 1
+        if index != last:
+            for column in COLUMNS:
+                array = getattr(self, column)
+                array[index] = array[last]
+            moved_body = self.bodies[last]
+            self.bodies[index] = moved_body
+            moved_body._index = index
+        self.bodies.pop()
+        # the body keeps its values once it leaves the state
+        body._state = None
+        body._index = None
+        body.speed = values["speeds"]
+        body.acceleration = values["accelerations"]
+        body.mass = values["masses"]
+        body.is_static = values["is_static"]
+        body.is_tangible = values["is_tangible"]
+        body.set_position(values["positions"])
+        # restored last, setting the speed or the position wakes the body
+        body.is_sleeping = values["is_sleeping"]
+
+    def rows(self, bodies) -> np.ndarray:
+        return np.fromiter(
+            (body._index for body in bodies), dtype=np.int64, count=len(bodies)
+        )
+
+    def save_positions(self):
+        size = len(self.bodies)
+        self.previous_positions[:size] = self.positions[:size]
+
+    def interpolated_position(self, body, alpha: float) -> Point2D:
+        position = body.position
+        if body._state is not self:
+            return position
+        previous_position = self.get("previous_positions", body._index)
+        return previous_position + (position - previous_position).scalar_mult(alpha)
+
+    def __is_frozen(self, size: int) -> np.ndarray:
+        return self.is_static[:size] | self.is_sleeping[:size]
+
+    def update_sleep(self, delta_time: float, sleep_speed: float, sleep_frames: int):
+        # bodies whose next speed stays under sleep_speed for sleep_frames
+        # frames in a row fall asleep and stop
+        size = len(self.bodies)
+        speeds = self.speeds[:size] + self.accelerations[:size] * delta_time
+        resting = np.hypot(speeds[:, 0], speeds[:, 1]) <= sleep_speed
+        resting &= ~self.__is_frozen(size)
+        rest_frames = self.rest_frames[:size]
+        rest_frames[:] = np.where(resting, rest_frames + 1, 0)
+        falling_asleep = resting & (rest_frames >= sleep_frames)
+        self.is_sleeping[:size] |= falling_asleep
+        self.speeds[:size][falling_asleep] = 0
+
+    def predict_positions(self, delta_time: float) -> np.ndarray:
+        size = len(self.bodies)
+        speeds = self.speeds[:size] + self.accelerations[:size] * delta_time
+        speeds[self.__is_frozen(size)] = 0
+        return self.positions[:size] + speeds * delta_time
+
+    def integrate(self, delta_time: float, rows: np.ndarray):
+        rows = rows[~(self.is_static[rows] | self.is_sleeping[rows])]
+        self.speeds[rows] += self.accelerations[rows] * delta_time
+        self.positions[rows] += self.speeds[rows] * delta_time
+        self.is_stale[rows] = True
@@ -1,24 +1,52 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from gaming_framework.geometry.shape import Point2D, Shape
 
 
 @dataclass
 class CollisionShape:
-    shape: Shape
+    # the local shape is never rebuilt on moves, only the translation changes
+    # and the world shape and bounding box are derived from it when needed
+    local_shape: Shape
+    translation: Point2D = Point2D(0, 0)
+    _position: Point2D = field(init=False, default=None, repr=False)
+    _shape: Shape = field(init=False, default=None, repr=False)
+    _bounding_box: Shape = field(init=False, default=None, repr=False)
+
+    @property
+    def shape(self) -> Shape:
+        if self._shape is not None:
+            return self._shape
+        if self.translation == (0, 0):
+            self._shape = self.local_shape
+        else:
+            self._shape = self.local_shape.center_to(self.position)
+        return self._shape
 
     @property
     def bounding_box(self) -> Shape:
-        return self.shape.bounding_box
+        if self._bounding_box is not None:
+            return self._bounding_box
+        self._bounding_box = self.local_shape.bounding_box.center_to(self.position)
+        return self._bounding_box
 
     @property
     def position(self) -> Point2D:
-        return self.shape.center
+        if self._position is not None:
+            return self._position
+        self._position = self.local_shape.center + self.translation
+        return self._position
 
     def set_position(self, position: Point2D):
         if position == self.position:
             return
-        self.shape = self.shape.center_to(position)
+        self.translation = position - self.local_shape.center
+        self._position = position
+        self._shape = None
+        self._bounding_box = None
+
+    def shape_at(self, position: Point2D) -> Shape:
+        return self.local_shape.center_to(position)
 
     def collides_with(self, other: "CollisionShape") -> bool:
         return self.shape.collides_with(other.shape)
@@ -0,0 +1,137 @@
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from gaming_framework.geometry.batch_collision import moving_circles_time_of_collision
+
+# a body table row is the center, the speed and the radius of the bounding
+# circle of a body: (x, y, speed x, speed y, radius)
+BODY_TABLE_COLUMNS = 5
+
+
+def find_islands(pairs: np.ndarray, size: int) -> tuple[np.ndarray, np.ndarray]:
+    # groups the indices of the (body, body) pairs by connected component,
+    # returns the pair indices island after island and where each island
+    # starts in them. the islands come in the order of their first pair and
+    # keep their pairs in order so the result only depends on the order of
+    # the pairs
+    items, others = pairs[:, 0], pairs[:, 1]
+    labels = np.arange(size)
+    while True:
+        # every body and the body its label points to take the lowest label
+        # of their pairs, then labels jump to the label of their label
+        lowest = np.minimum(labels[items], labels[others])
+        new_labels = labels.copy()
+        for targets in (items, others, labels[items], labels[others]):
+            np.minimum.at(new_labels, targets, lowest)
+        new_labels = new_labels[new_labels]
+        if np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+    pair_labels = labels[items]
+    _, first_pairs, island_of_pairs = np.unique(
+        pair_labels, return_index=True, return_inverse=True
+    )
+    island_order = np.argsort(first_pairs, kind="stable")
+    ranks = np.empty_like(island_order)
+    ranks[island_order] = np.arange(len(island_order))
+    order = np.argsort(ranks[island_of_pairs], kind="stable")
+    island_sizes = np.bincount(ranks[island_of_pairs], minlength=len(ranks))
+    island_starts = np.concatenate(([0], np.cumsum(island_sizes)[:-1]))
+    return order, island_starts
+
+
+def island_batches(
+    island_starts: np.ndarray, pair_count: int, batch_count: int
+) -> list[tuple[int, int]]:
+    # splits the pairs ordered by island in at most batch_count ranges of
+    # whole islands with about the same number of pairs
+    targets = np.arange(1, batch_count) * pair_count // batch_count
+    ends = np.append(island_starts, pair_count)
+    cuts = ends[np.searchsorted(island_starts, targets)]
+    bounds = np.unique(np.concatenate(([0], cuts, [pair_count]))).tolist()
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def times_of_collision(body_table: np.ndarray, pairs: np.ndarray) -> np.ndarray:
+    bodies, others = body_table[pairs[:, 0]], body_table[pairs[:, 1]]
+    return moving_circles_time_of_collision(
+        bodies[:, :2],
+        bodies[:, 2:4],
+        bodies[:, 4],
+        others[:, :2],
+        others[:, 2:4],
+        others[:, 4],
+    )
+
+
+def shared_arrays(
+    buffer, body_count: int, pair_count: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # the body table, the (body, body) rows of the pairs and their times of
+    # collision, one after the other in the same block
+    body_table = np.ndarray(
+        (body_count, BODY_TABLE_COLUMNS), dtype=float, buffer=buffer
+    )
+    offset = body_table.nbytes
+    pairs = np.ndarray((pair_count, 2), dtype=np.int64, buffer=buffer, offset=offset)
+    offset += pairs.nbytes
+    times = np.ndarray(pair_count, dtype=float, buffer=buffer, offset=offset)
+    return body_table, pairs, times
+
+
+def shared_times_of_collision(
+    name: str, body_count: int, pair_count: int, start: int, end: int
+):
+    # runs in the worker processes, everything is read from and written to
+    # the shared memory block of the pool so only the bounds are sent
+    shared_memory = SharedMemory(name=name)
+    try:
+        body_table, pairs, times = shared_arrays(
+            shared_memory.buf, body_count, pair_count
+        )
+        times[start:end] = times_of_collision(body_table, pairs[start:end])
+        del body_table, pairs, times
+    finally:
+        shared_memory.close()
+
+
+class WorkerPool:
+    # the worker processes and the shared memory block they read the pairs from
+    def __init__(self, workers: int):
+        self.executor = ProcessPoolExecutor(max_workers=workers)
+        self.shared_memory = None
+        self.body_count = 0
+        self.pair_count = 0
+
+    def shared_arrays(
+        self, body_count: int, pair_count: int
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        size = max(8 * (BODY_TABLE_COLUMNS * body_count + 3 * pair_count), 1)
+        if self.shared_memory is None or self.shared_memory.size < size:
+            self.release_shared_memory()
+            self.shared_memory = SharedMemory(create=True, size=2 * size)
+        self.body_count, self.pair_count = body_count, pair_count
+        return shared_arrays(self.shared_memory.buf, body_count, pair_count)
+
+    def submit(self, start: int, end: int) -> Future:
+        return self.executor.submit(
+            shared_times_of_collision,
+            self.shared_memory.name,
+            self.body_count,
+            self.pair_count,
+            start,
+            end,
+        )
+
+    def release_shared_memory(self):
+        if self.shared_memory is None:
+            return
+        self.shared_memory.close()
+        self.shared_memory.unlink()
+        self.shared_memory = None
+
+    def close(self):
+        self.executor.shutdown()
+        self.release_shared_memory()
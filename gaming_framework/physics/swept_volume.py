@@ -0,0 +1,24 @@
+from gaming_framework.geometry.shape import Point2D, Rectangle
+from gaming_framework.physics.body import Body
+
+
+class SweptVolume:
+    # stands for the area a body covers while moving in the movement index,
+    # it is kept while the body moves and swept again in place every frame.
+    # it does not publish its moves, its owner updates the index after a sweep
+    __slots__ = ("body", "bounding_box")
+
+    def __init__(self, body: Body):
+        self.body = body
+        self.bounding_box: Rectangle = None
+
+    @property
+    def shape(self) -> Rectangle:
+        return self.bounding_box
+
+    def sweep(self, start: Point2D, end: Point2D):
+        radius = self.body.bounding_box.radius
+        self.bounding_box = Rectangle(
+            Point2D(min(start.x, end.x) - radius, max(start.y, end.y) + radius),
+            Point2D(max(start.x, end.x) + radius, min(start.y, end.y) - radius),
+        )
@@ -1,4 +1,5 @@
 import heapq
+import weakref
 from dataclasses import dataclass, field
 
 import numpy as np
@@ -6,7 +7,15 @@ import numpy as np
 from gaming_framework.geometry.shape import Point2D, Rectangle
 from gaming_framework.physics.body import Body
 from gaming_framework.physics.body_pair import BodyPair
-from gaming_framework.physics.collision_shape import CollisionShape
+from gaming_framework.physics.body_state import BodyState
+from gaming_framework.physics.islands import (
+    BODY_TABLE_COLUMNS,
+    WorkerPool,
+    find_islands,
+    island_batches,
+    times_of_collision,
+)
+from gaming_framework.physics.swept_volume import SweptVolume
 from gaming_framework.spatial_structures.spatial_structure import SpatialStructure
 
 
@@ -14,11 +23,54 @@ from gaming_framework.spatial_structures.spatial_structure import SpatialStructu
 class World:
     visible_area: Rectangle
     spatial_struct: SpatialStructure
+    # step runs update with this fixed delta time, at most max_substeps times
+    # per call, the time left is kept for the next call
+    time_step: float = 1 / 60
+    max_substeps: int = 5
+    # bodies slower than sleep_speed for sleep_frames updates in a row are put
+    # to sleep until a contact, an impulse, a moving neighbour or a new speed,
+    # acceleration or position wakes them, nothing sleeps without a sleep_speed
+    sleep_speed: float = None
+    sleep_frames: int = 60
+    # with workers, frames with enough candidate pairs split them in batches
+    # of whole islands of at least parallel_batch_size pairs, whose times of
+    # collision are computed by a pool of worker processes reading the bodies
+    # from shared memory. smaller batches cost more to send than to compute,
+    # see benchmarks/island_benchmark.py
+    workers: int = 0
+    parallel_batch_size: int = 65536
 
+    # the bodies of the spatial structure, the ones inserted in or removed
+    # from it directly instead of through add_body and remove_body are kept
+    # in _pending_bodies, with whether they were inserted, until the start of
+    # the next update
+    _state: BodyState = field(init=False, default_factory=BodyState)
+    _pending_bodies: dict[Body, bool] = field(init=False, default_factory=dict)
     _moving_bodies: dict = field(init=False, default_factory=dict)
-    _sweept_bodies: dict = field(init=False, default_factory=dict)
+    # the movement index and the swept volumes in it are kept across frames,
+    # a body has a volume in the index for as long as it keeps moving
+    _swept_volumes: dict[Body, SweptVolume] = field(init=False, default_factory=dict)
     _movement_spatial_struct: SpatialStructure = field(init=False, default=None)
     _collision_candidates: list = field(init=False, default_factory=list)
+    _accumulator: float = field(init=False, default=0)
+    # the pool is closed by close, on leaving a with block or once the world
+    # is garbage collected, whichever comes first
+    _pool: WorkerPool = field(init=False, default=None)
+    _close_pool: weakref.finalize = field(init=False, default=None)
+
+    def __post_init__(self):
+        if self.time_step <= 0:
+            raise ValueError("time_step must be positive")
+        if self.max_substeps < 1:
+            raise ValueError("max_substeps must be at least 1")
+        if self.workers < 0:
+            raise ValueError("workers must not be negative")
+        if self.parallel_batch_size < 1:
+            raise ValueError("parallel_batch_size must be at least 1")
+        for body in self.spatial_struct.get_objects():
+            self._state.add(body)
+        self.spatial_struct.subscribe("inserted", self, self.__on_inserted)
+        self.spatial_struct.subscribe("removed", self, self.__on_removed)
 
     def __hash__(self) -> int:
         return id(self)
@@ -26,64 +78,67 @@ class World:
     def __eq__(self, other) -> bool:
         return id(self) == id(other)
 
-    def __calculate_sweept_body(self, body: Body, new_pos: Point2D) -> Body:
-        top = body.bounding_box.center.y + body.bounding_box.radius
-        left = body.bounding_box.center.x - body.bounding_box.radius
-        bottom = new_pos.center.y - body.bounding_box.radius
-        right = new_pos.center.x + body.bounding_box.radius
-        top_left = Point2D(left, top)
-        bottom_right = Point2D(right, bottom)
-        sweept_shape = Rectangle(top_left, bottom_right)
-        collision_shape = CollisionShape(sweept_shape)
-        sweept_body = Body(collision_shape)
-        return sweept_body
-
-    def __time_of_collision(self, body_a: Body, body_b: Body) -> float:
-        distance = (
-            body_a.bounding_box.radius**2
-            + 2 * body_a.bounding_box.radius * body_b.bounding_box.radius
-            + body_b.bounding_box.radius**2
-        )
-        a = (body_a.speed.x - body_b.speed.x) * (body_a.speed.x - body_b.speed.x) + (
-            body_a.speed.y - body_b.speed.y
-        ) * (body_a.speed.y - body_b.speed.y)
-        b = 2 * (
-            (body_a.bounding_box.center.x - body_b.bounding_box.center.x)
-            * (body_a.speed.x - body_b.speed.x)
-            + (body_a.bounding_box.center.y - body_b.bounding_box.center.y)
-            * (body_a.speed.y - body_b.speed.y)
-        )
-        c = (
-            (body_a.bounding_box.center.x - body_b.bounding_box.center.x)
-            * (body_a.bounding_box.center.x - body_b.bounding_box.center.x)
-            + (body_a.bounding_box.center.y - body_b.bounding_box.center.y)
-            * (body_a.bounding_box.center.y - body_b.bounding_box.center.y)
-            - distance
+    def __fill_body_table(self, bodies: dict[Body, int], body_table: np.ndarray):
+        for row, body in enumerate(bodies):
+            bounding_box = body.bounding_box
+            body_table[row] = (*bounding_box.center, *body.speed, bounding_box.radius)
+
+    def __times_of_collision(
+        self, bodies: dict[Body, int], rows: np.ndarray
+    ) -> np.ndarray:
+        batch_count = min(self.workers + 1, len(rows) // self.parallel_batch_size)
+        if batch_count < 2:
+            body_table = np.empty((len(bodies), BODY_TABLE_COLUMNS))
+            self.__fill_body_table(bodies, body_table)
+            return times_of_collision(body_table, rows)
+        order, island_starts = find_islands(rows, len(bodies))
+        batches = island_batches(island_starts, len(rows), batch_count)
+        if self._pool is None:
+            self._pool = WorkerPool(self.workers)
+            self._close_pool = weakref.finalize(self, self._pool.close)
+        body_table, shared_rows, shared_times = self._pool.shared_arrays(
+            len(bodies), len(rows)
         )
-        delta = b**2 - 4 * a * c
-        if delta < 0:
-            return -1
-        d = np.sqrt(delta)
-        t1 = (-b - d) / (2 * a)
-        t2 = (-b + d) / (2 * a)
-        if t1 < 0 and t2 > 0 and b <= 0:
-            return 0
-        return t1
+        self.__fill_body_table(bodies, body_table)
+        shared_rows[:] = rows[order]
+        futures = [self._pool.submit(start, end) for start, end in batches[1:]]
+        # this thread takes the first batch while the workers run the others
+        start, end = batches[0]
+        shared_times[start:end] = times_of_collision(body_table, shared_rows[start:end])
+        for future in futures:
+            future.result()
+        # every pair gets its time back in its own place, wherever it was
+        # computed, so the results do not depend on the batches
+        times = np.empty(len(rows))
+        times[order] = shared_times
+        return times
 
     def __push_to_collision_candidates(
-        self, pair: BodyPair, delta_time: float, start_time: float
+        self, pairs: list[BodyPair], delta_time: float, start_time: float
     ):
-        toc = self.__time_of_collision(pair.body_a, pair.body_b)
-        if 0 <= toc <= (start_time + delta_time):
-            heapq.heappush(self._collision_candidates, (toc, pair))
+        if not pairs:
+            return
+        bodies = {}
+        rows = np.array(
+            [
+                (
+                    bodies.setdefault(pair.body_a, len(bodies)),
+                    bodies.setdefault(pair.body_b, len(bodies)),
+                )
+                for pair in pairs
+            ],
+            dtype=np.int64,
+        )
+        times = self.__times_of_collision(bodies, rows)
+        for toc, pair in zip(times.tolist(), pairs):
+            if 0 <= toc <= (start_time + delta_time):
+                heapq.heappush(self._collision_candidates, (toc, pair))
 
     def __remove_moving_body(self, body: Body):
         if body not in self._moving_bodies:
             return
-        (_, _, sweept_body) = self._moving_bodies[body]
         del self._moving_bodies[body]
-        del self._sweept_bodies[sweept_body]
-        self._movement_spatial_struct.remove(sweept_body)
+        self._movement_spatial_struct.remove(self._swept_volumes.pop(body))
 
     def __predict_movement(self, body: Body, delta_time: float):
         if body.is_static:
@@ -91,47 +146,54 @@ class World:
         new_pos = body.predict_position(delta_time)
         if new_pos == body.position:
             return
-        sweept_body = self.__calculate_sweept_body(body, new_pos)
-        self._moving_bodies[body] = (body.position, new_pos, sweept_body)
-        self._sweept_bodies[sweept_body] = body
-        self._movement_spatial_struct.insert(sweept_body)
+        self.__sweep(body, body.position, new_pos)
 
-    def __query_collisions_with_moving_bodies(
-        self, body: Body, delta_time: float, start_time: float
-    ):
-        (_, _, sweept_body) = self._moving_bodies[body]
-        pairs = []
-        for candidate in (
-            BodyPair(body, self._sweept_bodies[sweept_body_b])
-            for sweept_body_b in self._movement_spatial_struct.query(sweept_body.shape)
-            if (sweept_body != sweept_body_b)
-            and (body != self._sweept_bodies[sweept_body_b])
+    def __predict_movements(self, delta_time: float):
+        positions = self._state.positions[: len(self._state)]
+        new_positions = self._state.predict_positions(delta_time)
+        moving = np.flatnonzero((new_positions != positions).any(axis=1))
+        for index, position, new_pos in zip(
+            moving.tolist(), positions[moving].tolist(), new_positions[moving].tolist()
         ):
-            if candidate not in pairs:
-                pairs.append(candidate)
-                self.__push_to_collision_candidates(candidate, delta_time, start_time)
-
-    def __query_collisions_with_static_bodies(
-        self, body: Body, delta_time: float, start_time: float
-    ):
-        (_, _, sweept_body) = self._moving_bodies[body]
-        pairs = []
-        for candidate in (
-            BodyPair(body, static_body)
-            for static_body in self.spatial_struct.query(sweept_body.shape)
-            if (static_body not in self._moving_bodies)
-        ):
-            if candidate not in pairs:
-                pairs.append(candidate)
-                self.__push_to_collision_candidates(candidate, delta_time, start_time)
+            self.__sweep(
+                self._state.bodies[index], Point2D(*position), Point2D(*new_pos)
+            )
 
-    def __update_collision_candidates(
-        self, body: Body, delta_time: float, start_time: float
-    ):
-        if body not in self._moving_bodies:
+    def __sweep(self, body: Body, position: Point2D, new_pos: Point2D):
+        self._moving_bodies[body] = (position, new_pos)
+        swept_volume = self._swept_volumes.get(body)
+        if swept_volume is not None:
+            swept_volume.sweep(position, new_pos)
+            self._movement_spatial_struct.update(swept_volume)
             return
-        self.__query_collisions_with_moving_bodies(body, delta_time, start_time)
-        self.__query_collisions_with_static_bodies(body, delta_time, start_time)
+        swept_volume = SweptVolume(body)
+        swept_volume.sweep(position, new_pos)
+        self._swept_volumes[body] = swept_volume
+        self._movement_spatial_struct.insert(swept_volume)
+
+    def __remove_stopped_bodies(self):
+        for body in list(self._swept_volumes):
+            if body not in self._moving_bodies:
+                self._movement_spatial_struct.remove(self._swept_volumes.pop(body))
+
+    def __update_collision_candidates(self, delta_time: float, start_time: float):
+        pairs = [
+            BodyPair(swept_volume_a.body, swept_volume_b.body)
+            for swept_volume_a, swept_volume_b in (
+                self._movement_spatial_struct.query_pairs()
+            )
+        ]
+        for swept_volume, body in self._movement_spatial_struct.query_pairs_between(
+            self.spatial_struct
+        ):
+            if body in self._moving_bodies:
+                continue
+            if body.is_sleeping:
+                # it takes part in this update as a resting body and moves
+                # again from the next one
+                body.wake()
+            pairs.append(BodyPair(swept_volume.body, body))
+        self.__push_to_collision_candidates(pairs, delta_time, start_time)
 
     def __handle_contact(
         self, body_a: Body, body_b: Body, current_time: float, end_time: float
@@ -167,6 +229,8 @@ class World:
         current_time: float,
         end_time: float,
     ):
+        body_a.wake()
+        body_b.wake()
         handle_contact = body_a.is_tangible and body_b.is_tangible
         if handle_contact:
             time_diff = 0
@@ -191,10 +255,10 @@ class World:
         comparing_shape_b = body_b.shape
         if body_a in self._moving_bodies and time_of_collision > 0:
             position = body_a.predict_position(time_of_collision)
-            comparing_shape_a = body_a.shape.center_to(position)
+            comparing_shape_a = body_a.collision_shape.shape_at(position)
         if body_b in self._moving_bodies and time_of_collision > 0:
             position = body_b.predict_position(time_of_collision)
-            comparing_shape_b = body_b.shape.center_to(position)
+            comparing_shape_b = body_b.collision_shape.shape_at(position)
 
         if comparing_shape_a.collides_with(comparing_shape_b):
             self.__resolve_collision(
@@ -206,6 +270,8 @@ class World:
             )
 
     def __detect_collisions(self, delta_time: float):
+        # the collisions are solved on this thread, the collision handlers of
+        # the bodies are never called from a worker
         current_time = 0
         while self._collision_candidates:
             time_of_collision, pair = heapq.heappop(self._collision_candidates)
@@ -214,18 +280,103 @@ class World:
             )
             current_time += time_of_collision
 
+    def __integrate(self, delta_time: float):
+        if not self._moving_bodies:
+            return
+        rows = self._state.rows(list(self._moving_bodies))
+        old_positions = self._state.positions[rows]
+        self._state.integrate(delta_time, rows)
+        # only the bodies someone listens to publish their moves
+        observed = self._state.is_observed[rows]
+        for index, old_position, position in zip(
+            rows[observed].tolist(),
+            old_positions[observed].tolist(),
+            self._state.positions[rows[observed]].tolist(),
+        ):
+            body = self._state.bodies[index]
+            body.publish("moved_to", body, Point2D(*old_position), Point2D(*position))
+
+    def __on_inserted(self, body: Body):
+        if body._state is not self._state:
+            self._pending_bodies[body] = True
+
+    def __on_removed(self, body: Body):
+        if body._state is self._state:
+            self._pending_bodies[body] = False
+        else:
+            self._pending_bodies.pop(body, None)
+
+    def __adopt_bodies(self):
+        # only the bodies the structure reported are touched, the others keep
+        # their rows and their collision shapes
+        pending_bodies, self._pending_bodies = self._pending_bodies, {}
+        for body, is_inserted in pending_bodies.items():
+            if is_inserted:
+                self._state.add(body)
+            else:
+                self.remove_body(body)
+
+    def add_body(self, body: Body):
+        self._state.add(body)
+        self.spatial_struct.insert(body)
+
+    def remove_body(self, body: Body):
+        self._moving_bodies.pop(body, None)
+        if body in self._swept_volumes:
+            self._movement_spatial_struct.remove(self._swept_volumes.pop(body))
+        self.spatial_struct.remove(body)
+        self._state.remove(body)
+        self._pending_bodies.pop(body, None)
+
+    @property
+    def alpha(self) -> float:
+        # how far the time left in the accumulator is into the next step
+        return self._accumulator / self.time_step
+
+    def interpolated_position(self, body: Body) -> Point2D:
+        # where to draw the body, between its positions before and after the
+        # last step
+        return self._state.interpolated_position(body, self.alpha)
+
+    def step(self, frame_time: float) -> int:
+        self._accumulator += frame_time
+        steps = 0
+        while self._accumulator >= self.time_step and steps < self.max_substeps:
+            self._state.save_positions()
+            self.update(self.time_step)
+            self._accumulator -= self.time_step
+            steps += 1
+        if self._accumulator >= self.time_step:
+            # the simulation slows down instead of falling further behind
+            self._accumulator %= self.time_step
+        return steps
+
+    def close(self):
+        # stops the worker processes and frees the shared memory
+        if self._close_pool is not None:
+            self._close_pool()
+            self._close_pool = None
+            self._pool = None
+
+    def __enter__(self) -> "World":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
     def get_visible_bodies(self) -> list[Body]:
         return self.spatial_struct.query(self.visible_area)
 
     def update(self, delta_time: float):
+        if self._movement_spatial_struct is None:
+            self._movement_spatial_struct = self.spatial_struct.empty_copy()
+        self.__adopt_bodies()
         self._moving_bodies = {}
-        self._sweept_bodies = {}
-        self._movement_spatial_struct = self.spatial_struct.empty_copy()
         self._collision_candidates = []
-        for body in self.spatial_struct.get_objects():
-            self.__predict_movement(body, delta_time)
-        for body in self._moving_bodies:
-            self.__update_collision_candidates(body, delta_time, start_time=0)
+        if self.sleep_speed is not None:
+            self._state.update_sleep(delta_time, self.sleep_speed, self.sleep_frames)
+        self.__predict_movements(delta_time)
+        self.__remove_stopped_bodies()
+        self.__update_collision_candidates(delta_time, start_time=0)
         self.__detect_collisions(delta_time)
-        for body in self._moving_bodies:
-            body.update(delta_time)
+        self.__integrate(delta_time)
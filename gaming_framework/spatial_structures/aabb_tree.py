@@ -0,0 +1,231 @@
+from dataclasses import dataclass, field
+
+from gaming_framework.geometry.bounding_box import AxisAlignedExtents
+from gaming_framework.geometry.shape import Shape
+from gaming_framework.spatial_structures.spatial_object import SpatialObject
+from gaming_framework.spatial_structures.spatial_structure import SpatialStructure
+
+Extents = tuple[float, float, float, float]
+
+
+def _union(extents: Extents, other: Extents) -> Extents:
+    return (
+        min(extents[0], other[0]),
+        min(extents[1], other[1]),
+        max(extents[2], other[2]),
+        max(extents[3], other[3]),
+    )
+
+
+def _perimeter(extents: Extents) -> float:
+    return 2 * ((extents[2] - extents[0]) + (extents[3] - extents[1]))
+
+
+def _contains(extents: Extents, other: Extents) -> bool:
+    return (
+        extents[0] <= other[0]
+        and extents[1] <= other[1]
+        and extents[2] >= other[2]
+        and extents[3] >= other[3]
+    )
+
+
+def _overlaps(extents: Extents, other: Extents) -> bool:
+    return (
+        extents[0] <= other[2]
+        and extents[2] >= other[0]
+        and extents[1] <= other[3]
+        and extents[3] >= other[1]
+    )
+
+
+@dataclass
+class AABBNode:
+    extents: Extents
+    object: SpatialObject = None
+    parent: "AABBNode" = field(default=None, repr=False)
+    child_a: "AABBNode" = None
+    child_b: "AABBNode" = None
+    height: int = 0
+
+    def __hash__(self) -> int:
+        return id(self)
+
+    def __eq__(self, other) -> bool:
+        return id(self) == id(other)
+
+    @property
+    def is_leaf(self) -> bool:
+        return self.child_a is None
+
+    def refit(self):
+        self.extents = _union(self.child_a.extents, self.child_b.extents)
+        self.height = 1 + max(self.child_a.height, self.child_b.height)
+
+    def replace_child(self, child: "AABBNode", new_child: "AABBNode"):
+        if self.child_a is child:
+            self.child_a = new_child
+        else:
+            self.child_b = new_child
+
+
+@dataclass
+class AABBTree(SpatialStructure):
+    # leaves are fattened by a fixed margin plus a ratio of the object size so
+    # that small movements keep the object inside its leaf
+    margin: float = 1.0
+    margin_ratio: float = 0.1
+
+    _root: AABBNode = field(init=False, default=None)
+    _leaves: dict[SpatialObject, AABBNode] = field(init=False, default_factory=dict)
+    _extents_visitor: AxisAlignedExtents = field(
+        init=False, default_factory=AxisAlignedExtents
+    )
+
+    def __hash__(self) -> int:
+        return id(self)
+
+    def __eq__(self, other) -> bool:
+        return id(self) == id(other)
+
+    def __fatten(self, extents: Extents) -> Extents:
+        left, bottom, right, top = extents
+        margin_x = self.margin + (right - left) * self.margin_ratio
+        margin_y = self.margin + (top - bottom) * self.margin_ratio
+        return (left - margin_x, bottom - margin_y, right + margin_x, top + margin_y)
+
+    def __find_sibling(self, extents: Extents) -> AABBNode:
+        node = self._root
+        while not node.is_leaf:
+            perimeter = _perimeter(node.extents)
+            combined_perimeter = _perimeter(_union(node.extents, extents))
+            cost = 2 * combined_perimeter
+            inheritance_cost = 2 * (combined_perimeter - perimeter)
+            child_costs = []
+            for child in (node.child_a, node.child_b):
+                child_cost = _perimeter(_union(child.extents, extents))
+                if not child.is_leaf:
+                    child_cost -= _perimeter(child.extents)
+                child_costs.append(child_cost + inheritance_cost)
+            if cost < child_costs[0] and cost < child_costs[1]:
+                break
+            node = node.child_a if child_costs[0] < child_costs[1] else node.child_b
+        return node
+
+    def __rotate(self, node: AABBNode, child: AABBNode) -> AABBNode:
+        # lifts child into node's place, node keeps other and the shorter
+        # grandchild, child keeps node and the taller grandchild
+        grandchild_a, grandchild_b = child.child_a, child.child_b
+        child.child_a = node
+        child.parent = node.parent
+        node.parent = child
+        if child.parent is None:
+            self._root = child
+        else:
+            child.parent.replace_child(node, child)
+        if grandchild_a.height > grandchild_b.height:
+            taller, shorter = grandchild_a, grandchild_b
+        else:
+            taller, shorter = grandchild_b, grandchild_a
+        child.child_b = taller
+        node.replace_child(child, shorter)
+        shorter.parent = node
+        node.refit()
+        child.refit()
+        return child
+
+    def __balance(self, node: AABBNode) -> AABBNode:
+        if node.is_leaf or node.height < 2:
+            return node
+        balance = node.child_b.height - node.child_a.height
+        if balance > 1:
+            return self.__rotate(node, node.child_b)
+        if balance < -1:
+            return self.__rotate(node, node.child_a)
+        return node
+
+    def __refit_from(self, node: AABBNode):
+        while node is not None:
+            node = self.__balance(node)
+            node.refit()
+            node = node.parent
+
+    def __insert_leaf(self, leaf: AABBNode):
+        if self._root is None:
+            self._root = leaf
+            return
+        sibling = self.__find_sibling(leaf.extents)
+        parent = AABBNode(
+            _union(leaf.extents, sibling.extents),
+            parent=sibling.parent,
+            child_a=sibling,
+            child_b=leaf,
+            height=sibling.height + 1,
+        )
+        if sibling.parent is None:
+            self._root = parent
+        else:
+            sibling.parent.replace_child(sibling, parent)
+        sibling.parent = parent
+        leaf.parent = parent
+        self.__refit_from(parent.parent)
+
+    def __remove_leaf(self, leaf: AABBNode):
+        if leaf is self._root:
+            self._root = None
+            return
+        parent = leaf.parent
+        sibling = parent.child_b if parent.child_a is leaf else parent.child_a
+        grandparent = parent.parent
+        sibling.parent = grandparent
+        leaf.parent = None
+        if grandparent is None:
+            self._root = sibling
+            return
+        grandparent.replace_child(parent, sibling)
+        self.__refit_from(grandparent)
+
+    def update(self, object: SpatialObject):
+        leaf = self._leaves[object]
+        extents = self._extents_visitor.visit(object.bounding_box)
+        if _contains(leaf.extents, extents):
+            return
+        self.__remove_leaf(leaf)
+        leaf.extents = self.__fatten(extents)
+        self.__insert_leaf(leaf)
+
+    def insert(self, object: SpatialObject):
+        if object in self._leaves:
+            return
+        extents = self._extents_visitor.visit(object.bounding_box)
+        leaf = AABBNode(self.__fatten(extents), object=object)
+        self._leaves[object] = leaf
+        self.__insert_leaf(leaf)
+        self._inserted(object)
+
+    def remove(self, object: SpatialObject):
+        if object not in self._leaves:
+            return
+        self.__remove_leaf(self._leaves.pop(object))
+        self._removed(object)
+
+    def get_objects(self) -> list[SpatialObject]:
+        return list(self._leaves)
+
+    def query(self, shape: Shape) -> list[SpatialObject]:
+        if self._root is None:
+            return
+        extents = self._extents_visitor.visit(shape)
+        nodes = [self._root]
+        while nodes:
+            node = nodes.pop()
+            if not _overlaps(node.extents, extents):
+                continue
+            if not node.is_leaf:
+                nodes.append(node.child_a)
+                nodes.append(node.child_b)
+            elif node.object.bounding_box.collides_with(shape):
+                yield node.object
+
+    def empty_copy(self) -> "AABBTree":
+        return AABBTree(margin=self.margin, margin_ratio=self.margin_ratio)
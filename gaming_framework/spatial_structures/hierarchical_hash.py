@@ -0,0 +1,142 @@
+import heapq
+import math
+from dataclasses import dataclass, field
+
+from gaming_framework.geometry.bounding_box import AxisAlignedExtents
+from gaming_framework.geometry.shape import Point2D, Shape
+from gaming_framework.spatial_structures.spatial_hash import SpatialHash
+from gaming_framework.spatial_structures.spatial_object import SpatialObject
+from gaming_framework.spatial_structures.spatial_structure import (
+    RaycastHit,
+    SpatialStructure,
+    object_distance,
+)
+
+
+@dataclass
+class HierarchicalSpatialHash(SpatialStructure):
+    # unbounded hashes with cell sizes growing by level_ratio, each object is
+    # kept in the first level whose cells are at least as large as its
+    # bounding box, so it never spans more than 2 by 2 cells
+    min_cell_size: float = 8
+    level_ratio: float = 4
+    number_of_levels: int = 5
+
+    _levels: list[SpatialHash] = field(init=False)
+    _level_sizes: list[int] = field(init=False)
+    _object_levels: dict[SpatialObject, int] = field(init=False, default_factory=dict)
+    _extents_visitor: AxisAlignedExtents = field(
+        init=False, default_factory=AxisAlignedExtents
+    )
+
+    def __post_init__(self):
+        self._levels = [
+            SpatialHash(cell_size=self.min_cell_size * self.level_ratio**level)
+            for level in range(self.number_of_levels)
+        ]
+        self._level_sizes = [0] * self.number_of_levels
+
+    def __hash__(self) -> int:
+        return id(self)
+
+    def __eq__(self, other) -> bool:
+        return id(self) == id(other)
+
+    def __level_of(self, object: SpatialObject) -> int:
+        left, bottom, right, top = self._extents_visitor.visit(object.bounding_box)
+        size = max(right - left, top - bottom)
+        if size <= self.min_cell_size:
+            return 0
+        level = math.ceil(math.log(size / self.min_cell_size, self.level_ratio))
+        return min(level, self.number_of_levels - 1)
+
+    def __used_levels(self) -> list[SpatialHash]:
+        return [
+            level for level, size in zip(self._levels, self._level_sizes) if size > 0
+        ]
+
+    def insert(self, object: SpatialObject):
+        # the levels keep track of the moves, a change of size needs the
+        # object to be removed and inserted again
+        if object in self._object_levels:
+            return
+        level = self.__level_of(object)
+        self._object_levels[object] = level
+        self._level_sizes[level] += 1
+        self._levels[level].insert(object)
+        self.publish("inserted", object)
+
+    def remove(self, object: SpatialObject):
+        if object not in self._object_levels:
+            return
+        level = self._object_levels.pop(object)
+        self._level_sizes[level] -= 1
+        self._levels[level].remove(object)
+        self.publish("removed", object)
+
+    def update(self, object: SpatialObject):
+        self._levels[self._object_levels[object]].update(object)
+
+    def get_objects(self) -> list[SpatialObject]:
+        return list(self._object_levels)
+
+    def query(self, shape: Shape) -> list[SpatialObject]:
+        for level in self.__used_levels():
+            yield from level.query(shape)
+
+    def query_pairs(self) -> list[tuple[SpatialObject, SpatialObject]]:
+        levels = self.__used_levels()
+        for i, level in enumerate(levels):
+            yield from level.query_pairs()
+            # smaller objects look themselves up in the coarser levels
+            for coarser_level in levels[i + 1 :]:
+                yield from level.query_pairs_between(coarser_level)
+
+    def query_pairs_between(
+        self, other_struct: SpatialStructure
+    ) -> list[tuple[SpatialObject, SpatialObject]]:
+        if not self.__same_levels(other_struct):
+            for level in self.__used_levels():
+                yield from level.query_pairs_between(other_struct)
+            return
+        for level in self.__used_levels():
+            for other_level in other_struct.__used_levels():
+                yield from level.query_pairs_between(other_level)
+
+    def __same_levels(self, other: SpatialStructure) -> bool:
+        return (
+            isinstance(other, HierarchicalSpatialHash)
+            and other.min_cell_size == self.min_cell_size
+            and other.level_ratio == self.level_ratio
+            and other.number_of_levels == self.number_of_levels
+        )
+
+    def raycast_hits(
+        self, origin: Point2D, direction: Point2D, max_distance: float = math.inf
+    ) -> list[RaycastHit]:
+        yield from heapq.merge(
+            *(
+                level.raycast_hits(origin, direction, max_distance)
+                for level in self.__used_levels()
+            ),
+            key=lambda hit: hit.distance,
+        )
+
+    def nearest(
+        self, point: Point2D, k: int = 1, max_distance: float = math.inf
+    ) -> list[SpatialObject]:
+        candidates = [
+            object
+            for level in self.__used_levels()
+            for object in level.nearest(point, k, max_distance)
+        ]
+        return heapq.nsmallest(
+            k, candidates, key=lambda object: object_distance(object, point)
+        )
+
+    def empty_copy(self) -> "HierarchicalSpatialHash":
+        return HierarchicalSpatialHash(
+            min_cell_size=self.min_cell_size,
+            level_ratio=self.level_ratio,
+            number_of_levels=self.number_of_levels,
+        )
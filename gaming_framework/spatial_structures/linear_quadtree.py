@@ -0,0 +1,206 @@
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from gaming_framework.geometry.bounding_box import AxisAlignedExtents
+from gaming_framework.geometry.shape import Rectangle, Shape
+from gaming_framework.spatial_structures.spatial_object import SpatialObject
+from gaming_framework.spatial_structures.spatial_structure import SpatialStructure
+
+
+def _spread_bits(values: np.ndarray) -> np.ndarray:
+    # inserts a zero bit between each of the low 32 bits of every value
+    values = values.astype(np.uint64) & np.uint64(0xFFFFFFFF)
+    for shift, mask in (
+        (16, 0x0000FFFF0000FFFF),
+        (8, 0x00FF00FF00FF00FF),
+        (4, 0x0F0F0F0F0F0F0F0F),
+        (2, 0x3333333333333333),
+        (1, 0x5555555555555555),
+    ):
+        values = (values | (values << np.uint64(shift))) & np.uint64(mask)
+    return values
+
+
+def morton_codes(xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+    return _spread_bits(xs) | (_spread_bits(ys) << np.uint64(1))
+
+
+@dataclass
+class LinearQuadTree(SpatialStructure):
+    # a quadtree without node objects, the bounds are split in a 2^depth by
+    # 2^depth grid and every object belongs to the smallest aligned node that
+    # holds its whole bounding box, objects reaching outside of the bounds
+    # belong to the root.
+    # a node of level l at (x, y) covers the contiguous range of finest cell
+    # morton codes starting at morton(x, y) << 2 * (depth - l), so the whole
+    # tree is two sorted arrays: the start of each object's node and its level
+    bounds: Rectangle
+    depth: int = 10
+    objects: list[SpatialObject] = field(default_factory=list)
+
+    _objects: list[SpatialObject] = field(init=False, default_factory=list)
+    _indices: dict[SpatialObject, int] = field(init=False, default_factory=dict)
+    # arrays are rebuilt in one pass when the tree is used after a change
+    _dirty: bool = field(init=False, default=False)
+    _starts: np.ndarray = field(init=False, default=None, repr=False)
+    _levels: np.ndarray = field(init=False, default=None, repr=False)
+    _order: np.ndarray = field(init=False, default=None, repr=False)
+    _extents: np.ndarray = field(init=False, default=None, repr=False)
+    _extents_visitor: AxisAlignedExtents = field(
+        init=False, default_factory=AxisAlignedExtents
+    )
+
+    def __post_init__(self):
+        objects, self.objects = self.objects, []
+        self.insert_many(objects)
+
+    def __hash__(self) -> int:
+        return id(self)
+
+    def __eq__(self, other) -> bool:
+        return id(self) == id(other)
+
+    @property
+    def __size(self) -> float:
+        return max(self.bounds.width, self.bounds.height)
+
+    def update(self, object: SpatialObject):
+        self._dirty = True
+
+    def insert_many(self, objects: list[SpatialObject]):
+        for object in objects:
+            if object in self._indices:
+                continue
+            self._indices[object] = len(self._objects)
+            self._objects.append(object)
+            self._inserted(object)
+        self._dirty = True
+
+    def insert(self, object: SpatialObject):
+        self.insert_many([object])
+
+    def remove(self, object: SpatialObject):
+        if object not in self._indices:
+            return
+        # the last object takes the place of the removed one
+        index = self._indices.pop(object)
+        last = self._objects.pop()
+        if last is not object:
+            self._objects[index] = last
+            self._indices[last] = index
+        self._removed(object)
+        self._dirty = True
+
+    def get_objects(self) -> list[SpatialObject]:
+        return list(self._objects)
+
+    def __build(self):
+        if not self._dirty:
+            return
+        self._dirty = False
+        cells = 1 << self.depth
+        extents = np.array(
+            [
+                self._extents_visitor.visit(object.bounding_box)
+                for object in self._objects
+            ],
+            dtype=float,
+        ).reshape(-1, 4)
+        left, top = self.bounds.top_left
+        scale = cells / self.__size
+        # cell rows are counted downwards from the top of the bounds
+        columns = np.floor((extents[:, [0, 2]] - left) * scale)
+        rows = np.floor((top - extents[:, [3, 1]]) * scale)
+        inside = (
+            (columns[:, 0] >= 0)
+            & (columns[:, 1] < cells)
+            & (rows[:, 0] >= 0)
+            & (rows[:, 1] < cells)
+        )
+        columns = np.clip(columns, 0, cells - 1).astype(np.int64)
+        rows = np.clip(rows, 0, cells - 1).astype(np.int64)
+        # the node is found from the highest bit in which the corners differ
+        difference = (columns[:, 0] ^ columns[:, 1]) | (rows[:, 0] ^ rows[:, 1])
+        shifts = np.ceil(np.log2(difference + 1)).astype(np.int64)
+        shifts[~inside] = self.depth
+        codes = morton_codes(columns[:, 0] >> shifts, rows[:, 0] >> shifts)
+        starts = codes << (2 * shifts).astype(np.uint64)
+        levels = self.depth - shifts
+        order = np.lexsort((levels, starts))
+        self._starts = starts[order]
+        self._levels = levels[order]
+        self._order = order
+        self._extents = extents
+
+    def __nodes(self, extents: tuple[float, float, float, float] = None):
+        # yields (first, own_end, end) index ranges of the nodes with objects,
+        # [first, own_end) are the objects of the node and [first, end) the
+        # objects of its whole subtree, nodes outside of extents are skipped
+        self.__build()
+        left, top = self.bounds.top_left
+        nodes = [(0, 0, 0, 0, len(self._order))]
+        while nodes:
+            level, x, y, first, end = nodes.pop()
+            own_end = first
+            while own_end < end and self._levels[own_end] == level:
+                own_end += 1
+            yield first, own_end, end
+            if own_end == end or level == self.depth:
+                continue
+            child_size = self.__size / (1 << (level + 1))
+            shift = np.uint64(2 * (self.depth - level - 1))
+            child_code = morton_codes(np.array([2 * x]), np.array([2 * y]))[0]
+            boundaries = np.searchsorted(
+                self._starts[own_end:end],
+                [(child_code + np.uint64(i)) << shift for i in range(1, 4)],
+            )
+            bounds = [own_end, *(own_end + boundaries), end]
+            for i in range(4):
+                if bounds[i] == bounds[i + 1]:
+                    continue
+                child_x, child_y = 2 * x + (i & 1), 2 * y + (i >> 1)
+                if extents is not None:
+                    child_left = left + child_x * child_size
+                    child_top = top - child_y * child_size
+                    if (
+                        child_left > extents[2]
+                        or child_left + child_size < extents[0]
+                        or child_top < extents[1]
+                        or child_top - child_size > extents[3]
+                    ):
+                        continue
+                nodes.append((level + 1, child_x, child_y, bounds[i], bounds[i + 1]))
+
+    def query(self, shape: Shape) -> list[SpatialObject]:
+        extents = self._extents_visitor.visit(shape)
+        for first, own_end, _ in self.__nodes(extents):
+            for index in self._order[first:own_end]:
+                object = self._objects[index]
+                if object.bounding_box.collides_with(shape):
+                    yield object
+
+    def query_pairs(self) -> list[tuple[SpatialObject, SpatialObject]]:
+        # bounding boxes of objects in unrelated nodes can not overlap, so
+        # each object is only compared to the rest of its node and subtree
+        for first, own_end, end in self.__nodes():
+            for position in range(first, own_end):
+                index = self._order[position]
+                extents = self._extents[index]
+                others = self._order[position + 1 : end]
+                other_extents = self._extents[others]
+                overlapping = others[
+                    (other_extents[:, 0] <= extents[2])
+                    & (other_extents[:, 2] >= extents[0])
+                    & (other_extents[:, 1] <= extents[3])
+                    & (other_extents[:, 3] >= extents[1])
+                ]
+                object = self._objects[index]
+                bounding_box = object.bounding_box
+                for other_index in overlapping:
+                    other = self._objects[other_index]
+                    if bounding_box.collides_with(other.bounding_box):
+                        yield (object, other)
+
+    def empty_copy(self) -> "LinearQuadTree":
+        return LinearQuadTree(bounds=self.bounds, depth=self.depth)
@@ -0,0 +1,212 @@
+from dataclasses import dataclass, field
+
+from gaming_framework.geometry.bounding_box import AxisAlignedExtents
+from gaming_framework.geometry.shape import Point2D, Rectangle, Shape
+from gaming_framework.spatial_structures.spatial_object import SpatialObject
+from gaming_framework.spatial_structures.spatial_structure import SpatialStructure
+
+Extents = tuple[float, float, float, float]
+
+
+def _overlaps(extents: Extents, other: Extents) -> bool:
+    return (
+        extents[0] <= other[2]
+        and extents[2] >= other[0]
+        and extents[1] <= other[3]
+        and extents[3] >= other[1]
+    )
+
+
+@dataclass
+class LooseNode:
+    # a square cell of the tree, its loose extents are the cell enlarged by
+    # the tree's looseness around the same center
+    center: Point2D
+    half_size: float
+    depth: int
+    loose_extents: Extents
+    parent: "LooseNode" = field(default=None, repr=False)
+    # kept in insertion order so the pairs read from it do not depend on
+    # where the objects were allocated
+    objects: dict[SpatialObject, None] = field(default_factory=dict)
+    children: list["LooseNode"] = field(default_factory=lambda: [None] * 4)
+    # number of objects stored in this node and its descendants
+    size: int = 0
+
+    def __hash__(self) -> int:
+        return id(self)
+
+    def __eq__(self, other) -> bool:
+        return id(self) == id(other)
+
+    def contains_center(self, point: Point2D) -> bool:
+        return (
+            abs(point.x - self.center.x) <= self.half_size
+            and abs(point.y - self.center.y) <= self.half_size
+        )
+
+    def child_index(self, point: Point2D) -> int:
+        return (point.x > self.center.x) + 2 * (point.y > self.center.y)
+
+
+@dataclass
+class LooseQuadTree(SpatialStructure):
+    # every object is stored in exactly one node, the deepest one whose cell
+    # holds the object's center and whose loose extents still hold the whole
+    # object, objects centered outside of the bounds are kept in the root
+    bounds: Rectangle
+    looseness: float = 2.0
+    max_depth: int = 8
+
+    _root: LooseNode = field(init=False)
+    _nodes: dict[SpatialObject, LooseNode] = field(init=False, default_factory=dict)
+    _extents_visitor: AxisAlignedExtents = field(
+        init=False, default_factory=AxisAlignedExtents
+    )
+
+    def __post_init__(self):
+        if self.looseness <= 1:
+            raise ValueError("looseness must be greater than 1")
+        half_size = max(self.bounds.width, self.bounds.height) / 2
+        self._root = self.__make_node(self.bounds.center, half_size, 0, None)
+
+    def __hash__(self) -> int:
+        return id(self)
+
+    def __eq__(self, other) -> bool:
+        return id(self) == id(other)
+
+    def __make_node(
+        self, center: Point2D, half_size: float, depth: int, parent: LooseNode
+    ) -> LooseNode:
+        loose_half_size = half_size * self.looseness
+        loose_extents = (
+            center.x - loose_half_size,
+            center.y - loose_half_size,
+            center.x + loose_half_size,
+            center.y + loose_half_size,
+        )
+        return LooseNode(center, half_size, depth, loose_extents, parent)
+
+    def __child(self, node: LooseNode, index: int) -> LooseNode:
+        child = node.children[index]
+        if child is None:
+            quarter = node.half_size / 2
+            center = Point2D(
+                node.center.x + (quarter if index & 1 else -quarter),
+                node.center.y + (quarter if index & 2 else -quarter),
+            )
+            child = self.__make_node(center, quarter, node.depth + 1, node)
+            node.children[index] = child
+        return child
+
+    def __depth_of(self, extents: Extents) -> int:
+        # an object centered in a cell fits its loose extents as long as it
+        # reaches no further than (looseness - 1) half sizes from the center
+        reach = max(extents[2] - extents[0], extents[3] - extents[1]) / 2
+        depth = 0
+        half_size = self._root.half_size
+        while depth < self.max_depth and reach <= (self.looseness - 1) * half_size / 2:
+            depth += 1
+            half_size /= 2
+        return depth
+
+    def __target_node(self, object: SpatialObject) -> LooseNode:
+        extents = self._extents_visitor.visit(object.bounding_box)
+        center = Point2D((extents[0] + extents[2]) / 2, (extents[1] + extents[3]) / 2)
+        node = self._root
+        if not node.contains_center(center):
+            return node
+        for _ in range(self.__depth_of(extents)):
+            node = self.__child(node, node.child_index(center))
+        return node
+
+    def __resize(self, node: LooseNode, delta: int):
+        while node is not None:
+            node.size += delta
+            node = node.parent
+
+    def __prune(self, node: LooseNode):
+        # drops the empty nodes on the way up so the tree follows the objects
+        while node.parent is not None and node.size == 0:
+            parent = node.parent
+            parent.children[parent.children.index(node)] = None
+            node = parent
+
+    def __store(self, object: SpatialObject, node: LooseNode):
+        node.objects[object] = None
+        self._nodes[object] = node
+        self.__resize(node, 1)
+
+    def __unstore(self, object: SpatialObject) -> LooseNode:
+        node = self._nodes.pop(object)
+        del node.objects[object]
+        self.__resize(node, -1)
+        return node
+
+    def update(self, object: SpatialObject):
+        node = self.__target_node(object)
+        if node is self._nodes[object]:
+            return
+        old_node = self.__unstore(object)
+        self.__store(object, node)
+        self.__prune(old_node)
+
+    def insert(self, object: SpatialObject):
+        if object in self._nodes:
+            return
+        self.__store(object, self.__target_node(object))
+        self._inserted(object)
+
+    def remove(self, object: SpatialObject):
+        if object not in self._nodes:
+            return
+        self.__prune(self.__unstore(object))
+        self._removed(object)
+
+    def get_objects(self) -> list[SpatialObject]:
+        return list(self._nodes)
+
+    def query(self, shape: Shape) -> list[SpatialObject]:
+        extents = self._extents_visitor.visit(shape)
+        # the root also holds the objects centered outside of it, so it is
+        # always visited
+        nodes = [self._root]
+        while nodes:
+            node = nodes.pop()
+            for child in node.children:
+                if child is not None and _overlaps(child.loose_extents, extents):
+                    nodes.append(child)
+            for object in node.objects:
+                if object.bounding_box.collides_with(shape):
+                    yield object
+
+    def query_pairs(self) -> list[tuple[SpatialObject, SpatialObject]]:
+        extents = {
+            object: self._extents_visitor.visit(object.bounding_box)
+            for object in self._nodes
+        }
+        visited_objects = set()
+        for object, object_extents in extents.items():
+            visited_objects.add(object)
+            bounding_box = object.bounding_box
+            nodes = [self._root]
+            while nodes:
+                node = nodes.pop()
+                for child in node.children:
+                    if child is not None and _overlaps(
+                        child.loose_extents, object_extents
+                    ):
+                        nodes.append(child)
+                for other in node.objects:
+                    if other in visited_objects:
+                        continue
+                    if not _overlaps(extents[other], object_extents):
+                        continue
+                    if bounding_box.collides_with(other.bounding_box):
+                        yield (object, other)
+
+    def empty_copy(self) -> "LooseQuadTree":
+        return LooseQuadTree(
+            bounds=self.bounds, looseness=self.looseness, max_depth=self.max_depth
+        )
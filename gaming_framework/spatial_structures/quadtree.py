@@ -1,8 +1,18 @@
+import heapq
+import math
 from dataclasses import dataclass, field
 
+from gaming_framework.geometry.distance import point_to_extents_distance
+from gaming_framework.geometry.raycast import ray_to_extents_distance
 from gaming_framework.geometry.shape import Point2D, Rectangle, Shape
 from gaming_framework.spatial_structures.spatial_object import SpatialObject
-from gaming_framework.spatial_structures.spatial_structure import SpatialStructure
+from gaming_framework.spatial_structures.spatial_structure import (
+    RaycastHit,
+    SpatialStructure,
+    object_distance,
+    point_hits,
+    raycast_object,
+)
 
 
 @dataclass
@@ -11,13 +21,29 @@ class QuadTree(SpatialStructure):
     max_objects: int = 4
     depth: int = 0
     max_depth: int = 10
-    objects: list[SpatialObject] = field(default_factory=list)
+    # objects and leaves are kept in insertion order so the pairs read from
+    # them do not depend on where the objects were allocated
+    objects: dict[SpatialObject, None] = field(default_factory=dict)
     children: list["QuadTree"] = field(default_factory=list)
 
-    _all_objects: list[SpatialObject] = field(init=False, default_factory=list)
+    # number of entries stored in the leaves of this subtree, an object
+    # straddling several leaves is counted once per leaf
+    _size: int = field(init=False, default=0)
+    _parent: "QuadTree" = field(init=False, default=None, repr=False)
+    # only used by the root, maps each object to the leaves holding it
+    _leaves: dict[SpatialObject, dict["QuadTree", None]] = field(
+        init=False, default_factory=dict, repr=False
+    )
+    # only used by the root, the order in which the objects were inserted, the
+    # first one inserted comes first in a pair
+    _sequence_numbers: dict[SpatialObject, int] = field(
+        init=False, default_factory=dict, repr=False
+    )
+    _next_sequence_number: int = field(init=False, default=0, repr=False)
 
     def __post_init__(self):
-        for object in self.objects:
+        objects, self.objects = self.objects, {}
+        for object in objects:
             self.insert(object)
 
     def __hash__(self) -> int:
@@ -26,9 +52,13 @@ class QuadTree(SpatialStructure):
     def __eq__(self, other) -> bool:
         return id(self) == id(other)
 
-    def __divide(self):
-        if self.depth > self.max_depth:
-            return
+    def __resize(self, delta: int):
+        node = self
+        while node is not None:
+            node._size += delta
+            node = node._parent
+
+    def __divide(self, root: "QuadTree"):
         mid_x = (self.bounds.top_left.x + self.bounds.bottom_right.x) / 2
         mid_y = (self.bounds.top_left.y + self.bounds.bottom_right.y) / 2
 
@@ -51,74 +81,254 @@ class QuadTree(SpatialStructure):
                 max_objects=self.max_objects,
                 depth=self.depth + 1,
                 max_depth=self.max_depth,
-                objects=[],
-                children=[],
             )
             for bound in child_bounds
         ]
-        for object in self.objects:
+        for child in self.children:
+            child._parent = self
+        objects, self.objects = self.objects, {}
+        self.__resize(-len(objects))
+        for object in objects:
+            del root._leaves[object][self]
+            bounding_box = object.bounding_box
             for child in self.children:
-                child.insert(object)
-        self.objects = []
+                child.__insert_rec(root, object, bounding_box)
 
-    def __query_rec(
-        self, shape: Shape, found_objects: list[SpatialObject]
-    ) -> list[SpatialObject]:
-        if not self.bounds.collides_with(shape):
-            return
-        found_objects.extend(
-            object
-            for object in self.objects
-            if (object not in found_objects)
-            and (object.bounding_box.collides_with(shape))
-        )
-        found_objects.extend(
-            object
-            for child in self.children
-            for object in child.__query_rec(shape, found_objects)
-            if (object not in found_objects)
-        )
-        yield from found_objects
+    def __collapse(self, root: "QuadTree"):
+        objects = {}
+        nodes = list(self.children)
+        while nodes:
+            node = nodes.pop()
+            nodes.extend(node.children)
+            for object in node.objects:
+                del root._leaves[object][node]
+            objects.update(node.objects)
+        for object in objects:
+            root._leaves[object][self] = None
+        self.children = []
+        self.objects = objects
+        self.__resize(len(objects) - self._size)
 
-    def __remove_rec(self, object: SpatialObject) -> bool:
+    def __insert_rec(
+        self, root: "QuadTree", object: SpatialObject, bounding_box: Shape
+    ):
+        if not self.bounds.collides_with(bounding_box):
+            return
+        if self.children:
+            for child in self.children:
+                child.__insert_rec(root, object, bounding_box)
+            return
         if object in self.objects:
-            object.unsubscribe(self)
-            self.objects.remove(object)
-            return True
-        removed = False
-        for child in self.children:
-            if child.__remove_rec(object):
-                object.unsubscribe(self)
-                removed = True
-        return removed
+            return
+        self.objects[object] = None
+        root._leaves[object][self] = None
+        self.__resize(1)
+        if len(self.objects) > self.max_objects and self.depth < self.max_depth:
+            self.__divide(root)
+
+    def __remove_entry(self, root: "QuadTree", object: SpatialObject):
+        del self.objects[object]
+        del root._leaves[object][self]
+        self.__resize(-1)
+        collapsing = None
+        node = self._parent
+        while node is not None and node._size < node.max_objects:
+            collapsing = node
+            node = node._parent
+        if collapsing is not None:
+            collapsing.__collapse(root)
+
+    def update(self, object: SpatialObject):
+        bounding_box = object.bounding_box
+        leaves = self._leaves[object]
+        while True:
+            stale_leaf = next(
+                (
+                    leaf
+                    for leaf in leaves
+                    if not leaf.bounds.collides_with(bounding_box)
+                ),
+                None,
+            )
+            if stale_leaf is None:
+                break
+            stale_leaf.__remove_entry(self, object)
+        self.__insert_rec(self, object, bounding_box)
 
     def insert(self, object: SpatialObject) -> bool:
-        if not self.bounds.collides_with(object.bounding_box):
+        if object in self._leaves:
             return False
-        if object in self.objects:
+        bounding_box = object.bounding_box
+        if not self.bounds.collides_with(bounding_box):
             return False
-        if len(self.objects) < self.max_objects:
-            self.objects.append(object)
-            self._all_objects.append(object)
-            return True
-        if not self.children:
-            self.__divide()
-        inserted = any(child.insert(object) for child in self.children)
-        if inserted:
-            self._all_objects.append(object)
-        return inserted
+        self._leaves[object] = {}
+        self._sequence_numbers[object] = self._next_sequence_number
+        self._next_sequence_number += 1
+        self.__insert_rec(self, object, bounding_box)
+        self._inserted(object)
+        return True
 
     def remove(self, object: SpatialObject) -> bool:
-        removed = self.__remove_rec(object)
-        if removed:
-            self._all_objects.remove(object)
-        return removed
+        if object not in self._leaves:
+            return False
+        leaves = self._leaves[object]
+        while leaves:
+            next(iter(leaves)).__remove_entry(self, object)
+        del self._leaves[object]
+        del self._sequence_numbers[object]
+        self._removed(object)
+        return True
 
-    def get_objects(self):
-        return self._all_objects
+    def get_objects(self) -> list[SpatialObject]:
+        return list(self._leaves)
 
     def query(self, shape: Shape) -> list[SpatialObject]:
-        yield from self.__query_rec(shape, [])
+        visited_objects = set()
+        nodes = [self]
+        while nodes:
+            node = nodes.pop()
+            if not node.bounds.collides_with(shape):
+                continue
+            nodes.extend(node.children)
+            for object in node.objects:
+                if object in visited_objects:
+                    continue
+                visited_objects.add(object)
+                if object.bounding_box.collides_with(shape):
+                    yield object
+
+    @property
+    def __extents(self) -> tuple[float, float, float, float]:
+        return (
+            self.bounds.top_left.x,
+            self.bounds.bottom_right.y,
+            self.bounds.bottom_right.x,
+            self.bounds.top_left.y,
+        )
+
+    def __ray_distance(self, origin: Point2D, direction: Point2D) -> float:
+        return ray_to_extents_distance(origin, direction, self.__extents)
+
+    def raycast_hits(
+        self, origin: Point2D, direction: Point2D, max_distance: float = math.inf
+    ) -> list[RaycastHit]:
+        # nodes are visited front to back by the distance at which the ray
+        # enters them, a hit is final once no unvisited node starts before it,
+        # like queries only the parts of objects inside the bounds are reached
+        if not direction.length:
+            yield from point_hits(self, origin)
+            return
+        direction = direction.normalized()
+        distance = self.__ray_distance(origin, direction)
+        if distance is None or distance > max_distance:
+            return
+        tested_objects = set()
+        hits = []
+        nodes = [(distance, id(self), self)]
+        while nodes:
+            distance, _, node = heapq.heappop(nodes)
+            while hits and hits[0][0] <= distance:
+                yield heapq.heappop(hits)[2]
+            for child in node.children:
+                if not child._size:
+                    continue
+                distance = child.__ray_distance(origin, direction)
+                if distance is not None and distance <= max_distance:
+                    heapq.heappush(nodes, (distance, id(child), child))
+            for object in node.objects:
+                if object in tested_objects:
+                    continue
+                tested_objects.add(object)
+                hit = raycast_object(object, origin, direction, max_distance)
+                if hit is not None:
+                    heapq.heappush(hits, (hit.distance, id(hit), hit))
+        while hits:
+            yield heapq.heappop(hits)[2]
+
+    def nearest(
+        self, point: Point2D, k: int = 1, max_distance: float = math.inf
+    ) -> list[SpatialObject]:
+        # best first search, nodes and objects share one queue ordered by
+        # distance, a node's distance never exceeds the one of its objects as
+        # long as the point and the objects are inside the bounds
+        nearest_objects = []
+        visited_objects = set()
+        entries = [(point_to_extents_distance(point, self.__extents), id(self), self)]
+        while entries and len(nearest_objects) < k:
+            distance, _, entry = heapq.heappop(entries)
+            if distance > max_distance:
+                break
+            if not isinstance(entry, QuadTree):
+                nearest_objects.append(entry)
+                continue
+            for child in entry.children:
+                if child._size:
+                    distance = point_to_extents_distance(point, child.__extents)
+                    heapq.heappush(entries, (distance, id(child), child))
+            for object in entry.objects:
+                if object in visited_objects:
+                    continue
+                visited_objects.add(object)
+                distance = object_distance(object, point)
+                heapq.heappush(entries, (distance, id(object), object))
+        return nearest_objects
+
+    def __leaves_rec(self):
+        nodes = [self]
+        while nodes:
+            node = nodes.pop()
+            if node.children:
+                nodes.extend(node.children)
+            else:
+                yield node
+
+    def query_pairs(self) -> list[tuple[SpatialObject, SpatialObject]]:
+        found_pairs = set()
+        sequence_numbers = self._sequence_numbers
+        for leaf in self.__leaves_rec():
+            if len(leaf.objects) < 2:
+                continue
+            objects = list(leaf.objects)
+            for i, object in enumerate(objects):
+                for other in objects[i + 1 :]:
+                    pair = (
+                        (object, other)
+                        if sequence_numbers[object] < sequence_numbers[other]
+                        else (other, object)
+                    )
+                    if pair in found_pairs:
+                        continue
+                    found_pairs.add(pair)
+                    if object.bounding_box.collides_with(other.bounding_box):
+                        yield pair
+
+    def query_pairs_between(
+        self, other_struct: SpatialStructure
+    ) -> list[tuple[SpatialObject, SpatialObject]]:
+        if not isinstance(other_struct, QuadTree):
+            yield from super().query_pairs_between(other_struct)
+            return
+        found_pairs = set()
+        nodes = [(self, other_struct)]
+        while nodes:
+            node, other_node = nodes.pop()
+            if not node._size or not other_node._size:
+                continue
+            if not node.bounds.collides_with(other_node.bounds):
+                continue
+            if node.children:
+                nodes.extend((child, other_node) for child in node.children)
+                continue
+            if other_node.children:
+                nodes.extend((node, child) for child in other_node.children)
+                continue
+            for object in node.objects:
+                for other in other_node.objects:
+                    if other is object or (object, other) in found_pairs:
+                        continue
+                    found_pairs.add((object, other))
+                    if object.bounding_box.collides_with(other.bounding_box):
+                        yield (object, other)
 
     def empty_copy(self) -> "QuadTree":
         return QuadTree(
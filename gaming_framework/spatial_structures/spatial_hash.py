@@ -1,81 +1,196 @@
+import heapq
+import math
 from dataclasses import dataclass, field
 
+from gaming_framework.geometry.raycast import ray_to_extents_distance
 from gaming_framework.geometry.shape import (
     Circle,
+    Line2D,
     Point2D,
+    Polygon,
     Rectangle,
     Shape,
     ShapeVisitor,
 )
 from gaming_framework.spatial_structures.spatial_object import SpatialObject
-from gaming_framework.spatial_structures.spatial_structure import SpatialStructure
+from gaming_framework.spatial_structures.spatial_structure import (
+    RaycastHit,
+    SpatialStructure,
+    object_distance,
+    point_hits,
+    raycast_object,
+)
 
 
 @dataclass
 class ShapeHash(ShapeVisitor):
-    bounds: Rectangle
-    number_of_rows: int
-    number_of_lines: int
-
-    def accept_point(self, point: Point2D) -> tuple[int, int]:
-        x = int(
-            abs(point.x - self.bounds.top_left.x)
-            // (self.bounds.width / self.number_of_rows)
-        )
-        y = int(
-            abs(point.y - self.bounds.top_left.y)
-            // (self.bounds.height / self.number_of_lines)
-        )
-        if point.x < self.bounds.top_left.x:
-            x = -x
-        if point.y > self.bounds.top_left.y:
-            y = -y
-        return (x, y)
+    # without bounds the cells are squares of cell_size with their corners
+    # on the multiples of cell_size
+    bounds: Rectangle = None
+    number_of_rows: int = 20
+    number_of_lines: int = 20
+    cell_size: float = None
+
+    @property
+    def origin(self) -> Point2D:
+        if self.bounds is None:
+            return Point2D(0, 0)
+        return self.bounds.top_left
+
+    @property
+    def cell_width(self) -> float:
+        if self.bounds is None:
+            return self.cell_size
+        return self.bounds.width / self.number_of_rows
+
+    @property
+    def cell_height(self) -> float:
+        if self.bounds is None:
+            return self.cell_size
+        return self.bounds.height / self.number_of_lines
+
+    def cell_of(self, point: Point2D) -> tuple[int, int]:
+        # cells are counted from the top left corner of the bounds, points
+        # outside of them get negative or out of range cells of the same size
+        return (self.column_of(point.x), self.row_of(point.y))
+
+    def column_of(self, x: float) -> int:
+        return math.floor((x - self.origin.x) / self.cell_width)
+
+    def row_of(self, y: float) -> int:
+        return math.floor((self.origin.y - y) / self.cell_height)
+
+    def accept_point(self, point: Point2D) -> list[tuple[int, int]]:
+        return [self.cell_of(point)]
+
+    def accept_line(self, line: Line2D) -> list[tuple[int, int]]:
+        # supercover walk, every cell the segment touches is returned and
+        # passing exactly through a corner adds both side cells
+        x, y = self.cell_of(line.a)
+        end_x, end_y = self.cell_of(line.b)
+        dx, dy = line.b.x - line.a.x, line.b.y - line.a.y
+        left, top = self.origin
+        if dx > 0:
+            step_x, delta_x = 1, self.cell_width / dx
+            next_x = (left + (x + 1) * self.cell_width - line.a.x) / dx
+        elif dx < 0:
+            step_x, delta_x = -1, -self.cell_width / dx
+            next_x = (left + x * self.cell_width - line.a.x) / dx
+        else:
+            step_x, delta_x, next_x = 0, math.inf, math.inf
+        # rows grow downwards
+        if dy < 0:
+            step_y, delta_y = 1, -self.cell_height / dy
+            next_y = (top - (y + 1) * self.cell_height - line.a.y) / dy
+        elif dy > 0:
+            step_y, delta_y = -1, self.cell_height / dy
+            next_y = (top - y * self.cell_height - line.a.y) / dy
+        else:
+            step_y, delta_y, next_y = 0, math.inf, math.inf
+        cells = [(x, y)]
+        while x != end_x or y != end_y:
+            if y == end_y or (x != end_x and next_x < next_y):
+                x += step_x
+                next_x += delta_x
+            elif x == end_x or next_y < next_x:
+                y += step_y
+                next_y += delta_y
+            else:
+                cells.append((x + step_x, y))
+                cells.append((x, y + step_y))
+                x += step_x
+                y += step_y
+                next_x += delta_x
+                next_y += delta_y
+            cells.append((x, y))
+        return cells
 
     def accept_circle(self, circle: Circle) -> list[tuple[int, int]]:
-        top_left = self.accept_point(
-            Point2D(circle.center.x - circle.radius, circle.center.y + circle.radius)
-        )
-        bottom_right = self.accept_point(
-            Point2D(circle.center.x + circle.radius, circle.center.y - circle.radius)
-        )
-        points = []
-        if top_left and bottom_right:
-            points.extend(
-                (row, col)
-                for row in range(top_left[0], bottom_right[0] + 1)
-                for col in range(top_left[1], bottom_right[1] + 1)
-                if (row, col) not in points
+        # each row only spans the columns the circle reaches inside of it
+        center, radius = circle.center, circle.radius
+        top = self.origin.y
+        cells = []
+        for row in range(
+            self.row_of(center.y + radius), self.row_of(center.y - radius) + 1
+        ):
+            row_top = top - row * self.cell_height
+            nearest_y = min(max(center.y, row_top - self.cell_height), row_top)
+            half_width = math.sqrt(max(radius**2 - (nearest_y - center.y) ** 2, 0))
+            cells.extend(
+                (column, row)
+                for column in range(
+                    self.column_of(center.x - half_width),
+                    self.column_of(center.x + half_width) + 1,
+                )
             )
-        return points
+        return cells
 
     def accept_rectangle(self, rectangle: Rectangle) -> list[tuple[int, int]]:
-        top_left = self.accept_point(rectangle.top_left)
-        bottom_right = self.accept_point(rectangle.bottom_right)
-        points = []
-        if top_left and bottom_right:
-            points.extend(
-                (row, col)
-                for row in range(top_left[0], bottom_right[0] + 1)
-                for col in range(top_left[1], bottom_right[1] + 1)
-                if (row, col) not in points
+        left, top = self.cell_of(rectangle.top_left)
+        right, bottom = self.cell_of(rectangle.bottom_right)
+        return [
+            (column, row)
+            for column in range(left, right + 1)
+            for row in range(top, bottom + 1)
+        ]
+
+    def accept_polygon(self, polygon: Polygon) -> list[tuple[int, int]]:
+        # cells touching the outline come from the edges, cells fully inside
+        # are filled between the edge crossings of each row's middle line
+        cells = set()
+        for line in polygon.lines:
+            cells.update(self.accept_line(line))
+        first_row = self.row_of(max(point.y for point in polygon.points))
+        last_row = self.row_of(min(point.y for point in polygon.points))
+        top = self.origin.y
+        for row in range(first_row, last_row + 1):
+            y = top - (row + 0.5) * self.cell_height
+            crossings = sorted(
+                (line.b.x - line.a.x) * (y - line.a.y) / (line.b.y - line.a.y)
+                + line.a.x
+                for line in polygon.lines
+                if (line.a.y > y) != (line.b.y > y)
             )
-        return points
+            for start, end in zip(crossings[::2], crossings[1::2]):
+                cells.update(
+                    (column, row)
+                    for column in range(self.column_of(start), self.column_of(end) + 1)
+                )
+        return list(cells)
 
 
 @dataclass
 class SpatialHash(SpatialStructure):
-    bounds: Rectangle
+    # either bounds split in number_of_rows by number_of_lines cells, or no
+    # bounds and square cells of cell_size covering the whole plane
+    bounds: Rectangle = None
     number_of_rows: int = 20
     number_of_lines: int = 20
-    _map: dict[tuple[int, int], list[SpatialObject]] = field(
+    cell_size: float = None
+    # cells keep their objects in insertion order so the pairs read from them
+    # do not depend on where the objects were allocated
+    _map: dict[tuple[int, int], dict[SpatialObject, None]] = field(
+        init=False, default_factory=dict
+    )
+    _object_hashes: dict[SpatialObject, set[tuple[int, int]]] = field(
         init=False, default_factory=dict
     )
+    # the order in which the objects were inserted, the first one inserted
+    # comes first in a pair
+    _sequence_numbers: dict[SpatialObject, int] = field(
+        init=False, default_factory=dict
+    )
+    _next_sequence_number: int = field(init=False, default=0)
     _hash_visitor: ShapeHash = field(init=False)
+    # (min x, min y, max x, max y) of the used cells and of the grid, None
+    # when it has to be recomputed, raycasts never walk outside of it
+    _cell_range: list[int] = field(init=False, default=None)
 
     def __post_init__(self):
+        if self.bounds is None and self.cell_size is None:
+            raise ValueError("an unbounded spatial hash needs a cell_size")
         self._hash_visitor = ShapeHash(
-            self.bounds, self.number_of_rows, self.number_of_lines
+            self.bounds, self.number_of_rows, self.number_of_lines, self.cell_size
         )
 
     def __hash__(self):
@@ -84,45 +199,263 @@ class SpatialHash(SpatialStructure):
     def __eq__(self, other):
         return id(self) == id(other)
 
-    def __insert_into(self, object: SpatialObject, hashes: list[tuple[int, int]]):
+    def __extend_cell_range(self, hash: tuple[int, int]):
+        if self._cell_range is None:
+            return
+        x, y = hash
+        cell_range = self._cell_range
+        cell_range[0], cell_range[2] = min(cell_range[0], x), max(cell_range[2], x)
+        cell_range[1], cell_range[3] = min(cell_range[1], y), max(cell_range[3], y)
+
+    def __shrink_cell_range(self, hash: tuple[int, int]):
+        if self._cell_range is None:
+            return
+        min_x, min_y, max_x, max_y = self._cell_range
+        if hash[0] in (min_x, max_x) or hash[1] in (min_y, max_y):
+            self._cell_range = None
+
+    def __get_cell_range(self) -> list[int]:
+        if self._cell_range is not None:
+            return self._cell_range
+        hashes = list(self._map)
+        if self.bounds is not None:
+            hashes.append((0, 0))
+            hashes.append((self.number_of_rows - 1, self.number_of_lines - 1))
+        if not hashes:
+            return None
+        self._cell_range = [
+            min(x for x, _ in hashes),
+            min(y for _, y in hashes),
+            max(x for x, _ in hashes),
+            max(y for _, y in hashes),
+        ]
+        return self._cell_range
+
+    def __insert_into(self, object: SpatialObject, hashes: set[tuple[int, int]]):
         for hash in hashes:
             if hash not in self._map:
-                self._map[hash] = []
-            if object not in self._map[hash]:
-                self._map[hash].append(object)
+                self._map[hash] = {}
+                self.__extend_cell_range(hash)
+            self._map[hash][object] = None
+
+    def __remove_from(self, object: SpatialObject, hashes: set[tuple[int, int]]):
+        for hash in hashes:
+            cell = self._map[hash]
+            cell.pop(object, None)
+            if not cell:
+                del self._map[hash]
+                self.__shrink_cell_range(hash)
+
+    def update(self, object: SpatialObject):
+        old_hashes = self._object_hashes[object]
+        hashes = set(self._hash_visitor.visit(object.bounding_box))
+        if hashes == old_hashes:
+            return
+        self.__remove_from(object, old_hashes - hashes)
+        self.__insert_into(object, hashes - old_hashes)
+        self._object_hashes[object] = hashes
 
     def insert(self, object: SpatialObject):
-        hashes = self._hash_visitor.visit(object.bounding_box)
+        if object in self._object_hashes:
+            self.update(object)
+            return
+        hashes = set(self._hash_visitor.visit(object.bounding_box))
         self.__insert_into(object, hashes)
+        self._object_hashes[object] = hashes
+        self._sequence_numbers[object] = self._next_sequence_number
+        self._next_sequence_number += 1
+        self._inserted(object)
 
     def remove(self, object: SpatialObject):
-        removed = False
-        for objects in self._map.values():
-            if object in objects:
-                objects.remove(object)
-                removed = True
-        if removed:
-            object.unsubscribe(self)
+        if object not in self._object_hashes:
+            return
+        self.__remove_from(object, self._object_hashes.pop(object))
+        del self._sequence_numbers[object]
+        self._removed(object)
 
     def get_objects(self) -> list[SpatialObject]:
-        objects = []
-        objects.extend(
-            object
-            for cell in self._map.values()
-            for object in cell
-            if object not in objects
-        )
-        yield from objects
+        return list(self._object_hashes)
 
     def query(self, shape: Shape) -> list[SpatialObject]:
-        hashes = self._hash_visitor.visit(shape)
-        yield from (
-            object for hash in hashes if hash in self._map for object in self._map[hash]
+        found_objects = set()
+        for hash in self._hash_visitor.visit(shape):
+            for object in self._map.get(hash, ()):
+                if object not in found_objects:
+                    found_objects.add(object)
+                    yield object
+
+    def raycast_hits(
+        self, origin: Point2D, direction: Point2D, max_distance: float = math.inf
+    ) -> list[RaycastHit]:
+        # walks the cells crossed by the ray in order, a hit is only yielded
+        # once the walk has passed it, so nothing nearer can show up later
+        if not direction.length:
+            yield from point_hits(self, origin)
+            return
+        direction = direction.normalized()
+        cell_range = self.__get_cell_range()
+        if cell_range is None:
+            return
+        left, top = self._hash_visitor.origin
+        width = self._hash_visitor.cell_width
+        height = self._hash_visitor.cell_height
+        min_x, min_y, max_x, max_y = cell_range
+        extents = (
+            left + min_x * width,
+            top - (max_y + 1) * height,
+            left + (max_x + 1) * width,
+            top - min_y * height,
         )
+        distance = ray_to_extents_distance(origin, direction, extents)
+        if distance is None or distance > max_distance:
+            return
+        x, y = self._hash_visitor.cell_of(origin + direction.scalar_mult(distance))
+        x, y = min(max(x, min_x), max_x), min(max(y, min_y), max_y)
+
+        if direction.x > 0:
+            step_x, delta_x = 1, width / direction.x
+            next_x = (left + (x + 1) * width - origin.x) / direction.x
+        elif direction.x < 0:
+            step_x, delta_x = -1, -width / direction.x
+            next_x = (left + x * width - origin.x) / direction.x
+        else:
+            step_x, delta_x, next_x = 0, math.inf, math.inf
+        # cell rows grow downwards
+        if direction.y < 0:
+            step_y, delta_y = 1, -height / direction.y
+            next_y = (top - (y + 1) * height - origin.y) / direction.y
+        elif direction.y > 0:
+            step_y, delta_y = -1, height / direction.y
+            next_y = (top - y * height - origin.y) / direction.y
+        else:
+            step_y, delta_y, next_y = 0, math.inf, math.inf
+
+        tested_objects = set()
+        hits = []
+        while min_x <= x <= max_x and min_y <= y <= max_y:
+            for object in self._map.get((x, y), ()):
+                if object in tested_objects:
+                    continue
+                tested_objects.add(object)
+                hit = raycast_object(object, origin, direction, max_distance)
+                if hit is not None:
+                    heapq.heappush(hits, (hit.distance, id(hit), hit))
+            cell_exit = min(next_x, next_y)
+            while hits and hits[0][0] <= cell_exit:
+                yield heapq.heappop(hits)[2]
+            if cell_exit > max_distance:
+                break
+            if next_x < next_y:
+                x += step_x
+                next_x += delta_x
+            else:
+                y += step_y
+                next_y += delta_y
+        while hits:
+            yield heapq.heappop(hits)[2]
+
+    def __ring(self, x: int, y: int, radius: int) -> list[tuple[int, int]]:
+        if radius == 0:
+            return [(x, y)]
+        cells = []
+        for i in range(x - radius, x + radius + 1):
+            cells.append((i, y - radius))
+            cells.append((i, y + radius))
+        for j in range(y - radius + 1, y + radius):
+            cells.append((x - radius, j))
+            cells.append((x + radius, j))
+        return cells
+
+    def nearest(
+        self, point: Point2D, k: int = 1, max_distance: float = math.inf
+    ) -> list[SpatialObject]:
+        # visits rings of cells around the point's cell, once a ring is done
+        # every unvisited object is at least as far as the next ring
+        cell_range = self.__get_cell_range()
+        if cell_range is None:
+            return []
+        x, y = self._hash_visitor.cell_of(point)
+        min_x, min_y, max_x, max_y = cell_range
+        ring_size = min(self._hash_visitor.cell_width, self._hash_visitor.cell_height)
+        last_radius = max(x - min_x, max_x - x, y - min_y, max_y - y)
+        nearest_objects = []
+        visited_objects = set()
+        candidates = []
+        radius = 0
+        while len(nearest_objects) < k and radius <= last_radius:
+            for hash in self.__ring(x, y, radius):
+                for object in self._map.get(hash, ()):
+                    if object in visited_objects:
+                        continue
+                    visited_objects.add(object)
+                    distance = object_distance(object, point)
+                    if distance <= max_distance:
+                        heapq.heappush(candidates, (distance, id(object), object))
+            reached = radius * ring_size
+            while candidates and candidates[0][0] <= reached:
+                nearest_objects.append(heapq.heappop(candidates)[2])
+                if len(nearest_objects) == k:
+                    return nearest_objects
+            if reached > max_distance:
+                break
+            radius += 1
+        while candidates and len(nearest_objects) < k:
+            nearest_objects.append(heapq.heappop(candidates)[2])
+        return nearest_objects
+
+    def __same_grid(self, other: SpatialStructure) -> bool:
+        if not isinstance(other, SpatialHash):
+            return False
+        visitor, other_visitor = self._hash_visitor, other._hash_visitor
+        return (
+            visitor.origin == other_visitor.origin
+            and visitor.cell_width == other_visitor.cell_width
+            and visitor.cell_height == other_visitor.cell_height
+        )
+
+    def query_pairs(self) -> list[tuple[SpatialObject, SpatialObject]]:
+        found_pairs = set()
+        sequence_numbers = self._sequence_numbers
+        for cell in self._map.values():
+            if len(cell) < 2:
+                continue
+            objects = list(cell)
+            for i, object in enumerate(objects):
+                for other in objects[i + 1 :]:
+                    pair = (
+                        (object, other)
+                        if sequence_numbers[object] < sequence_numbers[other]
+                        else (other, object)
+                    )
+                    if pair in found_pairs:
+                        continue
+                    found_pairs.add(pair)
+                    if object.bounding_box.collides_with(other.bounding_box):
+                        yield pair
+
+    def query_pairs_between(
+        self, other_struct: SpatialStructure
+    ) -> list[tuple[SpatialObject, SpatialObject]]:
+        if not self.__same_grid(other_struct):
+            yield from super().query_pairs_between(other_struct)
+            return
+        found_pairs = set()
+        for hash, cell in self._map.items():
+            other_cell = other_struct._map.get(hash)
+            if not other_cell:
+                continue
+            for object in cell:
+                for other in other_cell:
+                    if other is object or (object, other) in found_pairs:
+                        continue
+                    found_pairs.add((object, other))
+                    if object.bounding_box.collides_with(other.bounding_box):
+                        yield (object, other)
 
     def empty_copy(self) -> "SpatialHash":
         return SpatialHash(
             bounds=self.bounds,
             number_of_rows=self.number_of_rows,
             number_of_lines=self.number_of_lines,
+            cell_size=self.cell_size,
         )
@@ -12,3 +12,9 @@ class SpatialObject(EventPublisher):
     @property
     def bounding_box(self) -> Shape:
         raise NotImplementedError()
+
+    @property
+    def shape(self) -> Shape:
+        # the shape tested by raycasts, objects without a finer shape are
+        # tested against their bounding box
+        return self.bounding_box
@@ -1,14 +1,71 @@
-from gaming_framework.geometry.shape import Shape
+import heapq
+import math
+from dataclasses import dataclass
+from typing import Iterator
+
+from gaming_framework.geometry.distance import PointDistance
+from gaming_framework.geometry.raycast import RayIntersection
+from gaming_framework.geometry.shape import Circle, Line2D, Point2D, Shape
 from gaming_framework.spatial_structures.spatial_object import SpatialObject
+from gaming_framework.system.events import EventPublisher
+
+
+@dataclass
+class RaycastHit:
+    object: SpatialObject
+    shape: Shape
+    distance: float
+    point: Point2D
+
+    def __hash__(self) -> int:
+        return id(self)
+
+    def __eq__(self, other) -> bool:
+        return id(self) == id(other)
+
+
+_ray_intersection = RayIntersection()
+_point_distance = PointDistance()
+
+
+def raycast_object(
+    object: SpatialObject, origin: Point2D, direction: Point2D, max_distance: float
+) -> RaycastHit:
+    shape = object.shape
+    distance = _ray_intersection.visit(shape, origin, direction)
+    if distance is None or distance > max_distance:
+        return None
+    point = origin + direction.scalar_mult(distance)
+    return RaycastHit(object, shape, distance, point)
+
+
+def point_hits(structure: "SpatialStructure", origin: Point2D) -> Iterator[RaycastHit]:
+    # a ray without a direction, or a segment without a length, only hits
+    # the objects containing its origin, at distance 0
+    for object in structure.query(origin):
+        shape = object.shape
+        if shape.collides_with(origin):
+            yield RaycastHit(object, shape, 0, origin)
+
+
+def object_distance(object: SpatialObject, point: Point2D) -> float:
+    return _point_distance.visit(object.shape, point)
+
 
+class SpatialStructure(EventPublisher):
+    # publishes inserted and removed with the object every time an object
+    # enters or leaves the structure
 
-class SpatialStructure:
     def insert(self, object: SpatialObject):
         raise NotImplementedError()
 
     def remove(self, object: SpatialObject):
         raise NotImplementedError()
 
+    def update(self, object: SpatialObject):
+        # moves an object already in the structure to its current bounding box
+        raise NotImplementedError()
+
     def get_objects(self):
         raise NotImplementedError()
 
@@ -17,3 +74,98 @@ class SpatialStructure:
 
     def empty_copy(self):
         raise NotImplementedError()
+
+    def _inserted(self, object: SpatialObject):
+        # objects publishing their moves are updated on their own, the others
+        # are moved by their owner through update
+        if isinstance(object, EventPublisher):
+            object.subscribe("moved_to", self, self._on_moved_to)
+        self.publish("inserted", object)
+
+    def _removed(self, object: SpatialObject):
+        if isinstance(object, EventPublisher):
+            object.unsubscribe(self)
+        self.publish("removed", object)
+
+    def _on_moved_to(self, object: SpatialObject, *args):
+        self.update(object)
+
+    def query_pairs(self):
+        visited_objects = set()
+        for object in self.get_objects():
+            visited_objects.add(object)
+            bounding_box = object.bounding_box
+            for other in self.query(bounding_box):
+                if other in visited_objects:
+                    continue
+                if bounding_box.collides_with(other.bounding_box):
+                    yield (object, other)
+
+    def query_pairs_between(self, other_struct: "SpatialStructure"):
+        for object in self.get_objects():
+            bounding_box = object.bounding_box
+            for other in other_struct.query(bounding_box):
+                if other is object:
+                    continue
+                if bounding_box.collides_with(other.bounding_box):
+                    yield (object, other)
+
+    def raycast_hits(
+        self, origin: Point2D, direction: Point2D, max_distance: float = math.inf
+    ):
+        # yields hits nearest first, structures override this with a traversal
+        # that can stop as soon as the caller has what it needs
+        if not direction.length:
+            yield from point_hits(self, origin)
+            return
+        direction = direction.normalized()
+        if math.isinf(max_distance):
+            objects = self.get_objects()
+        else:
+            end = origin + direction.scalar_mult(max_distance)
+            objects = self.query(Line2D(origin, end))
+        hits = []
+        for object in objects:
+            hit = raycast_object(object, origin, direction, max_distance)
+            if hit is not None:
+                hits.append(hit)
+        yield from sorted(hits, key=lambda hit: hit.distance)
+
+    def raycast(
+        self, origin: Point2D, direction: Point2D, max_distance: float = math.inf
+    ) -> RaycastHit:
+        return next(self.raycast_hits(origin, direction, max_distance), None)
+
+    def raycast_all(
+        self, origin: Point2D, direction: Point2D, max_distance: float = math.inf
+    ) -> list[RaycastHit]:
+        return list(self.raycast_hits(origin, direction, max_distance))
+
+    def segment_cast(self, line: Line2D) -> RaycastHit:
+        return self.raycast(line.a, line.b - line.a, line.size)
+
+    def segment_cast_all(self, line: Line2D) -> list[RaycastHit]:
+        return self.raycast_all(line.a, line.b - line.a, line.size)
+
+    def nearest(
+        self, point: Point2D, k: int = 1, max_distance: float = math.inf
+    ) -> list[SpatialObject]:
+        # the k objects closest to point, nearest first
+        if math.isinf(max_distance):
+            objects = self.get_objects()
+        else:
+            objects = self.query(Circle(point, max_distance))
+        distances = []
+        for object in objects:
+            distance = object_distance(object, point)
+            if distance <= max_distance:
+                distances.append((distance, id(object), object))
+        return [object for _, _, object in heapq.nsmallest(k, distances)]
+
+    def within_radius(self, point: Point2D, radius: float) -> list[SpatialObject]:
+        # the objects whose shape is at most radius away from point
+        return [
+            object
+            for object in self.query(Circle(point, radius))
+            if object_distance(object, point) <= radius
+        ]
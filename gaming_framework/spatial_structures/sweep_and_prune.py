@@ -0,0 +1,284 @@
+import bisect
+import heapq
+from dataclasses import dataclass, field
+
+from gaming_framework.geometry.bounding_box import AxisAlignedExtents
+from gaming_framework.geometry.shape import Shape
+from gaming_framework.spatial_structures.spatial_object import SpatialObject
+from gaming_framework.spatial_structures.spatial_structure import SpatialStructure
+
+
+@dataclass
+class Endpoint:
+    value: float
+    object: SpatialObject
+    is_max: bool
+    index: int = 0
+
+    def __hash__(self) -> int:
+        return id(self)
+
+    def __eq__(self, other) -> bool:
+        return id(self) == id(other)
+
+    @property
+    def key(self) -> tuple[float, bool]:
+        # at the same value min endpoints come first, so touching intervals
+        # are considered overlapping
+        return (self.value, self.is_max)
+
+
+@dataclass
+class SweepAndPrune(SpatialStructure):
+    _x_endpoints: list[Endpoint] = field(init=False, default_factory=list)
+    _y_endpoints: list[Endpoint] = field(init=False, default_factory=list)
+    # (min x, max x, min y, max y) endpoints of each object
+    _endpoints: dict[SpatialObject, tuple[Endpoint, ...]] = field(
+        init=False, default_factory=dict
+    )
+    # the overlapping objects of each object, in insertion ordered dicts so
+    # the pairs do not depend on where the objects were allocated
+    _partners: dict[SpatialObject, dict[SpatialObject, None]] = field(
+        init=False, default_factory=dict
+    )
+    # an upper bound of the widths of the objects, an object overlapping an x
+    # range starts at most this far to its left, it is never lowered
+    _max_width: float = field(init=False, default=0)
+    # inserted objects waiting to be merged into the sorted axes
+    _pending: dict[SpatialObject, None] = field(init=False, default_factory=dict)
+    _extents_visitor: AxisAlignedExtents = field(
+        init=False, default_factory=AxisAlignedExtents
+    )
+
+    def __hash__(self) -> int:
+        return id(self)
+
+    def __eq__(self, other) -> bool:
+        return id(self) == id(other)
+
+    def __overlaps(self, object: SpatialObject, other: SpatialObject) -> bool:
+        min_x, max_x, min_y, max_y = self._endpoints[object]
+        other_min_x, other_max_x, other_min_y, other_max_y = self._endpoints[other]
+        return (
+            min_x.value <= other_max_x.value
+            and max_x.value >= other_min_x.value
+            and min_y.value <= other_max_y.value
+            and max_y.value >= other_min_y.value
+        )
+
+    def __add_pair(self, object: SpatialObject, other: SpatialObject):
+        self._partners[object][other] = None
+        self._partners[other][object] = None
+
+    def __discard_pair(self, object: SpatialObject, other: SpatialObject):
+        self._partners[object].pop(other, None)
+        self._partners[other].pop(object, None)
+
+    def __on_swap(self, endpoint: Endpoint, other: Endpoint, moved_left: bool):
+        if endpoint.object is other.object:
+            return
+        if endpoint.is_max == other.is_max:
+            return
+        # a min moving left past a max, or a max moving right past a min,
+        # may start an overlap, the opposite swaps always end one
+        starts_overlap = endpoint.is_max != moved_left
+        if not starts_overlap:
+            self.__discard_pair(endpoint.object, other.object)
+        elif self.__overlaps(endpoint.object, other.object):
+            self.__add_pair(endpoint.object, other.object)
+
+    def __sort_endpoint(self, endpoints: list[Endpoint], endpoint: Endpoint):
+        index = endpoint.index
+        while index > 0 and endpoint.key < endpoints[index - 1].key:
+            other = endpoints[index - 1]
+            self.__on_swap(endpoint, other, moved_left=True)
+            endpoints[index] = other
+            other.index = index
+            index -= 1
+        while index < len(endpoints) - 1 and endpoints[index + 1].key < endpoint.key:
+            other = endpoints[index + 1]
+            self.__on_swap(endpoint, other, moved_left=False)
+            endpoints[index] = other
+            other.index = index
+            index += 1
+        endpoints[index] = endpoint
+        endpoint.index = index
+
+    def update(self, object: SpatialObject):
+        if object in self._pending:
+            return
+        min_x, max_x, min_y, max_y = self._endpoints[object]
+        left, bottom, right, top = self._extents_visitor.visit(object.bounding_box)
+        moved_right = left > min_x.value
+        moved_up = bottom > min_y.value
+        min_x.value, max_x.value, min_y.value, max_y.value = left, right, bottom, top
+        self._max_width = max(self._max_width, right - left)
+        for endpoints, lower, upper, increased in (
+            (self._x_endpoints, min_x, max_x, moved_right),
+            (self._y_endpoints, min_y, max_y, moved_up),
+        ):
+            first, second = (upper, lower) if increased else (lower, upper)
+            self.__sort_endpoint(endpoints, first)
+            self.__sort_endpoint(endpoints, second)
+
+    def __flush(self):
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        for object in pending:
+            left, bottom, right, top = self._extents_visitor.visit(object.bounding_box)
+            endpoints = (
+                Endpoint(left, object, False),
+                Endpoint(right, object, True),
+                Endpoint(bottom, object, False),
+                Endpoint(top, object, True),
+            )
+            self._endpoints[object] = endpoints
+            self._partners[object] = {}
+            self._max_width = max(self._max_width, right - left)
+            self._x_endpoints.extend(endpoints[:2])
+            self._y_endpoints.extend(endpoints[2:])
+        # the axes are still sorted apart from the appended tail, which the
+        # merge in timsort handles in close to linear time
+        for endpoints in (self._x_endpoints, self._y_endpoints):
+            endpoints.sort(key=lambda endpoint: endpoint.key)
+            for index, endpoint in enumerate(endpoints):
+                endpoint.index = index
+        active = {}
+        active_pending = {}
+        for endpoint in self._x_endpoints:
+            object = endpoint.object
+            if endpoint.is_max:
+                active.pop(object, None)
+                active_pending.pop(object, None)
+                continue
+            is_pending = object in pending
+            for other in active if is_pending else active_pending:
+                if self.__overlaps(object, other):
+                    self.__add_pair(object, other)
+            active[object] = None
+            if is_pending:
+                active_pending[object] = None
+
+    def __remove_endpoints(
+        self, endpoints: list[Endpoint], lower: Endpoint, upper: Endpoint
+    ):
+        # the max endpoint always comes after the min one
+        del endpoints[upper.index]
+        del endpoints[lower.index]
+        for index in range(lower.index, len(endpoints)):
+            endpoints[index].index = index
+
+    def insert(self, object: SpatialObject):
+        if object in self._endpoints or object in self._pending:
+            return
+        self._pending[object] = None
+        self._inserted(object)
+
+    def remove(self, object: SpatialObject):
+        if object in self._pending:
+            del self._pending[object]
+        elif object in self._endpoints:
+            for other in self._partners.pop(object):
+                self._partners[other].pop(object, None)
+            min_x, max_x, min_y, max_y = self._endpoints.pop(object)
+            self.__remove_endpoints(self._x_endpoints, min_x, max_x)
+            self.__remove_endpoints(self._y_endpoints, min_y, max_y)
+        else:
+            return
+        self._removed(object)
+
+    def get_objects(self) -> list[SpatialObject]:
+        return list(self._endpoints) + list(self._pending)
+
+    def query(self, shape: Shape) -> list[SpatialObject]:
+        self.__flush()
+        left, bottom, right, top = self._extents_visitor.visit(shape)
+        start = bisect.bisect_left(
+            self._x_endpoints,
+            (left - self._max_width, False),
+            key=lambda endpoint: endpoint.key,
+        )
+        end = bisect.bisect_right(
+            self._x_endpoints, (right, False), key=lambda endpoint: endpoint.key
+        )
+        for index in range(start, end):
+            endpoint = self._x_endpoints[index]
+            if endpoint.is_max:
+                continue
+            _, max_x, min_y, max_y = self._endpoints[endpoint.object]
+            if max_x.value < left or min_y.value > top or max_y.value < bottom:
+                continue
+            if endpoint.object.bounding_box.collides_with(shape):
+                yield endpoint.object
+
+    def query_pairs(self) -> list[tuple[SpatialObject, SpatialObject]]:
+        self.__flush()
+        visited_objects = set()
+        for object, partners in self._partners.items():
+            visited_objects.add(object)
+            for other in partners:
+                if other in visited_objects:
+                    continue
+                if object.bounding_box.collides_with(other.bounding_box):
+                    yield (object, other)
+
+    def query_pairs_between(
+        self, other_struct: SpatialStructure
+    ) -> list[tuple[SpatialObject, SpatialObject]]:
+        if not isinstance(other_struct, SweepAndPrune):
+            yield from super().query_pairs_between(other_struct)
+            return
+        self.__flush()
+        other_struct.__flush()
+        size, other_size = len(self._endpoints), len(other_struct._endpoints)
+        if 4 * min(size, other_size) < max(size, other_size):
+            # few objects on one side, bisecting queries on the other side
+            # beat walking both whole axes
+            yield from self.__query_pairs_between_smaller(other_struct)
+            return
+        # a single sweep over both sorted x axes, every min endpoint is tested
+        # against the objects of the other structure open at that point
+        # open objects are kept with their y endpoints to skip most of the
+        # exact tests
+        active, other_active = {}, {}
+        for endpoint in heapq.merge(
+            ((endpoint.key, 0, endpoint) for endpoint in self._x_endpoints),
+            ((endpoint.key, 1, endpoint) for endpoint in other_struct._x_endpoints),
+            key=lambda item: item[:2],
+        ):
+            _, is_other, endpoint = endpoint
+            object = endpoint.object
+            opened, others = (
+                (other_active, active) if is_other else (active, other_active)
+            )
+            if endpoint.is_max:
+                del opened[object]
+                continue
+            structure = other_struct if is_other else self
+            _, _, min_y, max_y = structure._endpoints[object]
+            bounding_box = object.bounding_box
+            for other, (other_min_y, other_max_y) in others.items():
+                if other is object:
+                    continue
+                if min_y.value > other_max_y.value or max_y.value < other_min_y.value:
+                    continue
+                if not bounding_box.collides_with(other.bounding_box):
+                    continue
+                yield (other, object) if is_other else (object, other)
+            opened[object] = (min_y, max_y)
+
+    def __query_pairs_between_smaller(
+        self, other_struct: "SweepAndPrune"
+    ) -> list[tuple[SpatialObject, SpatialObject]]:
+        if len(self._endpoints) <= len(other_struct._endpoints):
+            yield from super().query_pairs_between(other_struct)
+            return
+        for other in other_struct.get_objects():
+            bounding_box = other.bounding_box
+            for object in self.query(bounding_box):
+                if object is not other:
+                    yield (object, other)
+
+    def empty_copy(self) -> "SweepAndPrune":
+        return SweepAndPrune()
@@ -0,0 +1,15 @@
+import pytest
+
+from gaming_framework.geometry.shape import Circle, Point2D
+from gaming_framework.physics.body import Body
+from gaming_framework.physics.collision_shape import CollisionShape
+
+
+@pytest.fixture
+def make_body():
+    def make_body(x, y, speed=Point2D(0, 0), radius=1, **kwargs):
+        return Body(
+            CollisionShape(Circle(Point2D(x, y), radius)), speed=speed, **kwargs
+        )
+
+    return make_body
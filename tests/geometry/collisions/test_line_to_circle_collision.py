@@ -0,0 +1,26 @@
+from gaming_framework.geometry.collision import line_to_circle_collision
+from gaming_framework.geometry.shape import Circle, Line2D, Point2D
+
+
+def test_line_crosses_circle():
+    line = Line2D(Point2D(-10, 1), Point2D(10, 1))
+    circle = Circle(Point2D(0, 0), 2)
+    assert line_to_circle_collision(line, circle)
+
+
+def test_line_end_is_inside_circle():
+    line = Line2D(Point2D(0, 1), Point2D(10, 10))
+    circle = Circle(Point2D(0, 0), 2)
+    assert line_to_circle_collision(line, circle)
+
+
+def test_line_passes_beside_circle():
+    line = Line2D(Point2D(-10, 3), Point2D(10, 3))
+    circle = Circle(Point2D(0, 0), 2)
+    assert line_to_circle_collision(line, circle) == False
+
+
+def test_line_stops_before_circle():
+    line = Line2D(Point2D(-10, 0), Point2D(-3, 0))
+    circle = Circle(Point2D(0, 0), 2)
+    assert line_to_circle_collision(line, circle) == False
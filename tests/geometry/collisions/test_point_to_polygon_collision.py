@@ -52,3 +52,9 @@ def test_point_is_inside_concave_polygon(point):
 def test_point_is_outside_concave_polygon(point):
     polygon = generate_random_polygon()
     assert point_to_polygon_collision(point, polygon) == False
+
+
+def test_point_is_inside_polygon_with_horizontal_edges():
+    polygon = Polygon([Point2D(0, 0), Point2D(4, 0), Point2D(4, 4), Point2D(0, 4)])
+    assert point_to_polygon_collision(Point2D(2, 2), polygon)
+    assert point_to_polygon_collision(Point2D(5, 2), polygon) == False
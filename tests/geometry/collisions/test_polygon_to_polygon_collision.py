@@ -0,0 +1,60 @@
+from gaming_framework.geometry.collision import polygon_to_polygon_collision
+from gaming_framework.geometry.shape import Point2D, Polygon
+
+
+def make_square(x, y, size=2):
+    return Polygon(
+        [
+            Point2D(x, y),
+            Point2D(x + size, y),
+            Point2D(x + size, y + size),
+            Point2D(x, y + size),
+        ]
+    )
+
+
+def test_convexity_is_detected():
+    star = Polygon(
+        [Point2D(0, 0), Point2D(2, 6), Point2D(4, 0), Point2D(-1, 4), Point2D(5, 4)]
+    )
+    arrow = Polygon([Point2D(0, 0), Point2D(2, 1), Point2D(4, 0), Point2D(2, 4)])
+    assert make_square(0, 0).is_convex
+    assert star.is_convex == False
+    assert arrow.is_convex == False
+
+
+def test_overlapping_convex_polygons():
+    assert polygon_to_polygon_collision(make_square(0, 0), make_square(1, 1))
+
+
+def test_touching_convex_polygons():
+    assert polygon_to_polygon_collision(make_square(0, 0), make_square(2, 0))
+
+
+def test_convex_polygon_inside_another():
+    assert polygon_to_polygon_collision(make_square(0, 0, 10), make_square(4, 4))
+
+
+def test_convex_polygons_separated_by_a_diagonal():
+    triangle = Polygon([Point2D(0, 0), Point2D(4, 0), Point2D(0, 4)])
+    other = Polygon([Point2D(3, 3), Point2D(6, 3), Point2D(3, 6)])
+    assert polygon_to_polygon_collision(triangle, other) == False
+
+
+def test_concave_polygons_use_edge_tests():
+    # the square fits in the notch of the u shape without touching it
+    u_shape = Polygon(
+        [
+            Point2D(0, 0),
+            Point2D(6, 0),
+            Point2D(6, 6),
+            Point2D(4, 6),
+            Point2D(4, 2),
+            Point2D(2, 2),
+            Point2D(2, 6),
+            Point2D(0, 6),
+        ]
+    )
+    assert u_shape.is_convex == False
+    assert polygon_to_polygon_collision(u_shape, make_square(2.5, 3, 1)) == False
+    assert polygon_to_polygon_collision(u_shape, make_square(1.5, 3, 1))
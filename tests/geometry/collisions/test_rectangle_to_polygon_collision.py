@@ -0,0 +1,20 @@
+from gaming_framework.geometry.collision import rectangle_to_polygon_collision
+from gaming_framework.geometry.shape import Point2D, Polygon, Rectangle
+
+
+def test_rectangle_overlaps_convex_polygon():
+    rectangle = Rectangle(Point2D(0, 4), Point2D(4, 0))
+    triangle = Polygon([Point2D(3, 3), Point2D(8, 3), Point2D(5, 8)])
+    assert rectangle_to_polygon_collision(rectangle, triangle)
+
+
+def test_rectangle_misses_convex_polygon():
+    rectangle = Rectangle(Point2D(0, 4), Point2D(4, 0))
+    triangle = Polygon([Point2D(3, 5.5), Point2D(6, 2.5), Point2D(6, 5.5)])
+    assert rectangle_to_polygon_collision(rectangle, triangle) == False
+
+
+def test_convex_polygon_inside_rectangle():
+    rectangle = Rectangle(Point2D(0, 10), Point2D(10, 0))
+    triangle = Polygon([Point2D(3, 3), Point2D(5, 3), Point2D(4, 5)])
+    assert rectangle_to_polygon_collision(rectangle, triangle)
@@ -0,0 +1,94 @@
+import numpy as np
+
+from gaming_framework.geometry.batch_collision import (
+    circles_to_circles_collision,
+    circles_to_rectangles_collision,
+    lines_to_lines_collision,
+    moving_circles_time_of_collision,
+    points_to_polygon_collision,
+)
+from gaming_framework.geometry.collision import (
+    circle_to_circle_collision,
+    circle_to_rectangle_collision,
+    line_to_line_collision,
+    point_to_polygon_collision,
+)
+from gaming_framework.geometry.shape import Circle, Line2D, Point2D, Polygon, Rectangle
+
+rng = np.random.default_rng(0)
+
+
+def random_points(n, low=-10, high=10):
+    return rng.uniform(low, high, size=(n, 2))
+
+
+def test_circles_to_circles_matches_single_pair_tests():
+    centers, other_centers = random_points(200), random_points(200)
+    radii, other_radii = rng.uniform(0, 5, 200), rng.uniform(0, 5, 200)
+    expected = [
+        circle_to_circle_collision(Circle(Point2D(*a), ra), Circle(Point2D(*b), rb))
+        for a, ra, b, rb in zip(centers, radii, other_centers, other_radii)
+    ]
+    mask = circles_to_circles_collision(centers, radii, other_centers, other_radii)
+    assert mask.tolist() == expected
+
+
+def test_circles_to_rectangles_matches_single_pair_tests():
+    centers, radii = random_points(200), rng.uniform(0, 5, 200)
+    corners = random_points(200)
+    sizes = rng.uniform(0, 5, size=(200, 2))
+    top_lefts = corners + sizes * [0, 1]
+    bottom_rights = corners + sizes * [1, 0]
+    expected = [
+        circle_to_rectangle_collision(
+            Circle(Point2D(*center), radius),
+            Rectangle(Point2D(*top_left), Point2D(*bottom_right)),
+        )
+        for center, radius, top_left, bottom_right in zip(
+            centers, radii, top_lefts, bottom_rights
+        )
+    ]
+    mask = circles_to_rectangles_collision(centers, radii, top_lefts, bottom_rights)
+    assert mask.tolist() == expected
+
+
+def test_points_to_polygon_matches_single_point_tests():
+    polygon_points = [(-5, -5), (0, -2), (5, -5), (5, 5), (0, 2), (-5, 5)]
+    polygon = Polygon([Point2D(*point) for point in polygon_points])
+    points = random_points(200)
+    expected = [
+        point_to_polygon_collision(Point2D(*point), polygon) for point in points
+    ]
+    assert points_to_polygon_collision(points, polygon_points).tolist() == expected
+
+
+def test_lines_to_lines_matches_single_pair_tests():
+    starts, ends = random_points(200), random_points(200)
+    other_starts, other_ends = random_points(200), random_points(200)
+    expected = [
+        line_to_line_collision(
+            Line2D(Point2D(*a), Point2D(*b)), Line2D(Point2D(*c), Point2D(*d))
+        )
+        for a, b, c, d in zip(starts, ends, other_starts, other_ends)
+    ]
+    mask = lines_to_lines_collision(starts, ends, other_starts, other_ends)
+    assert mask.tolist() == expected
+
+
+def test_parallel_lines_do_not_collide():
+    mask = lines_to_lines_collision([(0, 0)], [(1, 1)], [(0, 1)], [(1, 2)])
+    assert mask.tolist() == [False]
+
+
+def test_moving_circles_time_of_collision():
+    times = moving_circles_time_of_collision(
+        [(0, 0), (0, 0), (0, 0)],
+        [(1, 0), (0, 1), (1, 0)],
+        [1, 1, 1],
+        [(10, 0), (10, 0), (1, 0)],
+        [(-1, 0), (0, 1), (0, 0)],
+        [1, 1, 1],
+    )
+    assert times[0] == 4
+    assert times[1] < 0
+    assert times[2] == 0
@@ -0,0 +1,53 @@
+import gc
+
+from gaming_framework.geometry.bounding_box import (
+    CircleBoundingBox,
+    RectangleBoundingBox,
+)
+from gaming_framework.geometry.shape import Circle, Point2D, Polygon, Rectangle
+
+
+def test_circle_bounding_box_of_point():
+    circle = CircleBoundingBox().visit(Point2D(2, 3))
+    assert circle.center == Point2D(2, 3)
+    assert circle.radius == 1
+
+
+def test_rectangle_bounding_box_of_circle():
+    rectangle = RectangleBoundingBox().visit(Circle(Point2D(10, 2), 1))
+    assert rectangle.top_left == Point2D(9, 3)
+    assert rectangle.bottom_right == Point2D(11, 1)
+
+
+def test_repeated_visits_hit_the_cache():
+    visitor = RectangleBoundingBox()
+    polygon = Polygon([Point2D(0, 0), Point2D(4, 0), Point2D(2, 2)])
+    first = visitor.visit(polygon)
+    assert visitor.visit(polygon) is first
+    assert visitor.memory.misses == 1
+    assert visitor.memory.hits == 1
+
+
+def test_entries_are_dropped_with_their_shape():
+    visitor = CircleBoundingBox()
+    rectangle = Rectangle(Point2D(0, 2), Point2D(2, 0))
+    visitor.visit(rectangle)
+    assert len(visitor.memory) == 1
+    del rectangle
+    gc.collect()
+    assert len(visitor.memory) == 0
+
+
+def test_cache_is_bounded():
+    visitor = RectangleBoundingBox(max_size=8)
+    for i in range(100):
+        visitor.visit(Point2D(i, i))
+    assert len(visitor.memory) == 8
+
+
+def test_replaced_shape_is_not_served_a_stale_box():
+    visitor = RectangleBoundingBox()
+    circle = Circle(Point2D(0, 0), 1)
+    visitor.visit(circle)
+    circle = circle.center_to(Point2D(5, 5))
+    assert visitor.visit(circle).top_left == Point2D(4, 6)
@@ -0,0 +1,31 @@
+from gaming_framework.geometry.raycast import RayIntersection, ray_to_extents_distance
+from gaming_framework.geometry.shape import Circle, Line2D, Point2D, Polygon, Rectangle
+
+ORIGIN = Point2D(0, 0)
+RIGHT = Point2D(1, 0)
+
+
+def test_ray_enters_extents():
+    assert ray_to_extents_distance(ORIGIN, RIGHT, (2, -1, 4, 1)) == 2
+    assert ray_to_extents_distance(ORIGIN, RIGHT, (2, 1, 4, 3)) is None
+    assert ray_to_extents_distance(ORIGIN, RIGHT, (-1, -1, 1, 1)) == 0
+
+
+def test_ray_hits_circle():
+    assert RayIntersection().visit(Circle(Point2D(5, 0), 1), ORIGIN, RIGHT) == 4
+    assert RayIntersection().visit(Circle(Point2D(-5, 0), 1), ORIGIN, RIGHT) is None
+
+
+def test_ray_hits_line():
+    line = Line2D(Point2D(3, -1), Point2D(3, 1))
+    assert RayIntersection().visit(line, ORIGIN, RIGHT) == 3
+    collinear = Line2D(Point2D(6, 0), Point2D(4, 0))
+    assert RayIntersection().visit(collinear, ORIGIN, RIGHT) == 4
+
+
+def test_ray_hits_rectangle_and_polygon():
+    rectangle = Rectangle(Point2D(2, 1), Point2D(3, -1))
+    triangle = Polygon([Point2D(4, -2), Point2D(8, 0), Point2D(4, 2)])
+    assert RayIntersection().visit(rectangle, ORIGIN, RIGHT) == 2
+    assert RayIntersection().visit(triangle, ORIGIN, RIGHT) == 4
+    assert RayIntersection().visit(triangle, Point2D(5, 0), RIGHT) == 0
@@ -0,0 +1,42 @@
+import weakref
+
+from gaming_framework.geometry.shape import Circle, Line2D, Point2D, Polygon, Rectangle
+
+
+def test_shapes_have_no_instance_dict():
+    shapes = [
+        Point2D(0, 0),
+        Line2D(Point2D(0, 0), Point2D(1, 1)),
+        Circle(Point2D(0, 0), 1),
+        Rectangle(Point2D(0, 1), Point2D(1, 0)),
+        Polygon([Point2D(0, 0), Point2D(1, 0), Point2D(0, 1)]),
+    ]
+    for shape in shapes:
+        assert not hasattr(shape, "__dict__")
+
+
+def test_dataclass_shapes_support_weak_references():
+    circle = Circle(Point2D(0, 0), 1)
+    assert weakref.ref(circle)() is circle
+
+
+def test_line_derived_data():
+    line = Line2D(Point2D(0, 0), Point2D(6, 8))
+    assert line.center == Point2D(3, 4)
+    assert line.size == 10
+    assert line.bounding_box.radius == 5
+
+
+def test_rectangle_caches_derived_data():
+    rectangle = Rectangle(Point2D(0, 2), Point2D(2, 0))
+    assert rectangle.lines is rectangle.lines
+    assert rectangle.bounding_box is rectangle.bounding_box
+
+
+def test_point_vector_helpers():
+    point = Point2D(3, 4)
+    assert point.length == 5
+    assert point.normalized() == Point2D(0.6, 0.8)
+    assert -point == Point2D(-3, -4)
+    assert point.cross(Point2D(1, 0)) == -4
+    assert point * Point2D(1, 1) == 7
@@ -0,0 +1,85 @@
+import numpy as np
+
+from gaming_framework.geometry.batch_collision import circles_to_circles_collision
+from gaming_framework.geometry.shape import Circle, Point2D, Polygon, Rectangle
+from gaming_framework.geometry.shape_store import CIRCLE, ShapeStore
+
+
+def test_stored_shapes_keep_their_geometry():
+    store = ShapeStore()
+    circle = store.add(Circle(Point2D(1, 2), 3))
+    rectangle = store.add(Rectangle(Point2D(0, 4), Point2D(2, 0)))
+    polygon = store.add(Polygon([Point2D(0, 0), Point2D(4, 0), Point2D(2, 2)]))
+    assert circle.center == Point2D(1, 2)
+    assert circle.radius == 3
+    assert rectangle.top_left == Point2D(0, 4)
+    assert rectangle.bottom_right == Point2D(2, 0)
+    assert polygon.points == [Point2D(0, 0), Point2D(4, 0), Point2D(2, 2)]
+    assert len(store) == 3
+
+
+def test_stored_shapes_collide_like_plain_shapes():
+    store = ShapeStore()
+    circle = store.add(Circle(Point2D(0, 0), 1))
+    rectangle = store.add(Rectangle(Point2D(0.5, 3), Point2D(3, 0.5)))
+    polygon = store.add(Polygon([Point2D(0, 0), Point2D(4, 0), Point2D(2, 2)]))
+    assert circle.collides_with(rectangle)
+    assert polygon.collides_with(circle)
+    assert circle.collides_with(Circle(Point2D(3, 0), 1)) == False
+
+
+def test_stored_polygons_collide_with_polygons_and_rectangles():
+    store = ShapeStore()
+    polygon = store.add(Polygon([Point2D(0, 0), Point2D(4, 0), Point2D(2, 2)]))
+    assert polygon.is_convex
+    assert polygon.collides_with(Polygon([Point2D(1, 1), Point2D(3, 1), Point2D(2, 3)]))
+    assert polygon.collides_with(Rectangle(Point2D(1, 3), Point2D(3, 1)))
+    assert Rectangle(Point2D(5, 3), Point2D(7, 1)).collides_with(polygon) == False
+    polygon.set_center(Point2D(12, 11))
+    assert polygon.collides_with(Rectangle(Point2D(1, 3), Point2D(3, 1))) == False
+
+
+def test_set_center_moves_shape_in_place():
+    store = ShapeStore()
+    polygon = store.add(Polygon([Point2D(0, 0), Point2D(4, 0), Point2D(2, 2)]))
+    polygon.set_center(Point2D(12, 11))
+    assert polygon.points == [Point2D(10, 10), Point2D(14, 10), Point2D(12, 12)]
+
+
+def test_store_grows_and_reuses_removed_slots():
+    store = ShapeStore(capacity=2)
+    circles = [store.add(Circle(Point2D(i, 0), 1)) for i in range(5)]
+    store.remove(circles[1])
+    circle = store.add(Circle(Point2D(9, 9), 1))
+    assert circle.index == 1
+    assert len(store) == 5
+    assert circles[4].center == Point2D(4, 0)
+
+
+def test_removing_a_shape_twice_frees_its_slot_once():
+    store = ShapeStore()
+    circle = store.add(Circle(Point2D(0, 0), 1))
+    store.remove(circle)
+    store.remove(circle)
+    first, second = store.add(Circle(Point2D(1, 0), 1)), store.add(
+        Circle(Point2D(2, 0), 1)
+    )
+    assert first.index != second.index
+    assert (first.center, second.center) == (Point2D(1, 0), Point2D(2, 0))
+    assert len(store) == 2
+
+
+def test_kernels_read_the_raw_arrays():
+    store = ShapeStore()
+    for i in range(10):
+        store.add(Circle(Point2D(i * 3, 0), 1))
+    indices = store.indices(CIRCLE)
+    mask = circles_to_circles_collision(
+        store.centers[indices[:-1]],
+        store.radii[indices[:-1]],
+        store.centers[indices[1:]],
+        store.radii[indices[1:]],
+    )
+    assert not mask.any()
+    extents = store.bounding_extents()
+    assert np.array_equal(extents[0], [-1, -1, 1, 1])
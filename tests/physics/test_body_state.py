@@ -0,0 +1,64 @@
+import numpy as np
+
+from gaming_framework.geometry.shape import Point2D
+from gaming_framework.physics.body_state import BodyState
+
+
+def test_body_is_a_view_onto_its_row(make_body):
+    body_state = BodyState()
+    body = make_body(1, 2, Point2D(3, 4), mass=5)
+    body_state.add(body)
+    assert body_state.positions[0].tolist() == [1, 2]
+    assert body_state.masses[0] == 5
+    body.speed = Point2D(6, 7)
+    assert body_state.speeds[0].tolist() == [6, 7]
+    body_state.accelerations[0] = (1, 1)
+    assert body.acceleration == Point2D(1, 1)
+
+
+def test_state_grows(make_body):
+    body_state = BodyState(capacity=2)
+    bodies = [make_body(i, i) for i in range(5)]
+    for body in bodies:
+        body_state.add(body)
+    assert len(body_state) == 5
+    assert [body.position for body in bodies] == [Point2D(i, i) for i in range(5)]
+
+
+def test_integrate_moves_the_collision_shapes(make_body):
+    body_state = BodyState()
+    moving, static = make_body(0, 0, Point2D(1, 0)), make_body(5, 5, is_static=True)
+    static.speed = Point2D(1, 1)
+    body_state.add(moving)
+    body_state.add(static)
+    predicted = body_state.predict_positions(2)
+    assert predicted.tolist() == [[2, 0], [5, 5]]
+    body_state.integrate(2, np.array([0, 1]))
+    assert moving.position == Point2D(2, 0)
+    assert moving.bounding_box.center == Point2D(2, 0)
+    assert static.position == Point2D(5, 5)
+
+
+def test_removed_body_keeps_its_values(make_body):
+    body_state = BodyState()
+    a, b = make_body(0, 0, Point2D(1, 0)), make_body(5, 5, Point2D(0, 1))
+    body_state.add(a)
+    body_state.add(b)
+    body_state.integrate(1, np.array([0, 1]))
+    body_state.remove(a)
+    assert a.position == Point2D(1, 0)
+    assert a.speed == Point2D(1, 0)
+    assert a.bounding_box.center == Point2D(1, 0)
+    assert body_state.bodies == [b]
+    assert b.position == Point2D(5, 6)
+
+
+def test_observed_flag_follows_the_subscriptions(make_body):
+    body_state = BodyState()
+    body = make_body(0, 0)
+    body_state.add(body)
+    assert not body_state.is_observed[0]
+    body.subscribe("moved_to", body_state, lambda *args: None)
+    assert body_state.is_observed[0]
+    body.unsubscribe(body_state)
+    assert not body_state.is_observed[0]
@@ -0,0 +1,42 @@
+from gaming_framework.geometry.shape import Circle, Point2D, Polygon, Rectangle
+from gaming_framework.physics.collision_shape import CollisionShape
+
+
+def make_polygon(vertex_count):
+    return Polygon([Point2D(i % 2 + i, (i // 2) % 3) for i in range(vertex_count)])
+
+
+def test_position_is_the_shape_center():
+    collision_shape = CollisionShape(Rectangle(Point2D(0, 4), Point2D(2, 0)))
+    assert collision_shape.position == Point2D(1, 2)
+
+
+def test_moving_keeps_the_local_shape():
+    polygon = make_polygon(64)
+    collision_shape = CollisionShape(polygon)
+    collision_shape.set_position(Point2D(100, 100))
+    assert collision_shape.local_shape is polygon
+    assert collision_shape.position == Point2D(100, 100)
+
+
+def test_bounding_box_follows_the_translation():
+    collision_shape = CollisionShape(Circle(Point2D(1, 1), 2))
+    collision_shape.set_position(Point2D(5, 6))
+    assert collision_shape.bounding_box.center == Point2D(5, 6)
+    assert collision_shape.bounding_box.radius == 2
+
+
+def test_world_shape_is_derived_on_demand():
+    collision_shape = CollisionShape(Rectangle(Point2D(0, 2), Point2D(2, 0)))
+    collision_shape.set_position(Point2D(11, 11))
+    assert collision_shape.shape.top_left == Point2D(10, 12)
+    assert collision_shape.shape is collision_shape.shape
+
+
+def test_collides_with_uses_world_shapes():
+    collision_shape = CollisionShape(Circle(Point2D(0, 0), 1))
+    other = CollisionShape(Circle(Point2D(0, 0), 1))
+    other.set_position(Point2D(5, 0))
+    assert collision_shape.collides_with(other) == False
+    collision_shape.set_position(Point2D(4, 0))
+    assert collision_shape.collides_with(other)
@@ -0,0 +1,74 @@
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from gaming_framework.physics.islands import (
+    find_islands,
+    island_batches,
+    shared_arrays,
+    shared_times_of_collision,
+    times_of_collision,
+)
+
+
+def test_islands_are_the_connected_pairs_in_order():
+    pairs = np.array([(0, 1), (2, 3), (4, 5), (1, 6), (3, 0)])
+    order, island_starts = find_islands(pairs, 7)
+    assert order.tolist() == [0, 1, 3, 4, 2]
+    assert island_starts.tolist() == [0, 4]
+
+
+def test_single_pair_islands():
+    pairs = np.array([(0, 1), (2, 3)])
+    order, island_starts = find_islands(pairs, 4)
+    assert order.tolist() == [0, 1]
+    assert island_starts.tolist() == [0, 1]
+
+
+def test_long_chains_are_one_island():
+    pairs = np.array([(i + 1, i) for i in range(100)][::-1])
+    order, island_starts = find_islands(pairs, 101)
+    assert order.tolist() == list(range(100))
+    assert island_starts.tolist() == [0]
+
+
+def test_batches_never_split_an_island():
+    island_starts = np.array([0, 1, 2, 6, 7, 8])
+    assert island_batches(island_starts, 10, 2) == [(0, 6), (6, 10)]
+    assert island_batches(island_starts, 10, 3) == [(0, 6), (6, 10)]
+    assert island_batches(island_starts, 10, 4) == [(0, 2), (2, 6), (6, 7), (7, 10)]
+    assert island_batches(np.array([0]), 10, 4) == [(0, 10)]
+
+
+def test_times_of_collision():
+    body_table = np.array(
+        [
+            (0, 0, 1, 0, 1),
+            (10, 0, -1, 0, 1),
+            (0, 10, 0, 0, 1),
+        ],
+        dtype=float,
+    )
+    times = times_of_collision(body_table, np.array([(0, 1), (0, 2)]))
+    assert times.tolist() == [4, -1]
+
+
+def test_shared_times_of_collision_match_the_local_ones():
+    body_table = np.random.default_rng(0).uniform(0, 10, (20, 5))
+    pairs = np.array([(i, (i * 7 + 3) % 20) for i in range(20)])
+    shared_memory = SharedMemory(create=True, size=8 * (5 * 20 + 3 * 20))
+    try:
+        shared_body_table, shared_pairs, shared_times = shared_arrays(
+            shared_memory.buf, 20, 20
+        )
+        shared_body_table[:] = body_table
+        shared_pairs[:] = pairs
+        shared_times[:] = -2
+        shared_times_of_collision(shared_memory.name, 20, 20, 5, 15)
+        times = shared_times.tolist()
+        del shared_body_table, shared_pairs, shared_times
+    finally:
+        shared_memory.close()
+        shared_memory.unlink()
+    local_times = times_of_collision(body_table, pairs).tolist()
+    assert times == [-2] * 5 + local_times[5:15] + [-2] * 5
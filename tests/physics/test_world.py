@@ -0,0 +1,370 @@
+import gc
+from multiprocessing.shared_memory import SharedMemory
+
+import pytest
+
+from gaming_framework.geometry.shape import Point2D, Rectangle
+from gaming_framework.physics.world import World
+from gaming_framework.spatial_structures.aabb_tree import AABBTree
+from gaming_framework.spatial_structures.hierarchical_hash import (
+    HierarchicalSpatialHash,
+)
+from gaming_framework.spatial_structures.linear_quadtree import LinearQuadTree
+from gaming_framework.spatial_structures.loose_quadtree import LooseQuadTree
+from gaming_framework.spatial_structures.quadtree import QuadTree
+from gaming_framework.spatial_structures.spatial_hash import SpatialHash
+from gaming_framework.spatial_structures.sweep_and_prune import SweepAndPrune
+
+
+def make_world(*bodies):
+    area = Rectangle(Point2D(0, 100), Point2D(100, 0))
+    spatial_hash = SpatialHash(area, 10, 10)
+    for body in bodies:
+        spatial_hash.insert(body)
+    return World(area, spatial_hash)
+
+
+def test_bodies_move_in_every_direction(make_body):
+    left, down = make_body(50, 50, Point2D(-10, 0)), make_body(20, 80, Point2D(0, -10))
+    world = make_world(left, down)
+    world.update(1)
+    assert left.position == Point2D(40, 50)
+    assert down.position == Point2D(20, 70)
+
+
+def test_swept_volume_covers_the_whole_movement(make_body):
+    body = make_body(50, 50, Point2D(-10, 5))
+    world = make_world(body)
+    world.update(1)
+    swept_volume = world._swept_volumes[body]
+    assert swept_volume.bounding_box == Rectangle(Point2D(39, 56), Point2D(51, 49))
+
+
+def test_movement_index_is_kept_across_frames(make_body):
+    body = make_body(50, 50, Point2D(10, 0))
+    world = make_world(body)
+    world.update(1)
+    movement_spatial_struct = world._movement_spatial_struct
+    swept_volume = world._swept_volumes[body]
+    world.update(1)
+    assert world._movement_spatial_struct is movement_spatial_struct
+    assert world._swept_volumes[body] is swept_volume
+    assert movement_spatial_struct.get_objects() == [swept_volume]
+    assert list(movement_spatial_struct.query(Point2D(70, 50))) == [swept_volume]
+
+
+@pytest.mark.parametrize(
+    "make_spatial_struct",
+    [
+        lambda area: QuadTree(area),
+        lambda area: SpatialHash(area, 10, 10),
+        lambda area: AABBTree(),
+        lambda area: SweepAndPrune(),
+        lambda area: HierarchicalSpatialHash(),
+        lambda area: LooseQuadTree(area),
+        lambda area: LinearQuadTree(area),
+    ],
+)
+def test_movement_index_is_updated_after_every_sweep(make_body, make_spatial_struct):
+    area = Rectangle(Point2D(0, 100), Point2D(100, 0))
+    body = make_body(10, 50, Point2D(20, 0))
+    spatial_struct = make_spatial_struct(area)
+    spatial_struct.insert(body)
+    world = World(area, spatial_struct)
+    for _ in range(3):
+        world.update(1)
+    swept_volume = world._swept_volumes[body]
+    movement_spatial_struct = world._movement_spatial_struct
+    assert swept_volume.bounding_box == Rectangle(Point2D(49, 51), Point2D(71, 49))
+    assert list(movement_spatial_struct.query(Point2D(70, 50))) == [swept_volume]
+    assert list(movement_spatial_struct.query(Point2D(20, 50))) == []
+
+
+def test_stopped_body_leaves_the_movement_index(make_body):
+    body = make_body(50, 50, Point2D(10, 0))
+    world = make_world(body)
+    world.update(1)
+    body.speed = Point2D(0, 0)
+    world.update(1)
+    assert world._swept_volumes == {}
+    assert world._movement_spatial_struct.get_objects() == []
+
+
+def test_moving_bodies_collide(make_body):
+    a, b = make_body(40, 50, Point2D(5, 0)), make_body(60, 50, Point2D(-5, 0))
+    world = make_world(a, b)
+    world.update(1)
+    world.update(1)
+    assert a.speed.x < 0 < b.speed.x
+
+
+def test_added_body_moves_and_removed_body_stops(make_body):
+    world = make_world()
+    body = make_body(50, 50, Point2D(10, 0))
+    world.add_body(body)
+    world.update(1)
+    assert body.position == Point2D(60, 50)
+    assert list(world.spatial_struct.query(Point2D(60, 50))) == [body]
+    world.remove_body(body)
+    world.update(1)
+    assert body.position == Point2D(60, 50)
+    assert world.spatial_struct.get_objects() == []
+
+
+def test_step_runs_fixed_updates_and_keeps_the_rest(make_body):
+    body = make_body(50, 50, Point2D(10, 0))
+    world = make_world(body)
+    world.time_step = 0.5
+    assert world.step(1.25) == 2
+    assert body.position == Point2D(60, 50)
+    assert world.alpha == 0.5
+    assert world.step(0.25) == 1
+    assert body.position == Point2D(65, 50)
+    assert world.alpha == 0
+
+
+def test_step_caps_the_substeps(make_body):
+    body = make_body(50, 50, Point2D(1, 0))
+    world = make_world(body)
+    world.time_step, world.max_substeps = 1, 3
+    assert world.step(10.5) == 3
+    assert body.position == Point2D(53, 50)
+    assert world.alpha == 0.5
+
+
+def test_interpolated_position_is_between_the_last_two_steps(make_body):
+    body = make_body(50, 50, Point2D(10, 0))
+    world = make_world(body)
+    world.time_step = 1
+    world.step(1.25)
+    assert body.position == Point2D(60, 50)
+    assert world.interpolated_position(body) == Point2D(52.5, 50)
+    assert world.interpolated_position(make_body(0, 0, Point2D(1, 0))) == (0, 0)
+
+
+def test_step_arguments_are_checked():
+    area = Rectangle(Point2D(0, 100), Point2D(100, 0))
+    with pytest.raises(ValueError):
+        World(area, SpatialHash(area), time_step=0)
+    with pytest.raises(ValueError):
+        World(area, SpatialHash(area), max_substeps=0)
+    with pytest.raises(ValueError):
+        World(area, SpatialHash(area), parallel_batch_size=0)
+
+
+def test_bodies_inserted_in_the_spatial_structure_are_moved(make_body):
+    body, late_body = make_body(50, 50, Point2D(10, 0)), make_body(
+        100, 100, Point2D(10, 0)
+    )
+    world = make_world(body)
+    world.spatial_struct.insert(late_body)
+    world.update(1)
+    assert late_body.position == Point2D(110, 100)
+    world.spatial_struct.remove(body)
+    world.update(1)
+    assert body.position == Point2D(60, 50)
+    assert body._state is None
+    assert late_body.position == Point2D(120, 100)
+
+
+def test_bodies_inserted_and_removed_between_updates_are_left_alone(make_body):
+    body, passing_body = make_body(50, 50), make_body(20, 20, Point2D(10, 0))
+    world = make_world(body)
+    world.spatial_struct.insert(passing_body)
+    world.spatial_struct.remove(passing_body)
+    world.update(1)
+    assert passing_body._state is None
+    assert passing_body.position == Point2D(20, 20)
+    assert world._state.bodies == [body]
+
+
+def test_only_moved_bodies_rebuild_their_collision_shape(make_body):
+    body = make_body(50, 50, Point2D(10, 0))
+    wall = make_body(20, 20, is_static=True)
+    world = make_world(body, wall)
+    bounding_box = wall.bounding_box
+    world._state.integrate(1, world._state.rows([body, wall]))
+    assert world._state.is_stale[body._index]
+    assert not world._state.is_stale[wall._index]
+    world.add_body(make_body(80, 80))
+    world.update(1)
+    assert body.bounding_box.center == Point2D(70, 50)
+    assert not world._state.is_stale[body._index]
+    assert wall.bounding_box is bounding_box
+
+
+def test_slow_body_falls_asleep_and_stops(make_body):
+    body = make_body(50, 50, Point2D(0.1, 0))
+    world = make_world(body)
+    world.sleep_speed, world.sleep_frames = 0.5, 3
+    for _ in range(2):
+        world.update(1)
+    assert not body.is_sleeping
+    assert body.position == Point2D(50.2, 50)
+    world.update(1)
+    assert body.is_sleeping
+    assert body.speed == Point2D(0, 0)
+    assert body.position == Point2D(50.2, 50)
+    assert world._swept_volumes == {}
+
+
+def test_impulse_wakes_a_sleeping_body(make_body):
+    body = make_body(50, 50, Point2D(0, 0))
+    body.mass = 2
+    world = make_world(body)
+    world.sleep_speed, world.sleep_frames = 0.5, 1
+    world.update(1)
+    assert body.is_sleeping
+    body.apply_impulse(Point2D(20, 0))
+    assert not body.is_sleeping
+    world.update(1)
+    assert body.position == Point2D(60, 50)
+
+
+def test_moving_neighbour_wakes_a_sleeping_body(make_body):
+    # the swept corner of the moving body reaches the sleeping one, the
+    # bodies themselves never touch
+    sleeping = make_body(50, 50, Point2D(0, 0), radius=1.5)
+    sleeping.acceleration = Point2D(0, -0.1)
+    sleeping.is_sleeping = True
+    moving = make_body(46, 46, Point2D(2, 2))
+    world = make_world(sleeping, moving)
+    world.sleep_speed = 1
+    world.update(1)
+    assert not sleeping.is_sleeping
+    assert sleeping.position == Point2D(50, 50)
+    moving.speed = Point2D(-2, -2)
+    world.update(1)
+    assert sleeping.position == Point2D(50, 49.9)
+
+
+def test_bodies_do_not_sleep_unless_a_sleep_speed_is_set(make_body):
+    body = make_body(50, 50, Point2D(0, 0))
+    world = make_world(body)
+    for _ in range(61):
+        world.update(1)
+    assert not body.is_sleeping
+
+
+def test_setting_the_speed_wakes_a_sleeping_body(make_body):
+    body = make_body(100, 100, Point2D(0, 0))
+    world = make_world(body)
+    world.sleep_speed = 0
+    for _ in range(61):
+        world.update(1)
+    assert body.is_sleeping
+    body.speed = Point2D(1, 0)
+    assert not body.is_sleeping
+    for _ in range(10):
+        world.update(1)
+    assert body.position == Point2D(110, 100)
+
+
+def test_setting_the_acceleration_or_the_position_wakes_a_sleeping_body(make_body):
+    body = make_body(50, 50, Point2D(0, 0))
+    world = make_world(body)
+    world.sleep_speed, world.sleep_frames = 0, 1
+    world.update(1)
+    assert body.is_sleeping
+    body.acceleration = Point2D(1, 0)
+    assert not body.is_sleeping
+    world.update(1)
+    assert body.position == Point2D(51, 50)
+    body.acceleration = body.speed = Point2D(0, 0)
+    world.update(1)
+    assert body.is_sleeping
+    body.move_to(Point2D(20, 20))
+    assert not body.is_sleeping
+
+
+def test_contact_wakes_a_sleeping_body(make_body):
+    sleeping, moving = make_body(50, 50, Point2D(0, 0)), make_body(
+        45, 50, Point2D(5, 0)
+    )
+    sleeping.is_sleeping = True
+    world = make_world(sleeping, moving)
+    world.update(1)
+    assert not sleeping.is_sleeping
+    assert sleeping.speed.x > 0
+
+
+def test_times_of_collision_computed_by_workers_match_the_serial_ones(make_body):
+    def simulate(workers):
+        # two islands and a pair, split in batches for the workers
+        bodies = [
+            make_body(48, 50, Point2D(2, 0)),
+            make_body(52, 50, Point2D(-2, 0)),
+            make_body(50, 53, Point2D(0, -2)),
+            make_body(10, 10, Point2D(2, 0)),
+            make_body(14, 10, Point2D(-2, 0)),
+            make_body(12, 13, Point2D(0, -2)),
+            make_body(80, 80, Point2D(2, 0)),
+            make_body(84, 80, Point2D(-2, 0)),
+        ]
+        with make_world(*bodies) as world:
+            world.workers, world.parallel_batch_size = workers, 1
+            for _ in range(3):
+                world.update(1)
+            used_pool = world._pool is not None
+        assert world._pool is None
+        return used_pool, [(body.position, body.speed) for body in bodies]
+
+    used_pool, parallel_results = simulate(2)
+    assert used_pool
+    assert parallel_results == simulate(0)[1]
+
+
+def test_pool_is_closed_when_the_world_is_collected(make_body):
+    world = make_world(
+        make_body(48, 50, Point2D(2, 0)),
+        make_body(52, 50, Point2D(-2, 0)),
+        make_body(10, 10, Point2D(2, 0)),
+        make_body(14, 10, Point2D(-2, 0)),
+    )
+    world.workers, world.parallel_batch_size = 1, 1
+    world.update(1)
+    pool = world._pool
+    shared_memory_name = pool.shared_memory.name
+    del world
+    gc.collect()
+    assert pool.shared_memory is None
+    with pytest.raises(FileNotFoundError):
+        SharedMemory(name=shared_memory_name)
+
+
+@pytest.mark.parametrize(
+    "structure", ["quadtree", "loose_quadtree", "spatial_hash", "sweep_and_prune"]
+)
+def test_results_do_not_depend_on_where_bodies_are_allocated(make_body, structure):
+    def simulate(allocation_pattern):
+        # objects kept alive between the bodies move them around in memory
+        padding = []
+        area = Rectangle(Point2D(0, 100), Point2D(100, 0))
+        if structure == "quadtree":
+            spatial_struct = QuadTree(area, max_objects=2, max_depth=4)
+        elif structure == "loose_quadtree":
+            spatial_struct = LooseQuadTree(area)
+        elif structure == "sweep_and_prune":
+            spatial_struct = SweepAndPrune()
+        else:
+            spatial_struct = SpatialHash(area, 10, 10)
+        bodies = []
+        for i in range(40):
+            padding.extend(object() for _ in range(allocation_pattern[i % 5]))
+            body = make_body(
+                10 + (i % 8) * 11,
+                10 + (i // 8) * 17,
+                Point2D(7 * ((i * 3) % 5 - 2), 5 * ((i * 7) % 5 - 2)),
+                radius=3,
+                mass=1 + i % 3,
+            )
+            bodies.append(body)
+            spatial_struct.insert(body)
+        world = World(area, spatial_struct)
+        for _ in range(10):
+            world.update(0.5)
+        return [(body.position, body.speed) for body in bodies]
+
+    results = simulate([0, 0, 0, 0, 0])
+    for allocation_pattern in ([1, 0, 3, 0, 2], [7, 1, 0, 5, 0], [0, 20, 0, 0, 9]):
+        assert simulate(allocation_pattern) == results
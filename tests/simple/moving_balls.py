@@ -47,10 +47,8 @@ class Ball(CollisionHandler):
         if position != self.body.position:
             self.body.move_to(position)
 
-    def draw(self, screen):
-        pygame.draw.circle(
-            screen, self.color, self.body.position, self.body.shape.radius, 1
-        )
+    def draw(self, screen, position):
+        pygame.draw.circle(screen, self.color, position, self.body.shape.radius, 1)
 
 
 area = Rectangle(Point2D(0, height), Point2D(width, 0))
@@ -81,7 +79,7 @@ bodies = [
 balls = [Ball(body) for body in bodies]
 
 for body in bodies:
-    quadtree.insert(body)
+    world.add_body(body)
 
 
 pygame.init()
@@ -100,11 +98,11 @@ while True:
         if event.type == pygame.QUIT:
             sys.exit()
 
-    world.update(delta_time)
+    world.step(delta_time)
     for ball in balls:
         ball.update(delta_time)
 
     screen.fill((0, 0, 0))
     for ball in balls:
-        ball.draw(screen)
+        ball.draw(screen, world.interpolated_position(ball.body))
     pygame.display.flip()
@@ -33,10 +33,8 @@ class Ball(CollisionHandler):
     def update(self, delta_time):
         ...
 
-    def draw(self, screen):
-        pygame.draw.circle(
-            screen, self.color, self.body.position, self.body.shape.radius, 1
-        )
+    def draw(self, screen, position):
+        pygame.draw.circle(screen, self.color, position, self.body.shape.radius, 1)
 
 
 class Wall(CollisionHandler):
@@ -75,8 +73,8 @@ wall_body = Body(wall_collision_shape, is_static=True)
 wall = Wall(wall_body)
 
 
-quadtree.insert(ball_body)
-quadtree.insert(wall_body)
+world.add_body(ball_body)
+world.add_body(wall_body)
 
 
 pygame.init()
@@ -95,12 +93,12 @@ while True:
         if event.type == pygame.QUIT:
             sys.exit()
 
-    world.update(delta_time)
+    world.step(delta_time)
     ball.update(delta_time)
     wall.update(delta_time)
 
     screen.fill((0, 0, 0))
-    ball.draw(screen)
+    ball.draw(screen, world.interpolated_position(ball.body))
     wall.draw(screen)
 
     pygame.display.flip()
@@ -0,0 +1,80 @@
+from gaming_framework.geometry.shape import Circle, Line2D, Point2D, Rectangle
+from gaming_framework.spatial_structures.aabb_tree import AABBTree
+
+
+def test_query_finds_bodies_of_mixed_sizes_anywhere(make_body):
+    aabb_tree = AABBTree()
+    bullet = make_body(-5000, 3000, radius=1)
+    terrain = make_body(10000, -10000, radius=2000)
+    aabb_tree.insert(bullet)
+    aabb_tree.insert(terrain)
+    assert list(aabb_tree.query(Circle(Point2D(-5000, 3000), 2))) == [bullet]
+    assert list(aabb_tree.query(Point2D(11000, -11000))) == [terrain]
+
+
+def test_moved_body_is_relocated(make_body):
+    aabb_tree = AABBTree()
+    body = make_body(0, 0)
+    aabb_tree.insert(body)
+    body.move_to(Point2D(100, 100))
+    assert list(aabb_tree.query(Circle(Point2D(0, 0), 1))) == []
+    assert list(aabb_tree.query(Circle(Point2D(100, 100), 1))) == [body]
+
+
+def test_small_move_keeps_fattened_leaf(make_body):
+    aabb_tree = AABBTree(margin=1)
+    body = make_body(0, 0)
+    aabb_tree.insert(body)
+    extents = aabb_tree._leaves[body].extents
+    body.move_to(Point2D(0.5, 0.5))
+    assert aabb_tree._leaves[body].extents == extents
+
+
+def test_tree_stays_balanced_for_sorted_insertions(make_body):
+    aabb_tree = AABBTree()
+    for i in range(256):
+        aabb_tree.insert(make_body(i * 10, 0))
+    assert aabb_tree._root.height <= 16
+
+
+def test_removed_body_is_not_found(make_body):
+    aabb_tree = AABBTree()
+    bodies = [make_body(i * 10, 0) for i in range(10)]
+    for body in bodies:
+        aabb_tree.insert(body)
+    aabb_tree.remove(bodies[3])
+    area = Rectangle(Point2D(-10, 10), Point2D(100, -10))
+    assert set(aabb_tree.query(area)) == set(bodies) - {bodies[3]}
+
+
+def test_query_pairs_returns_overlapping_pairs_once(make_body):
+    aabb_tree = AABBTree()
+    a, b, c = make_body(0, 0), make_body(1.5, 0), make_body(10, 0)
+    for body in (a, b, c):
+        aabb_tree.insert(body)
+    pairs = list(aabb_tree.query_pairs())
+    assert len(pairs) == 1
+    assert set(pairs[0]) == {a, b}
+
+
+def test_nearest_returns_closest_bodies_in_order(make_body):
+    aabb_tree = AABBTree()
+    bodies = [make_body(x, 50) for x in (10, 42, 55, 90)]
+    for body in bodies:
+        aabb_tree.insert(body)
+    assert aabb_tree.nearest(Point2D(50, 50), k=2) == [bodies[2], bodies[1]]
+    assert aabb_tree.nearest(Point2D(50, 50), k=4, max_distance=30) == [
+        bodies[2],
+        bodies[1],
+    ]
+
+
+def test_zero_length_casts_hit_bodies_containing_the_origin(make_body):
+    aabb_tree = AABBTree()
+    body = make_body(50, 50, radius=2)
+    aabb_tree.insert(body)
+    hit = aabb_tree.segment_cast(Line2D(Point2D(51, 50), Point2D(51, 50)))
+    assert (hit.object, hit.distance, hit.point) == (body, 0, Point2D(51, 50))
+    assert aabb_tree.raycast(Point2D(50, 51), Point2D(0, 0)).object is body
+    assert aabb_tree.raycast(Point2D(20, 20), Point2D(0, 0)) is None
+    assert aabb_tree.segment_cast_all(Line2D(Point2D(20, 20), Point2D(20, 20))) == []
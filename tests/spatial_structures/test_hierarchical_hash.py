@@ -0,0 +1,66 @@
+from gaming_framework.geometry.shape import Circle, Point2D, Rectangle
+from gaming_framework.physics.body import Body
+from gaming_framework.physics.collision_shape import CollisionShape
+from gaming_framework.spatial_structures.hierarchical_hash import (
+    HierarchicalSpatialHash,
+)
+
+
+def make_terrain(x, y, size=2000):
+    top_left = Point2D(x - size / 2, y + size / 2)
+    bottom_right = Point2D(x + size / 2, y - size / 2)
+    return Body(CollisionShape(Rectangle(top_left, bottom_right)))
+
+
+def test_objects_go_to_the_level_matching_their_size(make_body):
+    spatial_hash = HierarchicalSpatialHash(min_cell_size=8, level_ratio=4)
+    bullet, terrain = make_body(0, 0), make_terrain(0, 0)
+    spatial_hash.insert(bullet)
+    spatial_hash.insert(terrain)
+    levels = spatial_hash._levels
+    assert bullet in levels[0].get_objects()
+    assert terrain in levels[-1].get_objects()
+    assert len(levels[-1]._object_hashes[terrain]) <= 4
+
+
+def test_query_spans_levels(make_body):
+    spatial_hash = HierarchicalSpatialHash()
+    bullet, terrain = make_body(900, 900), make_terrain(0, 0)
+    spatial_hash.insert(bullet)
+    spatial_hash.insert(terrain)
+    found = set(spatial_hash.query(Circle(Point2D(900, 900), 2)))
+    assert found == {bullet, terrain}
+
+
+def test_query_pairs_across_levels(make_body):
+    spatial_hash = HierarchicalSpatialHash()
+    a, b, far = make_body(10, 10), make_body(11, 10), make_body(5000, 5000)
+    terrain = make_terrain(0, 0, size=100)
+    for body in (a, b, far, terrain):
+        spatial_hash.insert(body)
+    pairs = {frozenset(pair) for pair in spatial_hash.query_pairs()}
+    assert pairs == {
+        frozenset((a, b)),
+        frozenset((a, terrain)),
+        frozenset((b, terrain)),
+    }
+
+
+def test_moves_and_removal(make_body):
+    spatial_hash = HierarchicalSpatialHash()
+    body = make_body(0, 0)
+    spatial_hash.insert(body)
+    body.move_to(Point2D(300, 300))
+    assert list(spatial_hash.query(Circle(Point2D(300, 300), 1))) == [body]
+    spatial_hash.remove(body)
+    assert spatial_hash.get_objects() == []
+    assert list(spatial_hash.query(Circle(Point2D(300, 300), 1))) == []
+
+
+def test_raycast_merges_levels(make_body):
+    spatial_hash = HierarchicalSpatialHash()
+    bullet, terrain = make_body(50, 0), make_terrain(500, 0, size=100)
+    spatial_hash.insert(terrain)
+    spatial_hash.insert(bullet)
+    hits = spatial_hash.raycast_all(Point2D(0, 0), Point2D(1, 0))
+    assert [hit.object for hit in hits] == [bullet, terrain]
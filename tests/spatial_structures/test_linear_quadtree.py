@@ -0,0 +1,70 @@
+import numpy as np
+
+from gaming_framework.geometry.shape import Circle, Point2D, Rectangle
+from gaming_framework.spatial_structures.linear_quadtree import (
+    LinearQuadTree,
+    morton_codes,
+)
+
+
+def make_linear_quadtree(objects=None):
+    return LinearQuadTree(
+        Rectangle(Point2D(0, 100), Point2D(100, 0)), depth=4, objects=objects or []
+    )
+
+
+def test_morton_codes_interleave_the_coordinates():
+    codes = morton_codes(np.array([0, 1, 0, 1, 2, 3]), np.array([0, 0, 1, 1, 0, 3]))
+    assert list(codes) == [0, 1, 2, 3, 4, 15]
+
+
+def test_bulk_build(make_body):
+    bodies = [make_body(x, y) for x in range(5, 100, 10) for y in range(5, 100, 10)]
+    linear_quadtree = make_linear_quadtree(bodies)
+    assert len(linear_quadtree.get_objects()) == 100
+    assert list(linear_quadtree.query(Circle(Point2D(25, 25), 1))) == [bodies[22]]
+
+
+def test_body_on_a_split_line_goes_to_the_parent_node(make_body):
+    linear_quadtree = make_linear_quadtree()
+    small, straddling = make_body(10, 10), make_body(50, 50)
+    linear_quadtree.insert(small)
+    linear_quadtree.insert(straddling)
+    assert list(linear_quadtree.query(Circle(Point2D(49, 49), 1))) == [straddling]
+    levels = dict(zip(linear_quadtree._order, linear_quadtree._levels))
+    assert levels[1] == 0
+    assert levels[0] > 0
+
+
+def test_moved_body_is_found_at_its_new_position(make_body):
+    linear_quadtree = make_linear_quadtree()
+    body = make_body(10, 10)
+    linear_quadtree.insert(body)
+    assert list(linear_quadtree.query(Circle(Point2D(10, 10), 1))) == [body]
+    body.move_to(Point2D(90, 90))
+    assert list(linear_quadtree.query(Circle(Point2D(10, 10), 1))) == []
+    assert list(linear_quadtree.query(Circle(Point2D(90, 90), 1))) == [body]
+
+
+def test_body_outside_of_the_bounds_is_kept_in_the_root(make_body):
+    linear_quadtree = make_linear_quadtree()
+    body = make_body(500, 500)
+    linear_quadtree.insert(body)
+    assert list(linear_quadtree.query(Circle(Point2D(500, 500), 1))) == [body]
+
+
+def test_query_pairs_across_nodes(make_body):
+    a, b, c = make_body(49.5, 49.5), make_body(50.5, 50.5), make_body(80, 20)
+    linear_quadtree = make_linear_quadtree([a, b, c])
+    pairs = list(linear_quadtree.query_pairs())
+    assert len(pairs) == 1
+    assert set(pairs[0]) == {a, b}
+
+
+def test_remove(make_body):
+    bodies = [make_body(10, 10), make_body(20, 20), make_body(30, 30)]
+    linear_quadtree = make_linear_quadtree(bodies)
+    linear_quadtree.remove(bodies[0])
+    assert set(linear_quadtree.get_objects()) == set(bodies[1:])
+    assert list(linear_quadtree.query(Circle(Point2D(10, 10), 1))) == []
+    assert list(linear_quadtree.query(Circle(Point2D(30, 30), 1))) == [bodies[2]]
@@ -0,0 +1,67 @@
+import pytest
+
+from gaming_framework.geometry.shape import Circle, Point2D, Rectangle
+from gaming_framework.spatial_structures.loose_quadtree import LooseQuadTree
+
+
+def make_loose_quadtree():
+    return LooseQuadTree(Rectangle(Point2D(0, 100), Point2D(100, 0)))
+
+
+def test_looseness_must_enlarge_the_nodes():
+    with pytest.raises(ValueError):
+        LooseQuadTree(Rectangle(Point2D(0, 100), Point2D(100, 0)), looseness=1)
+
+
+def test_body_on_a_split_line_is_stored_once(make_body):
+    loose_quadtree = make_loose_quadtree()
+    body = make_body(50, 50)
+    loose_quadtree.insert(body)
+    node = loose_quadtree._nodes[body]
+    assert node.depth > 0
+    assert list(loose_quadtree.query(Circle(Point2D(49, 49), 1))) == [body]
+
+
+def test_large_bodies_stay_near_the_root(make_body):
+    loose_quadtree = make_loose_quadtree()
+    small, large = make_body(10, 10), make_body(30, 30, radius=40)
+    loose_quadtree.insert(small)
+    loose_quadtree.insert(large)
+    assert loose_quadtree._nodes[large].depth < loose_quadtree._nodes[small].depth
+
+
+def test_moved_body_is_relocated_and_empty_nodes_are_dropped(make_body):
+    loose_quadtree = make_loose_quadtree()
+    body = make_body(10, 10)
+    loose_quadtree.insert(body)
+    body.move_to(Point2D(90, 90))
+    assert list(loose_quadtree.query(Circle(Point2D(10, 10), 1))) == []
+    assert list(loose_quadtree.query(Circle(Point2D(90, 90), 1))) == [body]
+    assert loose_quadtree._root.children.count(None) == 3
+
+
+def test_body_outside_of_the_bounds_is_kept_in_the_root(make_body):
+    loose_quadtree = make_loose_quadtree()
+    body = make_body(500, 500)
+    loose_quadtree.insert(body)
+    assert loose_quadtree._nodes[body] is loose_quadtree._root
+    assert list(loose_quadtree.query(Circle(Point2D(500, 500), 1))) == [body]
+
+
+def test_query_pairs_across_nodes(make_body):
+    loose_quadtree = make_loose_quadtree()
+    a, b, c = make_body(49.5, 49.5), make_body(50.5, 50.5), make_body(80, 20)
+    for body in (a, b, c):
+        loose_quadtree.insert(body)
+    pairs = list(loose_quadtree.query_pairs())
+    assert len(pairs) == 1
+    assert set(pairs[0]) == {a, b}
+
+
+def test_remove(make_body):
+    loose_quadtree = make_loose_quadtree()
+    body = make_body(10, 10)
+    loose_quadtree.insert(body)
+    loose_quadtree.remove(body)
+    assert loose_quadtree.get_objects() == []
+    assert loose_quadtree._root.size == 0
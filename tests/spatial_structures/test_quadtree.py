@@ -0,0 +1,140 @@
+from gaming_framework.geometry.shape import Line2D, Point2D, Rectangle
+from gaming_framework.spatial_structures.quadtree import QuadTree
+
+
+def make_quadtree(max_objects=4):
+    return QuadTree(Rectangle(Point2D(0, 100), Point2D(100, 0)), max_objects)
+
+
+def test_query_finds_inserted_body(make_body):
+    quadtree = make_quadtree()
+    body = make_body(10, 10)
+    quadtree.insert(body)
+    area = Rectangle(Point2D(0, 20), Point2D(20, 0))
+    assert body in list(quadtree.query(area))
+
+
+def test_moved_body_is_relocated(make_body):
+    quadtree = make_quadtree(max_objects=1)
+    bodies = [make_body(10, 10), make_body(90, 90), make_body(90, 10)]
+    for body in bodies:
+        quadtree.insert(body)
+    body = bodies[0]
+    body.move_to(Point2D(10, 90))
+    old_area = Rectangle(Point2D(0, 20), Point2D(20, 0))
+    new_area = Rectangle(Point2D(0, 100), Point2D(20, 80))
+    assert body not in list(quadtree.query(old_area))
+    assert body in list(quadtree.query(new_area))
+
+
+def test_removed_body_is_no_longer_relocated(make_body):
+    quadtree = make_quadtree()
+    body = make_body(10, 10)
+    quadtree.insert(body)
+    quadtree.remove(body)
+    body.move_to(Point2D(50, 50))
+    assert body not in list(quadtree.query(quadtree.bounds))
+    assert body not in quadtree.get_objects()
+
+
+def test_query_returns_each_body_once(make_body):
+    quadtree = make_quadtree(max_objects=1)
+    bodies = [make_body(50, 50, radius=20), make_body(10, 10), make_body(90, 90)]
+    for body in bodies:
+        quadtree.insert(body)
+    found = list(quadtree.query(quadtree.bounds))
+    assert len(found) == len(bodies)
+    assert set(found) == set(bodies)
+
+
+def test_children_merge_back_after_removal(make_body):
+    quadtree = make_quadtree(max_objects=2)
+    bodies = [make_body(10 * i + 5, 10 * i + 5) for i in range(8)]
+    for body in bodies:
+        quadtree.insert(body)
+    assert quadtree.children
+    for body in bodies[1:]:
+        quadtree.remove(body)
+    assert not quadtree.children
+    assert list(quadtree.objects) == [bodies[0]]
+
+
+def test_relocation_matches_fresh_insertion(make_body):
+    quadtree = make_quadtree(max_objects=2)
+    bodies = [make_body(7 * i % 100, 13 * i % 100, radius=2) for i in range(40)]
+    for body in bodies:
+        quadtree.insert(body)
+    for i, body in enumerate(bodies):
+        body.move_to(Point2D(11 * i % 100, 3 * i % 100))
+    area = Rectangle(Point2D(20, 60), Point2D(60, 20))
+    expected = {body for body in bodies if body.bounding_box.collides_with(area)}
+    assert set(quadtree.query(area)) == expected
+
+
+def test_query_pairs_returns_overlapping_pairs_once(make_body):
+    quadtree = make_quadtree(max_objects=2)
+    a, b, c = make_body(50, 50, radius=15), make_body(60, 60, 15), make_body(5, 95)
+    for body in (a, b, c):
+        quadtree.insert(body)
+    pairs = list(quadtree.query_pairs())
+    assert len(pairs) == 1
+    assert set(pairs[0]) == {a, b}
+
+
+def test_query_pairs_between_uses_both_structures(make_body):
+    quadtree = make_quadtree(max_objects=2)
+    other_quadtree = quadtree.empty_copy()
+    a, b, c = make_body(50, 50, radius=15), make_body(60, 60, 15), make_body(5, 95)
+    quadtree.insert(a)
+    other_quadtree.insert(b)
+    other_quadtree.insert(c)
+    assert list(quadtree.query_pairs_between(other_quadtree)) == [(a, b)]
+
+
+def test_raycast_returns_nearest_hit(make_body):
+    quadtree = make_quadtree(max_objects=1)
+    bodies = [make_body(x, 50) for x in (90, 30, 60)]
+    for body in bodies:
+        quadtree.insert(body)
+    hit = quadtree.raycast(Point2D(100, 50), Point2D(-1, 0))
+    assert hit.object is bodies[0]
+    assert abs(hit.distance - 9) < 1e-9
+    hits = quadtree.raycast_all(Point2D(100, 50), Point2D(-1, 0))
+    assert [hit.object for hit in hits] == [bodies[0], bodies[2], bodies[1]]
+
+
+def test_segment_cast_misses_bodies_past_its_end(make_body):
+    quadtree = make_quadtree()
+    quadtree.insert(make_body(50, 50))
+    assert quadtree.segment_cast(Line2D(Point2D(0, 0), Point2D(40, 40))) is None
+
+
+def test_zero_length_casts_hit_bodies_containing_the_origin(make_body):
+    quadtree = make_quadtree()
+    body = make_body(50, 50, radius=2)
+    quadtree.insert(body)
+    hit = quadtree.segment_cast(Line2D(Point2D(51, 50), Point2D(51, 50)))
+    assert (hit.object, hit.distance, hit.point) == (body, 0, Point2D(51, 50))
+    assert quadtree.raycast(Point2D(50, 51), Point2D(0, 0)).object is body
+    assert quadtree.raycast(Point2D(20, 20), Point2D(0, 0)) is None
+    assert quadtree.segment_cast_all(Line2D(Point2D(20, 20), Point2D(20, 20))) == []
+
+
+def test_nearest_returns_closest_bodies_in_order(make_body):
+    quadtree = make_quadtree(max_objects=1)
+    bodies = [make_body(x, 50) for x in (10, 42, 55, 90)]
+    for body in bodies:
+        quadtree.insert(body)
+    assert quadtree.nearest(Point2D(50, 50), k=2) == [bodies[2], bodies[1]]
+    assert quadtree.nearest(Point2D(50, 50), k=4, max_distance=30) == [
+        bodies[2],
+        bodies[1],
+    ]
+
+
+def test_within_radius_measures_to_the_shape(make_body):
+    quadtree = make_quadtree(max_objects=1)
+    near, far = make_body(50, 56, radius=2), make_body(60, 60, radius=2)
+    quadtree.insert(near)
+    quadtree.insert(far)
+    assert quadtree.within_radius(Point2D(50, 50), 4) == [near]
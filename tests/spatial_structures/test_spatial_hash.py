@@ -0,0 +1,191 @@
+import pytest
+
+from gaming_framework.geometry.shape import Circle, Line2D, Point2D, Polygon, Rectangle
+from gaming_framework.spatial_structures.spatial_hash import ShapeHash, SpatialHash
+
+
+def make_spatial_hash():
+    return SpatialHash(Rectangle(Point2D(0, 100), Point2D(100, 0)), 10, 10)
+
+
+def test_query_finds_inserted_body(make_body):
+    spatial_hash = make_spatial_hash()
+    body = make_body(15, 15)
+    spatial_hash.insert(body)
+    assert body in list(spatial_hash.query(Circle(Point2D(15, 15), 1)))
+
+
+def test_moved_body_is_relocated(make_body):
+    spatial_hash = make_spatial_hash()
+    body = make_body(15, 15)
+    spatial_hash.insert(body)
+    body.move_to(Point2D(85, 85))
+    assert body not in list(spatial_hash.query(Circle(Point2D(15, 15), 1)))
+    assert body in list(spatial_hash.query(Circle(Point2D(85, 85), 1)))
+
+
+def test_removed_body_is_no_longer_relocated(make_body):
+    spatial_hash = make_spatial_hash()
+    body = make_body(15, 15)
+    spatial_hash.insert(body)
+    spatial_hash.remove(body)
+    body.move_to(Point2D(85, 85))
+    assert body not in list(spatial_hash.query(Circle(Point2D(85, 85), 1)))
+    assert body not in list(spatial_hash.get_objects())
+
+
+def test_query_returns_each_body_once(make_body):
+    spatial_hash = make_spatial_hash()
+    body = make_body(50, 50, radius=25)
+    spatial_hash.insert(body)
+    assert list(spatial_hash.query(Circle(Point2D(50, 50), 25))) == [body]
+
+
+def test_removed_body_leaves_no_empty_cells(make_body):
+    spatial_hash = make_spatial_hash()
+    body = make_body(50, 50, radius=25)
+    spatial_hash.insert(body)
+    spatial_hash.remove(body)
+    assert spatial_hash._map == {}
+
+
+def test_query_pairs_returns_overlapping_pairs_once(make_body):
+    spatial_hash = make_spatial_hash()
+    a, b, c = make_body(50, 50, radius=15), make_body(60, 60, 15), make_body(5, 95)
+    for body in (a, b, c):
+        spatial_hash.insert(body)
+    pairs = list(spatial_hash.query_pairs())
+    assert len(pairs) == 1
+    assert set(pairs[0]) == {a, b}
+
+
+def test_query_pairs_between_uses_both_structures(make_body):
+    spatial_hash = make_spatial_hash()
+    other_hash = spatial_hash.empty_copy()
+    a, b, c = make_body(50, 50, radius=15), make_body(60, 60, 15), make_body(5, 95)
+    spatial_hash.insert(a)
+    other_hash.insert(b)
+    other_hash.insert(c)
+    assert list(spatial_hash.query_pairs_between(other_hash)) == [(a, b)]
+
+
+def test_raycast_returns_nearest_hit(make_body):
+    spatial_hash = make_spatial_hash()
+    near, far = make_body(51, 51, radius=2), make_body(80, 50)
+    spatial_hash.insert(far)
+    spatial_hash.insert(near)
+    hit = spatial_hash.raycast(Point2D(5, 50), Point2D(1, 0))
+    assert hit.object is near
+    assert abs(hit.distance - (46 - 3**0.5)) < 1e-9
+    assert hit.point.y == 50
+
+
+def test_raycast_all_is_sorted_and_limited(make_body):
+    spatial_hash = make_spatial_hash()
+    bodies = [make_body(x, 50) for x in (70, 20, 45, 95)]
+    for body in bodies:
+        spatial_hash.insert(body)
+    hits = spatial_hash.raycast_all(Point2D(0, 50), Point2D(1, 0), max_distance=80)
+    assert [hit.object for hit in hits] == [bodies[1], bodies[2], bodies[0]]
+
+
+def test_zero_length_casts_hit_bodies_containing_the_origin(make_body):
+    spatial_hash = make_spatial_hash()
+    body = make_body(50, 50, radius=2)
+    spatial_hash.insert(body)
+    hit = spatial_hash.segment_cast(Line2D(Point2D(51, 50), Point2D(51, 50)))
+    assert (hit.object, hit.distance, hit.point) == (body, 0, Point2D(51, 50))
+    assert spatial_hash.raycast(Point2D(50, 51), Point2D(0, 0)).object is body
+    assert spatial_hash.raycast(Point2D(20, 20), Point2D(0, 0)) is None
+    assert spatial_hash.segment_cast_all(Line2D(Point2D(20, 20), Point2D(20, 20))) == []
+
+
+def test_segment_cast_walks_diagonals_backwards(make_body):
+    spatial_hash = make_spatial_hash()
+    body = make_body(20, 20)
+    spatial_hash.insert(body)
+    assert (
+        spatial_hash.segment_cast(Line2D(Point2D(90, 90), Point2D(10, 10))).object
+        is body
+    )
+    assert spatial_hash.segment_cast(Line2D(Point2D(90, 90), Point2D(30, 30))) is None
+
+
+def test_nearest_returns_closest_bodies_in_order(make_body):
+    spatial_hash = make_spatial_hash()
+    bodies = [make_body(x, 50) for x in (10, 42, 55, 90)]
+    for body in bodies:
+        spatial_hash.insert(body)
+    assert spatial_hash.nearest(Point2D(50, 50), k=2) == [bodies[2], bodies[1]]
+    assert spatial_hash.nearest(Point2D(50, 50), k=4, max_distance=30) == [
+        bodies[2],
+        bodies[1],
+    ]
+
+
+def test_within_radius_measures_to_the_shape(make_body):
+    spatial_hash = make_spatial_hash()
+    near, far = make_body(50, 56, radius=2), make_body(60, 60, radius=2)
+    spatial_hash.insert(near)
+    spatial_hash.insert(far)
+    assert spatial_hash.within_radius(Point2D(50, 50), 4) == [near]
+
+
+def make_shape_hash():
+    return ShapeHash(Rectangle(Point2D(0, 100), Point2D(100, 0)), 10, 10)
+
+
+def test_diagonal_line_covers_only_crossed_cells():
+    cells = make_shape_hash().visit(Line2D(Point2D(5, 95), Point2D(95, 5)))
+    assert sorted(cells)[:3] == [(0, 0), (0, 1), (1, 0)]
+    assert len(cells) == len(set(cells)) == 28
+
+
+def test_circle_skips_the_corners_of_its_square():
+    cells = make_shape_hash().visit(Circle(Point2D(50, 50), 25))
+    assert (2, 2) not in cells
+    assert (5, 2) in cells
+    assert len(cells) < 36
+
+
+def test_polygon_covers_outline_and_inside():
+    triangle = Polygon([Point2D(5, 5), Point2D(95, 5), Point2D(5, 95)])
+    cells = set(make_shape_hash().visit(triangle))
+    assert (2, 6) in cells
+    assert (8, 1) not in cells
+
+
+def test_query_with_line_and_polygon(make_body):
+    spatial_hash = make_spatial_hash()
+    body = make_body(50, 50)
+    spatial_hash.insert(body)
+    assert list(spatial_hash.query(Line2D(Point2D(0, 0), Point2D(100, 100)))) == [body]
+    triangle = Polygon([Point2D(60, 60), Point2D(90, 60), Point2D(90, 90)])
+    assert list(spatial_hash.query(triangle)) == []
+
+
+def test_unbounded_hash_needs_a_cell_size():
+    with pytest.raises(ValueError):
+        SpatialHash()
+
+
+def test_unbounded_hash_works_anywhere(make_body):
+    spatial_hash = SpatialHash(cell_size=10)
+    far_away = make_body(-12345, 67890)
+    spatial_hash.insert(far_away)
+    assert list(spatial_hash.query(Circle(Point2D(-12345, 67890), 1))) == [far_away]
+    far_away.move_to(Point2D(5, 5))
+    assert list(spatial_hash.query(Circle(Point2D(5, 5), 1))) == [far_away]
+    assert spatial_hash.raycast(Point2D(-100, 5), Point2D(1, 0)).object is far_away
+
+
+def test_unbounded_hash_reclaims_empty_cells(make_body):
+    spatial_hash = SpatialHash(cell_size=10)
+    body = make_body(5, 5)
+    spatial_hash.insert(body)
+    for x in range(0, 10000, 10):
+        body.move_to(Point2D(x + 5, 5))
+    assert len(spatial_hash._map) <= 4
+    spatial_hash.remove(body)
+    assert spatial_hash._map == {}
+    assert spatial_hash.nearest(Point2D(0, 0)) == []
@@ -0,0 +1,87 @@
+from gaming_framework.geometry.shape import Circle, Point2D, Rectangle
+from gaming_framework.spatial_structures.sweep_and_prune import SweepAndPrune
+
+
+def pair_set(pairs):
+    return {frozenset(pair) for pair in pairs}
+
+
+def test_query_finds_inserted_body(make_body):
+    sweep_and_prune = SweepAndPrune()
+    body = make_body(10, 10)
+    sweep_and_prune.insert(body)
+    assert list(sweep_and_prune.query(Circle(Point2D(10, 10), 1))) == [body]
+    assert list(sweep_and_prune.query(Circle(Point2D(50, 50), 1))) == []
+
+
+def test_query_pairs_returns_overlapping_pairs_once(make_body):
+    sweep_and_prune = SweepAndPrune()
+    a, b, c = make_body(0, 0), make_body(1.5, 0), make_body(10, 0)
+    for body in (a, b, c):
+        sweep_and_prune.insert(body)
+    assert list(sweep_and_prune.query_pairs()) in ([(a, b)], [(b, a)])
+
+
+def test_pairs_follow_moving_bodies(make_body):
+    sweep_and_prune = SweepAndPrune()
+    a, b, c = make_body(0, 0), make_body(1.5, 0), make_body(10, 0)
+    for body in (a, b, c):
+        sweep_and_prune.insert(body)
+    list(sweep_and_prune.query_pairs())
+    a.move_to(Point2D(9, 1))
+    assert pair_set(sweep_and_prune.query_pairs()) == {frozenset((a, c))}
+    a.move_to(Point2D(9, 10))
+    assert pair_set(sweep_and_prune.query_pairs()) == set()
+
+
+def test_removed_body_leaves_its_pairs(make_body):
+    sweep_and_prune = SweepAndPrune()
+    a, b = make_body(0, 0), make_body(1.5, 0)
+    sweep_and_prune.insert(a)
+    sweep_and_prune.insert(b)
+    list(sweep_and_prune.query_pairs())
+    sweep_and_prune.remove(b)
+    assert list(sweep_and_prune.query_pairs()) == []
+    assert list(sweep_and_prune.query(Rectangle(Point2D(-5, 5), Point2D(5, -5)))) == [a]
+
+
+def test_query_finds_a_wide_body_starting_far_to_the_left(make_body):
+    sweep_and_prune = SweepAndPrune()
+    wide, small = make_body(0, 0, radius=20), make_body(-30, 0)
+    sweep_and_prune.insert(wide)
+    sweep_and_prune.insert(small)
+    assert list(sweep_and_prune.query(Circle(Point2D(18, 0), 1))) == [wide]
+
+
+def test_removed_body_keeps_the_others_sorted(make_body):
+    sweep_and_prune = SweepAndPrune()
+    bodies = [make_body(3 * i, 0) for i in range(5)]
+    for body in bodies:
+        sweep_and_prune.insert(body)
+    list(sweep_and_prune.query_pairs())
+    sweep_and_prune.remove(bodies[1])
+    bodies[0].move_to(Point2D(5, 0))
+    assert pair_set(sweep_and_prune.query_pairs()) == {
+        frozenset((bodies[0], bodies[2]))
+    }
+    assert list(sweep_and_prune.query(Circle(Point2D(12, 0), 1))) == [bodies[4]]
+
+
+def test_query_pairs_between_structures_of_any_size(make_body):
+    a, b, c = make_body(0, 0), make_body(1.5, 0), make_body(10, 0)
+    others = [make_body(x, 0) for x in (0.5, 11)]
+    far_bodies = [make_body(100 + 3 * i, 0) for i in range(20)]
+    # comparable sizes sweep both axes, a small side queries the other one
+    for first, second in (
+        ([a, b, c], others + far_bodies[:2]),
+        ([a, b, c], others + far_bodies),
+    ):
+        sweep_and_prune, other_sweep_and_prune = SweepAndPrune(), SweepAndPrune()
+        for body in first:
+            sweep_and_prune.insert(body)
+        for body in second:
+            other_sweep_and_prune.insert(body)
+        pairs = set(sweep_and_prune.query_pairs_between(other_sweep_and_prune))
+        assert pairs == {(a, others[0]), (b, others[0]), (c, others[1])}
+        pairs = set(other_sweep_and_prune.query_pairs_between(sweep_and_prune))
+        assert pairs == {(others[0], a), (others[0], b), (others[1], c)}